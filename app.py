@@ -1,37 +1,29 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
 from utils.display import manage_display
+from utils.storage import open_storage
+from utils.loader import (
+    CSV_COLUMNS_KANDIDAT, CANDIDATES_CSV_PATH, JOB_POSITIONS_CSV_PATH,
+    default_job_positions
+)
 
 # ---------- Konfigurasi Halaman ---------- #
 st.set_page_config(page_title="Seleksi Karyawan", layout="wide")
 
-# ---------- Definisi Kolom Global ---------- #
-CSV_COLUMNS_KANDIDAT = [
-    "NAMA", "SE", "WA", "AN", "GE", "ME", "RA", "ZR", "FA", "WU", "IQ",
-    "P_C", "P_F", "P_W", "P_N", "P_G", "P_A", "P_P", "P_I", "P_V", "P_S",
-    "P_X", "P_E", "P_K", "P_L", "P_T", "P_B", "P_O", "P_R", "P_D", "P_Z",
-    "M_E", "M_I", "M_S", "M_N", "M_T", "M_F", "M_J", "M_P",
-    "K_C", "K_T", "K_A1", "K_A2", "K_H",
-    "D_D", "D_I", "D_S", "D_C"
-]
-
-EXPECTED_JOB_COLUMNS = [
-    'Job Position', 'PAPI context', 'M', 'B', 'T', 'I_M',
-    'D', 'I_D', 'S', 'C'
-]
-JOB_POSITIONS_CSV_PATH = "job_positions.csv"
-
 # ---------- Fungsi-Fungsi Load Data ---------- #
-@st.cache_data
+# Kolom & loader tanpa Streamlit ada di utils/loader.py (juga dipakai cli.py).
+# Backend penyimpanan (CSV atau SQLite, lihat utils/storage.py) dipilih dengan MCDM_STORAGE.
+# Data kandidat CSV dibaca dari snapshot kolomnar (memory-mapped) yang dibangun ulang
+# hanya saat dataset.csv berubah, SQLite di-cache per data_version, jadi tidak perlu
+# st.cache_data (pickle & salin tiap rerun)
+storage = open_storage()
+
 def load_data_kandidat():
-    file_path = "dataset.csv"
+    file_path = CANDIDATES_CSV_PATH
     try:
-        df = pd.read_csv(file_path)
-        for col in CSV_COLUMNS_KANDIDAT:
-            if col not in df.columns:
-                df[col] = np.nan
-        return df[CSV_COLUMNS_KANDIDAT]
+        return storage.load_candidates()
     except FileNotFoundError:
         st.error(f"File {file_path} tidak ditemukan!")
         return pd.DataFrame(columns=CSV_COLUMNS_KANDIDAT)
@@ -41,32 +33,26 @@ def load_data_kandidat():
 
 @st.cache_data
 def get_default_job_positions_data():
-    data = {
-        'Job Position': ['Pre-Sales', 'IT Developer', 'Sales Manager', 'Admin', 'Marketing'],
-        'PAPI context': ['O', 'R', 'B', 'D', 'Z'], 
-        'M': ['E', 'I', 'E', 'I', 'E'],
-        'B': ['N', 'N', 'S', 'S', 'N'], 
-        'T': ['T', 'T', 'F', 'T', 'F'],
-        'I_M': ['J', 'P', 'J', 'J', 'P'], 
-        'D': [0.3, 0.1, 0.2, 0.4, 0.25],
-        'I_D': [0.4, 0.2, 0.3, 0.1, 0.25], 
-        'S': [0.2, 0.2, 0.3, 0.3, 0.25],
-        'C': [0.1, 0.5, 0.2, 0.2, 0.25]
-    }
-    return pd.DataFrame(data, columns=EXPECTED_JOB_COLUMNS)
+    return default_job_positions()
 
 def load_or_initialize_job_positions():
     try:
-        df = pd.read_csv(JOB_POSITIONS_CSV_PATH)
-        if df.empty or not all(col in df.columns for col in EXPECTED_JOB_COLUMNS):
-            raise FileNotFoundError # Paksa buat ulang jika kosong atau kolom salah
-        return df.copy()
-    except (FileNotFoundError, pd.errors.EmptyDataError):
-        st.info(f"{JOB_POSITIONS_CSV_PATH} tidak ditemukan/rusak. Membuat file dengan data default.")
+        return storage.load_job_positions().copy()
+    except (FileNotFoundError, ValueError) as e:
         default_df = get_default_job_positions_data()
-        default_df.to_csv(JOB_POSITIONS_CSV_PATH, index=False)
+        # Database / file yang belum ada atau benar-benar kosong diisi default
+        if (storage.backend == 'sqlite' or not os.path.exists(JOB_POSITIONS_CSV_PATH)
+                or os.path.getsize(JOB_POSITIONS_CSV_PATH) == 0):
+            st.info(f"{JOB_POSITIONS_CSV_PATH} tidak ditemukan/kosong. Membuat file dengan data default.")
+            storage.add_job_position(default_df)
+        else:
+            # File rusak tidak ditimpa: default hanya dipakai untuk sesi ini
+            st.error(f"{JOB_POSITIONS_CSV_PATH} rusak ({e}). File tidak diubah; memakai posisi default untuk sesi ini.")
         return default_df.copy()
 
+# Dipanggil setelah data kandidat ditulis (lihat input_data_page)
+load_data_kandidat.clear = storage.clear_cache
+
 # ---------- Main Program Logic ---------- #
 def main():
     data_kandidat = load_data_kandidat()
@@ -0,0 +1,67 @@
+# ========== GENERATOR DATA KANDIDAT SINTETIS ========== #
+# Rentang nilai mengikuti batas input di views/input_data_page.py:
+# IST 0-150, PAPI 0-9, MBTI 0-100, Kraepelin 0-5, DISC 0-9.
+#
+# Contoh:
+#   python benchmarks/generate.py 10000 -o kandidat_10k.csv --seed 1
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.loader import CSV_COLUMNS_KANDIDAT
+
+# (kolom, nilai minimum, nilai maksimum) per alat tes
+IST_RANGE = (0, 150)
+PAPI_RANGE = (0, 9)
+MBTI_RANGE = (0, 100)
+KRAEPELIN_RANGE = (0, 5)
+DISC_RANGE = (0, 9)
+
+# Pasangan preferensi MBTI berjumlah 100 (seperti pada Dataset.csv)
+MBTI_PAIRS = [('M_E', 'M_I'), ('M_S', 'M_N'), ('M_T', 'M_F'), ('M_J', 'M_P')]
+
+def generate_candidates(n, seed=0):
+    """
+    DataFrame n kandidat sintetis dengan kolom CSV_COLUMNS_KANDIDAT.
+    Hasil deterministik untuk seed yang sama.
+    """
+    rng = np.random.default_rng(seed)
+    data = {'NAMA': [f"Kandidat {i:07d}" for i in range(n)]}
+
+    def draw(value_range):
+        low, high = value_range
+        return rng.integers(low, high + 1, n)
+
+    for col in CSV_COLUMNS_KANDIDAT[1:]:
+        if col.startswith('P_'):
+            data[col] = draw(PAPI_RANGE)
+        elif col.startswith('K_'):
+            data[col] = draw(KRAEPELIN_RANGE)
+        elif col.startswith('D_'):
+            data[col] = draw(DISC_RANGE)
+        elif col.startswith('M_'):
+            continue
+        else:
+            data[col] = draw(IST_RANGE)
+
+    for first, second in MBTI_PAIRS:
+        data[first] = draw(MBTI_RANGE)
+        data[second] = MBTI_RANGE[1] - data[first]
+
+    return pd.DataFrame(data, columns=CSV_COLUMNS_KANDIDAT)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Membuat file CSV kandidat sintetis.')
+    parser.add_argument('n', type=int, help='jumlah kandidat')
+    parser.add_argument('-o', '--output', default='dataset_sintetis.csv')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_candidates(args.n, args.seed).to_csv(args.output, index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# ========== BENCHMARK SKALABILITAS ========== #
+# Mengukur waktu & puncak memori (tracemalloc) load_data_kandidat, agg_to_5,
+# calc_vikor dan calc_electre pada data sintetis n = 100, 1k, 10k, 100k.
+# Hasil ditulis ke JSON lalu dibandingkan dengan baseline yang tersimpan.
+#
+# Contoh:
+#   python benchmarks/run_benchmarks.py                      # semua ukuran
+#   python benchmarks/run_benchmarks.py --sizes 100 1000     # cepat
+#   python benchmarks/run_benchmarks.py --update-baseline    # simpan baseline baru
+#
+# Exit status: 0 = tidak ada regresi, 1 = ada regresi terhadap baseline.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+from generate import generate_candidates
+from utils.loader import load_candidate_data, default_job_positions
+from utils.preprocess import agg_to_5, feature_cache, CRITERIA
+from utils.snapshot import clear_cache, snapshot_dir
+from methods.vikor import calc_vikor
+from methods.electre import calc_electre
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+# Toleransi sebelum dianggap regresi (rasio terhadap baseline)
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+# Waktu di bawah ini terlalu bising untuk dibandingkan
+MIN_COMPARABLE_SECONDS = 0.005
+
+def measure(func, repeat):
+    """
+    Menjalankan func beberapa kali di bawah tracemalloc.
+    Pengulangan berhenti lebih awal jika satu putaran > 10 detik.
+
+    Returns:
+    - (waktu tercepat dalam detik, puncak memori terbesar dalam byte)
+    """
+    best_time, peak = float('inf'), 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best_time = min(best_time, elapsed)
+        if elapsed > 10:
+            break
+    return best_time, peak
+
+def bench_size(n, work_dir, repeat, electre_max_n, seed):
+    """
+    Returns:
+    - list dict hasil per tahap untuk satu ukuran n
+    """
+    csv_path = os.path.join(work_dir, f"kandidat_{n}.csv")
+    generate_candidates(n, seed).to_csv(csv_path, index=False)
+    job_filter_row = default_job_positions().iloc[0]
+
+    # load_data_kandidat: snapshot dibangun dari CSV (tanpa cache di memori)
+    def load_cold():
+        clear_cache()
+        shutil.rmtree(snapshot_dir(csv_path), ignore_errors=True)
+        return load_candidate_data(csv_path)
+
+    # agg_to_5: tanpa cache fitur kandidat
+    def aggregate_cold():
+        feature_cache.clear()
+        return agg_to_5(data, job_filter_row)
+
+    results = [('load_data_kandidat', *measure(load_cold, repeat))]
+
+    data = load_cold()
+    results.append(('agg_to_5', *measure(aggregate_cold, repeat)))
+
+    aggregated = agg_to_5(data, job_filter_row).rename(columns={'Nama': 'NAMA'})
+    results.append(('calc_vikor', *measure(lambda: calc_vikor(aggregated, CRITERIA), repeat)))
+    if electre_max_n is None or n <= electre_max_n:
+        results.append(('calc_electre', *measure(lambda: calc_electre(aggregated, CRITERIA), repeat)))
+
+    os.remove(csv_path)
+    shutil.rmtree(snapshot_dir(csv_path), ignore_errors=True)
+    return [
+        {'stage': stage, 'n': n, 'seconds': seconds, 'peak_bytes': peak}
+        for stage, seconds, peak in results
+    ]
+
+def run(sizes, repeat=3, electre_max_n=None, seed=0, log=print):
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='mcdm_bench_')
+    try:
+        for n in sizes:
+            for row in bench_size(n, work_dir, repeat, electre_max_n, seed):
+                log(f"{row['stage']:<20} n={n:<8} {row['seconds']:10.4f} s  {row['peak_bytes'] / 2**20:10.2f} MiB")
+                results.append(row)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        clear_cache()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+def compare(current, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Membandingkan hasil dengan baseline per (tahap, n).
+
+    Returns:
+    - list dict regresi (kosong jika tidak ada)
+    """
+    base = {(row['stage'], row['n']): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        ref = base.get((row['stage'], row['n']))
+        if ref is None:
+            continue
+        time_ratio = row['seconds'] / ref['seconds'] if ref['seconds'] > 0 else 1.0
+        memory_ratio = row['peak_bytes'] / ref['peak_bytes'] if ref['peak_bytes'] > 0 else 1.0
+        slow = row['seconds'] >= MIN_COMPARABLE_SECONDS and time_ratio > 1 + time_tolerance
+        heavy = memory_ratio > 1 + memory_tolerance
+        if slow or heavy:
+            regressions.append({
+                'stage': row['stage'],
+                'n': row['n'],
+                'time_ratio': round(time_ratio, 3),
+                'memory_ratio': round(memory_ratio, 3)
+            })
+    return regressions
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+        f.write('\n')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark skalabilitas MCDM.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--electre-max-n', type=int, default=None,
+                        help='lewati calc_electre untuk n di atas nilai ini')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='tulis hasil sebagai baseline baru')
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.electre_max_n, args.seed)
+    _write_json(args.output, current)
+    print(f"Hasil ditulis ke {args.output}")
+
+    if args.update_baseline:
+        _write_json(args.baseline, current)
+        print(f"Baseline diperbarui: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} tidak ada; jalankan dengan --update-baseline.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('machine') != current['meta']['machine'] or \
+            baseline['meta'].get('cpu_count') != current['meta']['cpu_count']:
+        print("Peringatan: baseline diukur di mesin berbeda, perbandingan waktu kurang berarti.")
+
+    regressions = compare(current, baseline, args.time_tolerance, args.memory_tolerance)
+    for reg in regressions:
+        print(f"REGRESI {reg['stage']} n={reg['n']}: waktu x{reg['time_ratio']}, memori x{reg['memory_ratio']}")
+    if not regressions:
+        print("Tidak ada regresi terhadap baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
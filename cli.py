@@ -0,0 +1,139 @@
+# ========== CLI BATCH RANKING (TANPA STREAMLIT) ========== #
+# Contoh:
+#   python cli.py dataset.csv job_positions.csv -o hasil.csv
+#   python cli.py dataset.csv job_positions.csv -j "IT Developer" -m electre -k 20 -o hasil.json
+#
+# Exit status: 0 = berhasil, 1 = data/file tidak valid, 2 = argumen salah.
+# pandas, numpy & modul metode baru di-import setelah argumen diparse agar
+# --help dan kesalahan argumen tetap cepat.
+
+import argparse
+import json
+import sys
+
+EXIT_OK = 0
+EXIT_DATA_ERROR = 1
+EXIT_USAGE = 2
+
+METHODS = ['vikor', 'electre']
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description='Ranking kandidat dengan VIKOR & ELECTRE tanpa menjalankan Streamlit.'
+    )
+    parser.add_argument('candidates', help='file CSV data kandidat (format dataset.csv)')
+    parser.add_argument('jobs', help='file CSV posisi pekerjaan (format job_positions.csv)')
+    parser.add_argument('-j', '--job', action='append', dest='job_names', metavar='NAMA',
+                        help='posisi pekerjaan yang diranking (bisa diulang, default: semua)')
+    parser.add_argument('-m', '--method', choices=METHODS + ['all'], default='all',
+                        help='metode ranking (default: all)')
+    parser.add_argument('-k', '--top-k', type=int, default=None,
+                        help='hanya k kandidat terbaik per posisi & metode')
+    parser.add_argument('-o', '--output', default='-',
+                        help='file keluaran, "-" untuk stdout (default)')
+    parser.add_argument('-f', '--format', choices=['csv', 'json'], default=None,
+                        help='format keluaran (default: dari ekstensi --output, selain itu csv)')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='jumlah proses worker ELECTRE (-1 = semua core, default 1)')
+    parser.add_argument('--threshold-mode', choices=['sequential', 'sorted'], default='sequential',
+                        help='cara menghitung threshold ELECTRE (default: sequential)')
+    return parser
+
+def output_format(args):
+    if args.format is not None:
+        return args.format
+    return 'json' if args.output.lower().endswith('.json') else 'csv'
+
+def rank(args):
+    """
+    Menjalankan ranking sesuai argumen.
+
+    Returns:
+    - list (posisi, metode, DataFrame hasil ranking)
+    """
+    from utils.loader import load_candidate_data, load_job_positions
+    from methods.vikor import run_vikor_all_jobs
+    from methods.electre import run_electre_all_jobs
+
+    data = load_candidate_data(args.candidates)
+    if data.empty:
+        raise ValueError(f"File {args.candidates} tidak berisi kandidat.")
+    jobs = load_job_positions(args.jobs)
+
+    if args.job_names:
+        unknown = [name for name in args.job_names if name not in set(jobs['Job Position'])]
+        if unknown:
+            raise ValueError(f"Posisi pekerjaan tidak ditemukan di {args.jobs}: {unknown}")
+        jobs = jobs[jobs['Job Position'].isin(args.job_names)]
+
+    methods = METHODS if args.method == 'all' else [args.method]
+    results = {}
+    if 'vikor' in methods:
+        results['vikor'] = run_vikor_all_jobs(data, jobs, top_k=args.top_k)
+    if 'electre' in methods:
+        results['electre'] = run_electre_all_jobs(
+            data, jobs, top_k=args.top_k, threshold_mode=args.threshold_mode, n_jobs=args.n_jobs
+        )
+
+    return [
+        (job_name, method, results[method][job_name])
+        for job_name in dict.fromkeys(jobs['Job Position'])
+        for method in methods
+    ]
+
+def write_results(rankings, args):
+    import pandas as pd
+
+    frames = []
+    for job_name, method, df in rankings:
+        frames.append(pd.DataFrame({
+            'Posisi': job_name,
+            'Metode': method.upper(),
+            'Ranking': df['Ranking'].to_numpy(),
+            'Nama': df['Nama'].to_numpy(),
+            # object: skor ELECTRE tetap bilangan bulat saat digabung dengan skor VIKOR
+            'Skor': df.iloc[:, 1].to_numpy(dtype=object)
+        }))
+
+    if output_format(args) == 'json':
+        payload = {}
+        for frame in frames:
+            records = [
+                {'Ranking': int(r), 'Nama': str(nama), 'Skor': None if pd.isna(skor) else skor}
+                for r, nama, skor in zip(frame['Ranking'], frame['Nama'], frame['Skor'])
+            ]
+            payload.setdefault(frame['Posisi'].iat[0], {})[frame['Metode'].iat[0]] = records
+        text = json.dumps(payload, ensure_ascii=False, indent=2) + '\n'
+    else:
+        columns = ['Posisi', 'Metode', 'Ranking', 'Nama', 'Skor']
+        combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        text = combined.to_csv(index=False)
+
+    if args.output == '-':
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        # argparse: 0 untuk --help, 2 untuk argumen salah
+        return e.code
+    if args.top_k is not None and args.top_k < 1:
+        parser.print_usage(sys.stderr)
+        print('cli.py: error: --top-k harus >= 1', file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        write_results(rank(args), args)
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"cli.py: error: {e}", file=sys.stderr)
+        return EXIT_DATA_ERROR
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
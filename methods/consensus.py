@@ -0,0 +1,285 @@
+# ========== KONSENSUS PERINGKAT ANTAR METODE ========== #
+# Menggabungkan peringkat beberapa metode (VIKOR, ELECTRE, ...) dari hasil yang
+# sudah ada di cache:
+# - Borda: rata-rata peringkat per kandidat
+# - Copeland: jumlah kandidat yang dikalahkan dikurangi yang mengalahkan
+#   (mayoritas metode); untuk dua metode dihitung dengan penghitungan dominansi
+#   O(n log n) (merge sort per level), tanpa loop pasangan. Lebih dari dua metode
+#   memakai perbandingan berpasangan per tile (O(n^2), tervektorisasi)
+# - Kemeny (pendekatan): local search dari urutan Borda dengan menukar pasangan
+#   bertetangga selama mayoritas metode lebih menyukai urutan sebaliknya
+# - Kendall tau-b antar metode & terhadap konsensus, O(n log n)
+#
+# Skor yang sama (mis. banyak "Skor ELECTRE" kembar) diperlakukan sebagai seri,
+# bukan mengikuti urutan acak kolom Ranking.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from utils.instrument import stage, traced
+from methods.electre import DEFAULT_MEMORY_BUDGET
+
+# Hasil konsensus:
+# - table: DataFrame per kandidat (index = posisi kandidat), urut peringkat Kemeny
+# - agreement: DataFrame Kendall tau-b antar metode & konsensus (matriks simetris)
+# - kemeny_passes: jumlah putaran local search
+# - kemeny_converged: True jika tidak ada lagi tukar bertetangga yang memperbaiki
+ConsensusResult = namedtuple('ConsensusResult', ['table', 'agreement', 'kemeny_passes', 'kemeny_converged'])
+
+DEFAULT_KEMENY_PASSES = 1000
+
+# Perkiraan byte per pasangan (kandidat x kandidat x metode) untuk Copeland > 2 metode
+_BYTES_PER_PASANGAN = 16
+
+def tied_ranks(results):
+    """
+    Peringkat rata-rata (seri untuk skor sama) dari DataFrame hasil ranking.
+
+    Parameters:
+    - results: DataFrame hasil (Nama, Skor ..., Ranking), index = posisi kandidat
+
+    Returns:
+    - Series peringkat (float) dengan index sama seperti results
+    """
+    score_col = next(col for col in results.columns if str(col).startswith('Skor'))
+    ordered = results.sort_values('Ranking', kind='stable')
+    scores = ordered[score_col].to_numpy(dtype=float)
+
+    # Skor kembar selalu berurutan karena Ranking diurutkan dari skor
+    new_group = np.ones(len(scores), dtype=bool)
+    new_group[1:] = scores[1:] != scores[:-1]
+    group = np.cumsum(new_group) - 1
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.append(starts, len(scores)))
+    average = starts + (sizes + 1) / 2.0
+    return pd.Series(average[group], index=ordered.index)
+
+def _dense(values):
+    return np.unique(values, return_inverse=True)[1].astype(np.int64)
+
+def count_greater_before(values, strict=True):
+    """
+    Untuk setiap posisi i: jumlah j < i dengan values[j] > values[i]
+    (atau >= jika strict=False).
+
+    Merge sort bottom-up yang tervektorisasi per level: pada setiap level, elemen
+    separuh kanan blok dihitung terhadap separuh kiri yang sudah terurut dengan
+    searchsorted, lalu blok digabung. log2(n) level, masing-masing O(n log n).
+    """
+    vals = _dense(np.asarray(values))
+    n = len(vals)
+    counts = np.zeros(n, dtype=np.int64)
+    pos = np.arange(n)
+    span = int(vals.max()) + 1 if n else 1
+    slot = np.arange(n)
+    side = 'right' if strict else 'left'
+
+    width = 1
+    while width < n:
+        block = slot // (2 * width)
+        in_right = (slot % (2 * width)) >= width
+        keys = block * span + vals
+
+        # Separuh kiri setiap blok sudah terurut, jadi gabungannya terurut global
+        left_keys = keys[~in_right]
+        right_keys = keys[in_right]
+        right_block = block[in_right]
+        block_end = np.searchsorted(left_keys, (right_block + 1) * span, side='left')
+        counts[pos[in_right]] += block_end - np.searchsorted(left_keys, right_keys, side=side)
+
+        order = np.argsort(keys, kind='stable')
+        vals, pos = vals[order], pos[order]
+        width *= 2
+
+    return counts
+
+def kendall_tau(x, y):
+    """
+    Kendall tau-b dua peringkat (boleh ada seri) dalam O(n log n).
+    NaN jika salah satu peringkat seluruhnya seri.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n < 2:
+        return np.nan
+
+    def tied_pairs(*arrays):
+        _, counts = np.unique(np.column_stack(arrays), axis=0, return_counts=True)
+        return int(np.sum(counts * (counts - 1) // 2))
+
+    # 1. Urutkan berdasarkan x lalu y; pasangan diskordan = inversi pada y
+    order = np.lexsort((y, x))
+    discordant = int(count_greater_before(y[order], strict=True).sum())
+
+    # 2. Koreksi pasangan seri
+    n0 = n * (n - 1) // 2
+    tie_x, tie_y, tie_xy = tied_pairs(x), tied_pairs(y), tied_pairs(x, y)
+    concordant = n0 - tie_x - tie_y + tie_xy - discordant
+    denom = np.sqrt(float(n0 - tie_x) * float(n0 - tie_y))
+    if denom == 0:
+        return np.nan
+    return (concordant - discordant) / denom
+
+def _copeland_two(ranks):
+    """
+    Copeland dua metode: a mengalahkan b jika tidak ada metode yang lebih
+    menyukai b dan minimal satu metode lebih menyukai a (dominansi lemah).
+    """
+    x, y = ranks
+    n = len(x)
+
+    def beats(x, y):
+        # Jumlah b dengan x_b >= x_a & y_b >= y_a, dikurangi b yang identik (x, y sama)
+        order = np.lexsort((-y, -x))
+        ge_before = count_greater_before(y[order], strict=False)
+        _, first, inverse = np.unique(np.column_stack([x, y])[order], axis=0,
+                                      return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        # Urutan lexsort menjamin duplikat (x, y) berurutan; duplikat sebelumnya ikut terhitung
+        same_before = np.arange(n) - first[inverse]
+        counts = np.empty(n, dtype=np.int64)
+        counts[order] = ge_before - same_before
+        return counts
+
+    wins = beats(x, y)
+    losses = beats(-x, -y)
+    return wins - losses
+
+def _copeland_tiled(ranks, memory_budget):
+    """
+    Copeland untuk lebih dari dua metode: preferensi mayoritas dihitung per tile baris.
+    """
+    m, n = ranks.shape
+    step = int(max(1, min(n, memory_budget // max(1, n * m * _BYTES_PER_PASANGAN))))
+    score = np.zeros(n, dtype=np.int64)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        with stage('copeland_tile', tile_rows=stop - start):
+            block = ranks[:, start:stop, np.newaxis]
+            margin = np.sum(block < ranks[:, np.newaxis, :], axis=0) - np.sum(block > ranks[:, np.newaxis, :], axis=0)
+            score[start:stop] = np.sum(margin > 0, axis=1) - np.sum(margin < 0, axis=1)
+    return score
+
+def copeland_scores(ranks, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Skor Copeland (menang - kalah mayoritas) per kandidat.
+    ranks: array (metode x kandidat), peringkat lebih kecil lebih baik.
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    if ranks.shape[0] == 2:
+        return _copeland_two(ranks)
+    return _copeland_tiled(ranks, memory_budget)
+
+def kemeny_local_search(ranks, order, max_passes=DEFAULT_KEMENY_PASSES):
+    """
+    Local search Kemeny: tukar kandidat bertetangga pada order jika mayoritas
+    metode lebih menyukai urutan sebaliknya (local Kemenization). Tukar
+    dikerjakan bergantian pada pasangan genap & ganjil sehingga satu putaran
+    tervektorisasi; setiap tukar menurunkan jarak Kemeny, jadi pasti berhenti.
+
+    Returns:
+    - (order baru, jumlah putaran, converged)
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    order = np.array(order, dtype=np.intp)
+    n = len(order)
+    passes = 0
+    stable_phases = 0
+
+    while passes < max_passes and n > 1:
+        offset = passes % 2
+        first = order[offset:n - 1:2]
+        second = order[offset + 1:n:2]
+        k = min(len(first), len(second))
+        first, second = first[:k], second[:k]
+
+        prefer_second = np.sum(ranks[:, second] < ranks[:, first], axis=0)
+        prefer_first = np.sum(ranks[:, first] < ranks[:, second], axis=0)
+        swap = prefer_second > prefer_first
+        passes += 1
+
+        if not swap.any():
+            stable_phases += 1
+            # Putaran genap & ganjil berturut-turut tanpa tukar: optimum lokal
+            if stable_phases >= 2:
+                return order, passes, True
+            continue
+        stable_phases = 0
+        idx = offset + 2 * np.flatnonzero(swap)
+        order[idx], order[idx + 1] = order[idx + 1], order[idx].copy()
+
+    return order, passes, n <= 1
+
+def _ranks_from_order(order):
+    ranking = np.empty(len(order), dtype=np.int64)
+    ranking[order] = np.arange(1, len(order) + 1)
+    return ranking
+
+@traced('consensus')
+def consensus_ranking(results, max_passes=DEFAULT_KEMENY_PASSES, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Konsensus peringkat dari hasil beberapa metode.
+
+    Parameters:
+    - results: dict {label metode: DataFrame hasil ranking lengkap (bukan top_k)},
+      index = posisi kandidat, mis. hasil dari result_cache
+    - max_passes: batas putaran local search Kemeny
+    - memory_budget: batas byte per tile Copeland (lebih dari dua metode)
+
+    Returns:
+    - ConsensusResult
+    """
+    if len(results) < 2:
+        raise ValueError("Konsensus membutuhkan minimal dua metode.")
+
+    # 1. Peringkat seri per metode, diselaraskan ke posisi kandidat
+    with stage('tied_ranks'):
+        labels = list(results)
+        first = results[labels[0]]
+        index = first.index.sort_values()
+        for label in labels[1:]:
+            if len(results[label]) != len(index) or not results[label].index.sort_values().equals(index):
+                raise ValueError(f"Hasil {label} tidak berisi kandidat yang sama (gunakan hasil lengkap, bukan top_k).")
+        ranks = np.vstack([tied_ranks(results[label]).reindex(index).to_numpy() for label in labels])
+        names = first['Nama'].reindex(index).to_numpy()
+
+    # 2. Borda: rata-rata peringkat, seri dipecah oleh posisi kandidat
+    with stage('borda'):
+        borda = ranks.mean(axis=0)
+        borda_order = np.argsort(borda, kind='stable')
+
+    # 3. Copeland
+    with stage('copeland'):
+        copeland = copeland_scores(ranks, memory_budget)
+        copeland_order = np.lexsort((borda, -copeland))
+
+    # 4. Kemeny: local search dari urutan Borda
+    with stage('kemeny'):
+        kemeny_order, passes, converged = kemeny_local_search(ranks, borda_order, max_passes)
+        kemeny_rank = _ranks_from_order(kemeny_order)
+
+    # 5. Kesepakatan: Kendall tau-b antar metode & terhadap konsensus Kemeny
+    with stage('agreement'):
+        all_labels = labels + ['Konsensus (Kemeny)']
+        all_ranks = list(ranks) + [kemeny_rank.astype(float)]
+        k = len(all_labels)
+        tau = np.eye(k)
+        for i in range(k):
+            for j in range(i + 1, k):
+                tau[i, j] = tau[j, i] = kendall_tau(all_ranks[i], all_ranks[j])
+        agreement = pd.DataFrame(tau, index=all_labels, columns=all_labels)
+
+    with stage('table'):
+        table = pd.DataFrame({'Nama': names}, index=index)
+        for label, rank in zip(labels, ranks):
+            table[f'Peringkat {label}'] = rank
+        table['Rata-rata Peringkat (Borda)'] = borda
+        table['Peringkat Borda'] = _ranks_from_order(borda_order)
+        table['Skor Copeland'] = copeland
+        table['Peringkat Copeland'] = _ranks_from_order(copeland_order)
+        table['Peringkat Konsensus'] = kemeny_rank
+        table = table.take(kemeny_order)
+
+    return ConsensusResult(table, agreement, passes, converged)
@@ -0,0 +1,99 @@
+# ========== PERINGKAT SATU KANDIDAT DI SEMUA POSISI ========== #
+# Drill-down "kandidat X peringkat berapa di setiap posisi" membaca hasil
+# ranking per posisi dari result_cache (kunci yang sama dengan halaman Home),
+# tanpa ranking ulang. Posisi yang belum ada di cache dihitung sekaligus dengan
+# kernel all-jobs (hanya untuk metode yang diminta), lalu disimpan ke cache.
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import dataset_version, WEIGHTS, V
+from utils.result_cache import result_cache, result_key
+from methods.vikor import run_vikor_all_jobs
+from methods.electre import run_electre_all_jobs
+from methods.electre_approx import DEFAULT_TOP_K, DEFAULT_TIME_BUDGET, DEFAULT_SAMPLES
+
+# Parameter metode yang menjadi bagian kunci result_cache
+RESULT_PARAMS = {
+    'vikor': {'weights': WEIGHTS, 'v': V},
+    'electre': {'weights': WEIGHTS, 'threshold_mode': 'sequential'},
+    'electre_approx': {'weights': WEIGHTS, 'top_k': DEFAULT_TOP_K, 'samples': DEFAULT_SAMPLES,
+                       'time_budget': DEFAULT_TIME_BUDGET, 'seed': 0},
+    'topsis': {'weights': WEIGHTS},
+    'saw': {'weights': WEIGHTS}
+}
+
+_ALL_JOBS = {'vikor': run_vikor_all_jobs, 'electre': run_electre_all_jobs}
+_RANK_COLUMNS = {'vikor': 'Peringkat VIKOR', 'electre': 'Peringkat ELECTRE'}
+
+def method_key(version, job_filter_row, method):
+    """
+    Kunci result_cache untuk hasil ranking method pada satu posisi pekerjaan.
+    """
+    return result_key(version, job_filter_row, method, RESULT_PARAMS[method])
+
+def cached_job_results(method, data, job_positions_df, version=None, compute_missing=True):
+    """
+    Hasil ranking method untuk setiap posisi pekerjaan.
+
+    Parameters:
+    - method: 'vikor' atau 'electre'
+    - data: DataFrame kandidat
+    - job_positions_df: DataFrame posisi pekerjaan
+    - version: versi dataset (default: dataset_version(data))
+    - compute_missing: hitung posisi yang belum ada di cache; jika False
+      hasil posisi tersebut None
+
+    Returns:
+    - list DataFrame hasil (atau None), urut baris job_positions_df
+    """
+    if version is None:
+        version = dataset_version(data)
+
+    # 1. Ambil dari cache
+    keys = [method_key(version, job_positions_df.iloc[j], method) for j in range(len(job_positions_df))]
+    results = [result_cache.get(key) for key in keys]
+
+    # 2. Posisi yang belum ada dihitung dalam satu panggilan all-jobs
+    missing = [j for j, res in enumerate(results) if res is None]
+    if missing and compute_missing:
+        missing_jobs = job_positions_df.iloc[missing]
+        computed = _ALL_JOBS[method](data, missing_jobs)
+        for j, job_name in zip(missing, missing_jobs['Job Position']):
+            results[j] = computed[job_name]
+            result_cache.put(keys[j], results[j])
+    return results
+
+def candidate_ranks(positions, data, job_positions_df, version=None, compute=('vikor',)):
+    """
+    Peringkat kandidat (posisi baris data) di setiap posisi pekerjaan.
+
+    Parameters:
+    - positions: posisi baris kandidat di data (mis. NameIndex.lookup)
+    - data: DataFrame kandidat
+    - job_positions_df: DataFrame posisi pekerjaan
+    - version: versi dataset (default: dataset_version(data))
+    - compute: metode yang boleh dihitung jika belum ada di cache; metode lain
+      hanya dibaca dari cache (peringkat kosong jika belum pernah dijalankan)
+
+    Returns:
+    - DataFrame (Posisi, Baris, Peringkat VIKOR, Peringkat ELECTRE, Jumlah Kandidat)
+    """
+    if version is None:
+        version = dataset_version(data)
+    positions = np.asarray(positions, dtype=np.intp)
+    n_jobs = len(job_positions_df)
+
+    frame = pd.DataFrame({
+        'Posisi': np.repeat(job_positions_df['Job Position'].to_numpy(dtype=object), len(positions)),
+        'Baris': np.tile(positions, n_jobs)
+    })
+    for method, column in _RANK_COLUMNS.items():
+        results = cached_job_results(method, data, job_positions_df, version, method in compute)
+        ranks = np.full((n_jobs, len(positions)), np.nan)
+        for j, res in enumerate(results):
+            # Index hasil ranking = posisi baris kandidat di data
+            if res is not None:
+                ranks[j] = res['Ranking'].reindex(positions).to_numpy(dtype=float)
+        frame[column] = pd.array(ranks.ravel(), dtype='Int64')
+    frame['Jumlah Kandidat'] = len(data)
+    return frame
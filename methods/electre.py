@@ -1,144 +1,412 @@
 # ========== IMPLEMENTASI ELECTRE ========== #
 
+from fractions import Fraction
+
 import numpy as np
 import pandas as pd
-from utils.preprocess import prep_dm, agg_to_5
+from utils.ranking import top_k_indices, top_k_frame
+from utils.instrument import stage, traced
+from utils.preprocess import prep_dm, agg_to_5, agg_all_jobs, agg_frame, CRITERIA, WEIGHTS
+
+# Anggaran memori default (byte) untuk satu tile perbandingan berpasangan
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Perkiraan byte array sementara per pasangan alternatif di dalam satu tile
+_BYTES_PER_PASANGAN = 48
+
+# Cara menghitung threshold:
+# - 'sequential': jumlah elemen dijumlahkan berurutan (identik dengan loop
+#   Python semula, tidak bergantung pada pembagian tile)
+# - 'sorted': concordance dari bentuk tertutup per kolom terurut O(k·n log n),
+#   discordance dijumlahkan persis (exact_sum) lalu dibulatkan sekali, sehingga
+#   tidak bergantung pada pembagian tile maupun jumlah worker; hasil bisa
+#   berbeda pembulatan dengan 'sequential'
+THRESHOLD_MODES = ('sequential', 'sorted')
 
 def norm(matrix):
     """
     Normalisasi matriks keputusan
     """
-    normalized = np.zeros_like(matrix, dtype=float)
-    
-    for j in range(matrix.shape[1]):
-        col = matrix[:, j]
-        normalized[:, j] = col / np.sqrt(np.sum(col**2))
-    
-    return normalized
+    matrix = np.asarray(matrix)
+
+    # Jumlah kuadrat dihitung per kolom (bentuk (k, n) kontigu) agar urutan
+    # penjumlahan sama dengan np.sum pada satu kolom
+    sq_cols = np.ascontiguousarray(matrix.T ** 2)
+    col_norm = np.sqrt(np.sum(sq_cols, axis=1))
+
+    return matrix / col_norm
+
+def tile_rows(n, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Jumlah baris alternatif per tile agar array sementara (baris x n)
+    tidak melebihi memory_budget byte. Minimal 1 baris.
+    """
+    per_baris = max(1, n * _BYTES_PER_PASANGAN)
+    return int(max(1, min(n, memory_budget // per_baris)))
+
+def iter_tiles(n, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Menghasilkan pasangan (start, stop) untuk setiap tile baris.
+    """
+    step = tile_rows(n, memory_budget)
+    for start in range(0, n, step):
+        yield start, min(start + step, n)
+
+def concordance_levels(weights):
+    """
+    Tabel nilai concordance untuk setiap subset kriteria (bitmask).
+    level[mask] = np.sum(bobot kriteria yang ada di mask), dijumlahkan
+    dengan urutan yang sama seperti perhitungan per pasangan.
+    """
+    k = len(weights)
+    levels = np.zeros(2 ** k)
+    for mask in range(2 ** k):
+        concordance_set = [weights[c] for c in range(k) if mask >> c & 1]
+        levels[mask] = np.sum(concordance_set)
+    return levels
+
+def concordance_mask_tile(weighted, start, stop):
+    """
+    Bitmask kriteria di mana weighted[i, k] >= weighted[j, k]
+    untuk baris start:stop.
+    """
+    n, k = weighted.shape
+    mask = np.zeros((stop - start, n), dtype=np.min_scalar_type(2 ** k - 1))
+    for c in range(k):
+        col = weighted[:, c]
+        mask |= (col[start:stop, None] >= col[None, :]).astype(mask.dtype) << c
+    return mask
+
+def concordance_tile(weighted, levels, start, stop, mask=None):
+    """
+    Baris start:stop dari matriks concordance.
+    C[i, j] = jumlah bobot kriteria di mana weighted[i, k] >= weighted[j, k].
+    mask: bitmask tile yang sudah dihitung (opsional)
+    """
+    if mask is None:
+        mask = concordance_mask_tile(weighted, start, stop)
+    tile = levels[mask]
+
+    # Diagonal (alternatif dengan dirinya sendiri) = 0
+    rows = np.arange(stop - start)
+    tile[rows, rows + start] = 0
+    return tile
+
+def discordance_tile(weighted, start, stop):
+    """
+    Baris start:stop dari matriks discordance.
+    D[i, j] = selisih maksimum pada kriteria di mana j lebih baik dari i,
+    dibagi selisih maksimum dari seluruh kriteria.
+    """
+    return discordance_block(weighted, slice(start, stop), slice(None))
 
-def calc_electre(data, criteria):
+def discordance_block(weighted, rows, cols):
+    """
+    Blok discordance D[rows, cols] (rows / cols: slice atau array indeks).
+    Nilainya sama persis dengan elemen yang sama di discordance_tile.
+    """
+    k = weighted.shape[1]
+    shape = (len(weighted[rows]), len(weighted[cols]))
+    max_diff_discord = np.zeros(shape)
+    max_diff_all = np.zeros(shape)
+
+    for c in range(k):
+        col = weighted[:, c]
+        # diff[i, j] = weighted[j, c] - weighted[i, c]
+        diff = col[cols][None, :] - col[rows][:, None]
+        np.fmax(max_diff_discord, diff, out=max_diff_discord)
+        np.fmax(max_diff_all, np.abs(diff, out=diff), out=max_diff_all)
+
+    tile = np.zeros_like(max_diff_all)
+    np.divide(max_diff_discord, max_diff_all, out=tile, where=max_diff_all != 0)
+    return tile
+
+def _sequential_sum(carry, values):
+    """
+    Menjumlahkan values (urutan baris) ke carry satu per satu, sama persis
+    dengan akumulasi `total += nilai` di loop Python.
+    """
+    return float(np.cumsum(np.concatenate(([carry], values.ravel())))[-1])
+
+def exact_sum(values):
+    """
+    Jumlah persis values (float) sebagai Fraction, tanpa pembulatan.
+    Setiap nilai = mantissa bulat x 2^eksponen; mantissa dijumlahkan sebagai
+    bilangan bulat per eksponen (dipecah dua bagian 26/27 bit agar int64 tidak
+    overflow). Jumlah beberapa tile (Fraction) tetap persis, berapa pun tile-nya.
+    """
+    mantissa, exponent = np.frexp(np.asarray(values, dtype=float).ravel())
+    if mantissa.size == 0:
+        return Fraction(0)
+    mantissa = (mantissa * 2.0 ** 53).astype(np.int64)
+    base = int(exponent.min()) - 53
+    offset = exponent - exponent.min()
+
+    size = int(offset.max()) + 1
+    high = np.zeros(size, dtype=np.int64)
+    low = np.zeros(size, dtype=np.int64)
+    np.add.at(high, offset, mantissa >> 26)
+    np.add.at(low, offset, mantissa & (2 ** 26 - 1))
+
+    total = 0
+    for shift in np.flatnonzero(high | low):
+        total += ((int(high[shift]) << 26) + int(low[shift])) << int(shift)
+    return Fraction(total) * Fraction(2) ** base
+
+def concordance_pair_counts(weighted):
+    """
+    Jumlah pasangan terurut (i, j), i != j, dengan weighted[i, k] >= weighted[j, k]
+    per kriteria, dari kolom terurut dalam O(k·n log n).
+    Setiap pasangan tak terurut dengan nilai berbeda dihitung sekali, pasangan
+    dengan nilai sama dihitung dua kali; nilai NaN tidak pernah >= apa pun.
+    """
+    counts = []
+    for c in range(weighted.shape[1]):
+        col = weighted[:, c]
+        counts.append(sorted_pair_count(np.sort(col[~np.isnan(col)])))
+    return counts
+
+def sorted_pair_count(col):
+    """
+    Jumlah pasangan terurut (i, j), i != j, dengan col[i] >= col[j] untuk satu
+    kolom yang sudah terurut naik (tanpa NaN), dalam O(n).
+    """
+    m = len(col)
+    # Ukuran tiap kelompok nilai sama dari kolom terurut
+    boundaries = np.flatnonzero(np.diff(col)) + 1
+    groups = np.diff(np.concatenate(([0], boundaries, [m])))
+    return m * (m - 1) // 2 + int(np.sum(groups * (groups - 1) // 2))
+
+def discordance_total(weighted, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Jumlah persis (Fraction) seluruh elemen matriks discordance, per tile.
+    """
+    total = Fraction(0)
+    for start, stop in iter_tiles(weighted.shape[0], memory_budget):
+        with stage('discordance_tile', tile_rows=stop - start):
+            total += exact_sum(discordance_tile(weighted, start, stop))
+    return total
+
+def electre_thresholds(weighted, weights, memory_budget=DEFAULT_MEMORY_BUDGET, masks=None, mode='sequential'):
+    """
+    Threshold concordance & discordance: rata-rata elemen non-diagonal,
+    dihitung per tile tanpa menyimpan matriks n x n.
+    masks: matriks bitmask concordance n x n yang sudah ada (opsional)
+    mode: salah satu THRESHOLD_MODES
+    """
+    if mode not in THRESHOLD_MODES:
+        raise ValueError(f"threshold_mode harus salah satu dari {THRESHOLD_MODES}, bukan {mode!r}.")
+    n = weighted.shape[0]
+    count = n * (n - 1)
+
+    if mode == 'sorted':
+        # C[i, j] = jumlah bobot kriteria yang memenuhi, sehingga
+        # sum(C) = sum_k bobot_k * jumlah pasangan yang memenuhi kriteria k
+        concordance_sum = float(np.dot(weights, concordance_pair_counts(weighted)))
+
+        # Discordance: jumlah persis per tile, hanya satu tile yang ada di memori
+        return concordance_sum / count, float(discordance_total(weighted, memory_budget) / count)
+
+    levels = concordance_levels(weights)
+    concordance_sum = 0.0
+    discordance_sum = 0.0
+
+    for start, stop in iter_tiles(n, memory_budget):
+        # Elemen diagonal bernilai 0 sehingga tidak mengubah jumlah
+        mask = None if masks is None else masks[start:stop]
+        with stage('concordance_tile', tile_rows=stop - start):
+            concordance_sum = _sequential_sum(concordance_sum, concordance_tile(weighted, levels, start, stop, mask))
+        with stage('discordance_tile', tile_rows=stop - start):
+            discordance_sum = _sequential_sum(discordance_sum, discordance_tile(weighted, start, stop))
+
+    return concordance_sum / count, discordance_sum / count
+
+def pack_rows(relation):
+    """
+    Relasi boolean (baris x n) sebagai bit per pasangan: uint8 (baris x ceil(n / 8)),
+    bit j % 8 dari byte j // 8 (urutan bit little-endian).
+    """
+    return np.packbits(relation, axis=1, bitorder='little')
+
+def popcount_rows(packed):
+    """
+    Jumlah bit 1 per baris relasi ter-pack.
+    """
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(packed)
+    else:
+        # numpy < 2.0: tabel popcount per byte
+        counts = _POPCOUNT[packed]
+    return counts.sum(axis=1, dtype=np.int64)
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def electre_relation_tile(weighted, con_ok, threshold_d, start, stop, mask=None):
+    """
+    Baris start:stop relasi outranking (aggregate) sebagai bit ter-pack (lihat pack_rows).
+    con_ok[mask] = True jika subset kriteria memenuhi threshold concordance.
+    """
+    if mask is None:
+        mask = concordance_mask_tile(weighted, start, stop)
+    con_dom = con_ok[mask]
+    discon_dom = discordance_tile(weighted, start, stop) <= threshold_d
+
+    aggregate = con_dom & discon_dom
+    rows = np.arange(stop - start)
+    aggregate[rows, rows + start] = False
+
+    return pack_rows(aggregate)
+
+def electre_scores_tile(weighted, con_ok, threshold_d, start, stop, mask=None):
+    """
+    Skor ELECTRE baris start:stop: popcount baris relasi ter-pack.
+    """
+    return popcount_rows(electre_relation_tile(weighted, con_ok, threshold_d, start, stop, mask))
+
+def electre_scores(weighted, weights, threshold_c, threshold_d, memory_budget=DEFAULT_MEMORY_BUDGET, masks=None):
+    """
+    Skor ELECTRE per alternatif: jumlah alternatif lain yang didominasi
+    (concordance >= threshold_c dan discordance <= threshold_d).
+    masks: matriks bitmask concordance n x n yang sudah ada (opsional)
+    """
+    n = weighted.shape[0]
+    # Dominasi concordance hanya bergantung pada subset kriteria
+    con_ok = concordance_levels(weights) >= threshold_c
+    scores = np.zeros(n, dtype=np.int64)
+
+    for start, stop in iter_tiles(n, memory_budget):
+        mask = None if masks is None else masks[start:stop]
+        with stage('dominance_tile', tile_rows=stop - start):
+            scores[start:stop] = electre_scores_tile(weighted, con_ok, threshold_d, start, stop, mask)
+
+    return scores
+
+@traced('calc_electre')
+def calc_electre(data, criteria, memory_budget=DEFAULT_MEMORY_BUDGET, top_k=None, threshold_mode='sequential',
+                 n_jobs=1):
     """
     Implementasi metode ELECTRE
     
     Parameters:
     - data: DataFrame kandidat
     - criteria: list nama kolom kriteria
+    - memory_budget: batas memori (byte) untuk satu tile perbandingan berpasangan
+    - top_k: jika diisi, hanya k kandidat terbaik yang dikembalikan (seleksi
+      parsial, tanpa mengurutkan & membuat tabel seluruh kandidat)
+    - threshold_mode: 'sequential' (default) atau 'sorted' (lihat THRESHOLD_MODES)
+    - n_jobs: jumlah proses worker (1 = serial, None / -1 = semua core);
+      threshold & skor sama persis dengan jalur serial (lihat methods.electre_parallel)
     
     Returns:
     - DataFrame hasil ranking ELECTRE
     """
     
     # 1. Siapkan matriks keputusan
-    dm, alt = prep_dm(data, criteria)
+    with stage('prepare') as info:
+        if top_k is not None:
+            dm, alt = data[criteria].values, data['NAMA'].values
+        else:
+            dm, alt = prep_dm(data, criteria)
+        info.note(dm=dm)
     
     # 2. Normalisasi matriks
-    norm_matx = norm(dm)
-    
-    # 3. Matriks terbobot (semua bobot = 0.2)
-    weights = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
-    weighted = norm_matx * weights
-    
-    n = len(alt)
-    
-    # 4. Hitung matriks concordance
-    concordance = np.zeros((n, n))
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                concordance_set = []
-                for k in range(len(criteria)):
-                    if weighted[i, k] >= weighted[j, k]:
-                        concordance_set.append(weights[k])
-                concordance[i, j] = np.sum(concordance_set)
-    
-    # 5. Hitung matriks discordance
-    discordance = np.zeros((n, n))
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                # Hitung maksimum selisih pada kriteria discordance
-                max_diff_discord = 0
-                for k in range(len(criteria)):
-                    # Discordance terjadi ketika weighted[j,k] > weighted[i,k]
-                    if weighted[j, k] > weighted[i, k]:
-                        diff = abs(weighted[j, k] - weighted[i, k])
-                        if diff > max_diff_discord:
-                            max_diff_discord = diff
-                
-                # Hitung maksimum selisih dari seluruh kriteria
-                max_diff_all = 0
-                for k in range(len(criteria)):
-                    diff = abs(weighted[i, k] - weighted[j, k])
-                    if diff > max_diff_all:
-                        max_diff_all = diff
-                
-                if max_diff_all != 0:
-                    discordance[i, j] = max_diff_discord / max_diff_all
+    with stage('normalize'):
+        norm_matx = norm(dm)
     
-    # 6. Hitung threshold concordance dan discordance
-                    
-    # Threshold concordance: rata-rata dari elemen non-diagonal matrix concordance
-    concordance_sum = 0
-    count = 0
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                concordance_sum += concordance[i, j]
-                count += 1
-    threshold_c = concordance_sum / count
-    
-    # Threshold discordance: rata-rata dari elemen non-diagonal matrix discordance
-    discordance_sum = 0
-    count = 0
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                discordance_sum += discordance[i, j]
-                count += 1
-    threshold_d = discordance_sum / count
-    
-     # 7. Matriks dominan concordance dan discordance
-    con_dom = (concordance >= threshold_c).astype(int)
-    discon_dom = (discordance <= threshold_d).astype(int)
+    # 3-11. Matriks terbobot, threshold, skor & ranking
+    return electre_ranking(norm_matx, alt, memory_budget, top_k, threshold_mode, n_jobs)
+
+def electre_ranking(norm_matx, alt, memory_budget=DEFAULT_MEMORY_BUDGET, top_k=None, threshold_mode='sequential',
+                    n_jobs=1):
+    """
+    Langkah ELECTRE setelah normalisasi (norm): pembobotan, threshold, skor & ranking.
+    Dipakai calc_electre dan pipeline yang sudah punya matriks ternormalisasi.
     
-    # Set diagonal menjadi 0 (alternatif tidak membandingkan dengan dirinya sendiri)
-    np.fill_diagonal(con_dom, 0)
-    np.fill_diagonal(discon_dom, 0)
+    Parameters:
+    - norm_matx: matriks ternormalisasi (kandidat x kriteria)
+    - alt: nama kandidat (urutan baris norm_matx)
+    - memory_budget, top_k, threshold_mode, n_jobs: lihat calc_electre
     
-    # 8. Aggregate dominant matrix
-    aggregate = con_dom & discon_dom
+    Returns:
+    - DataFrame hasil ranking ELECTRE
+    """
+    # 3. Matriks terbobot (semua bobot = 0.2)
+    weights = WEIGHTS
+    weighted = norm_matx * weights
     
-    # 9. Hitung skor ELECTRE
-    electre_scores = np.sum(aggregate, axis=1)
+    if n_jobs != 1:
+        # 4-9. Tile dikerjakan paralel oleh process pool (methods.electre_parallel)
+        from methods.electre_parallel import electre_parallel
+        with stage('parallel', n_jobs=n_jobs):
+            threshold_c, threshold_d, scores = electre_parallel(
+                weighted, weights, memory_budget, n_jobs, threshold_mode
+            )
+    else:
+        # 4-6. Matriks concordance & discordance dihitung per tile baris,
+        # lalu threshold = rata-rata elemen non-diagonal
+        with stage('thresholds', mode=threshold_mode, tile_rows=tile_rows(len(alt), memory_budget)):
+            threshold_c, threshold_d = electre_thresholds(weighted, weights, memory_budget, mode=threshold_mode)
+        
+        # 7-9. Matriks dominan & aggregate dihitung ulang per tile, langsung
+        # direduksi menjadi skor ELECTRE (jumlah per baris)
+        with stage('scores'):
+            scores = electre_scores(weighted, weights, threshold_c, threshold_d, memory_budget)
     
     # 10. Buat DataFrame hasil
-    results = pd.DataFrame({
-        'Nama': alt,
-        'Skor ELECTRE': electre_scores
-    })
-    
-    # 11. Ranking berdasarkan skor (descending)
-    results = results.sort_values('Skor ELECTRE', ascending=False)
-    results['Ranking'] = range(1, len(alt) + 1)
+    with stage('ranking', top_k=top_k):
+        if top_k is not None:
+            order = top_k_indices(scores, top_k, descending=True)
+            return top_k_frame(alt, 'Skor ELECTRE', scores[order], order)
+
+        results = pd.DataFrame({
+            'Nama': alt,
+            'Skor ELECTRE': scores
+        })
+        
+        # 11. Ranking berdasarkan skor (descending); sort stabil agar skor kembar
+        # berurutan dari indeks terkecil, sama dengan jalur top_k
+        results = results.sort_values('Skor ELECTRE', ascending=False, kind='stable')
+        results['Ranking'] = range(1, len(alt) + 1)
     
     return results[['Nama', 'Skor ELECTRE', 'Ranking']]
 
 # ========== FUNGSI WRAPPER UNTUK STREAMLIT ========== #
 
-def run_electre(data, job_filter_row):
+@traced('ELECTRE')
+def run_electre(data, job_filter_row, aggregated_data=None, top_k=None, threshold_mode='sequential', n_jobs=1):
     """
     Wrapper untuk menjalankan analisis ELECTRE
+    aggregated_data: hasil agg_to_5 yang sudah ada (opsional) agar tidak dihitung ulang
+    top_k: hanya k kandidat terbaik (opsional)
+    threshold_mode: cara menghitung threshold (lihat THRESHOLD_MODES)
+    n_jobs: jumlah proses worker (1 = serial)
     """
     # Agregasi data ke 5 kriteria
-    aggregated_data = agg_to_5(data, job_filter_row)
+    if aggregated_data is None:
+        aggregated_data = agg_to_5(data, job_filter_row)
     aggregated_data = aggregated_data.rename(columns={'Nama': 'NAMA'})
     
-    # Definisi kriteria dan bobot
-    criteria = ['IST', 'PAPI', 'MBTI', 'Kraepelin', 'DISC']
+    # Jalankan ELECTRE pada 5 kriteria
+    results = calc_electre(aggregated_data, CRITERIA, top_k=top_k, threshold_mode=threshold_mode, n_jobs=n_jobs)
     
-    # Jalankan ELECTRE
-    results = calc_electre(aggregated_data, criteria)
+    return results
+
+def run_electre_all_jobs(data, job_positions_df, memory_budget=DEFAULT_MEMORY_BUDGET, top_k=None,
+                         threshold_mode='sequential', n_jobs=1):
+    """
+    Menjalankan ELECTRE untuk semua posisi pekerjaan dari satu agregasi bersama.
+    top_k: hanya k kandidat terbaik per posisi (opsional)
+    threshold_mode: cara menghitung threshold (lihat THRESHOLD_MODES)
+    n_jobs: jumlah proses worker per posisi (1 = serial)
     
-    return results
\ No newline at end of file
+    Returns:
+    - dict {nama posisi: DataFrame hasil ranking ELECTRE}
+    """
+    aggregate = agg_all_jobs(data, job_positions_df)
+
+    all_results = {}
+    for j, job_name in enumerate(aggregate.job_names):
+        aggregated_data = agg_frame(aggregate, j).rename(columns={'Nama': 'NAMA'})
+        all_results[job_name] = calc_electre(aggregated_data, CRITERIA, memory_budget, top_k, threshold_mode, n_jobs)
+
+    return all_results
@@ -0,0 +1,317 @@
+# ========== ELECTRE APROKSIMASI (SAMPLING LAWAN) ========== #
+# Skor ELECTRE kandidat i = jumlah lawan yang diungguli i, yaitu (n - 1) x
+# proporsi lawan yang diungguli. Proporsi ini diestimasi dari lawan acak
+# beserta selang kepercayaan (Wilson). Threshold concordance dihitung persis
+# dari kolom terurut (O(k·n log n)); threshold discordance = rata-rata dari
+# pasangan acak.
+#
+# Setelah putaran awal, kandidat di sekitar batas top-k (dan kandidat top-k yang
+# urutannya belum pasti) diberi lawan tambahan (jumlah sampel digandakan) sampai
+# selangnya tidak lagi tumpang tindih. Kandidat yang sampelnya hampir n - 1
+# langsung dihitung persis terhadap semua lawan. Berhenti jika semua sudah pasti
+# atau anggaran pasangan / waktu habis.
+
+import time
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import prep_dm, agg_to_5, CRITERIA, WEIGHTS
+from utils.instrument import stage, traced
+from methods.electre import (
+    DEFAULT_MEMORY_BUDGET, norm, concordance_levels, concordance_pair_counts, electre_thresholds
+)
+
+# Jumlah lawan acak awal per kandidat
+DEFAULT_SAMPLES = 64
+
+# Jumlah pasangan acak untuk threshold discordance; jika n(n-1) tidak lebih
+# besar dari ini, threshold dihitung persis
+DEFAULT_THRESHOLD_PAIRS = 200_000
+
+# Jumlah kandidat teratas yang urutannya dipastikan
+DEFAULT_TOP_K = 10
+
+DEFAULT_CONFIDENCE = 0.95
+
+# Anggaran waktu default (detik) untuk pipeline / Streamlit
+DEFAULT_TIME_BUDGET = 5.0
+
+# Perkiraan byte array sementara per pasangan yang dievaluasi
+_BYTES_PER_PASANGAN = 160
+
+# Hasil ELECTRE aproksimasi:
+# - results: DataFrame (Nama, Skor ELECTRE (Estimasi), Batas Bawah, Batas Atas,
+#   Lawan Diuji, Ranking), index = posisi kandidat, urut estimasi skor
+# - threshold_c: threshold concordance (persis)
+# - threshold_d, threshold_d_se: threshold discordance & standard error-nya
+#   (0 jika dihitung persis)
+# - settled: True jika anggota & urutan top-k sudah pasti pada tingkat kepercayaan
+# - n_pairs: jumlah pasangan yang dievaluasi untuk skor
+# - rounds: jumlah putaran penyempurnaan
+ApproxElectre = namedtuple(
+    'ApproxElectre',
+    ['results', 'threshold_c', 'threshold_d', 'threshold_d_se', 'settled', 'n_pairs', 'rounds']
+)
+
+def pair_terms(weighted, rows, cols):
+    """
+    Bitmask concordance & nilai discordance untuk pasangan (rows[p], cols[p]),
+    sama dengan elemen concordance_mask_tile / discordance_tile.
+    """
+    k = weighted.shape[1]
+    mask = np.zeros(len(rows), dtype=np.min_scalar_type(2 ** k - 1))
+    max_diff_discord = np.zeros(len(rows))
+    max_diff_all = np.zeros(len(rows))
+    for c in range(k):
+        col = weighted[:, c]
+        a, b = col[rows], col[cols]
+        mask |= (a >= b).astype(mask.dtype) << c
+        diff = b - a
+        np.fmax(max_diff_discord, diff, out=max_diff_discord)
+        np.fmax(max_diff_all, np.abs(diff, out=diff), out=max_diff_all)
+
+    discordance = np.zeros_like(max_diff_all)
+    np.divide(max_diff_discord, max_diff_all, out=discordance, where=max_diff_all != 0)
+    return mask, discordance
+
+def _chunks(m, memory_budget):
+    step = max(1, memory_budget // _BYTES_PER_PASANGAN)
+    for start in range(0, m, step):
+        yield start, min(start + step, m)
+
+def pair_dominance(weighted, con_ok, threshold_d, rows, cols, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    True jika kandidat rows[p] mengungguli cols[p] (pasangan i == j selalu False).
+    """
+    dominated = np.empty(len(rows), dtype=bool)
+    for start, stop in _chunks(len(rows), memory_budget):
+        r, c = rows[start:stop], cols[start:stop]
+        mask, discordance = pair_terms(weighted, r, c)
+        dominated[start:stop] = con_ok[mask] & (discordance <= threshold_d) & (r != c)
+    return dominated
+
+def random_opponents(rng, rows, n):
+    """
+    Lawan acak seragam untuk setiap baris (tidak pernah dirinya sendiri).
+    """
+    cols = rng.integers(0, n - 1, size=len(rows))
+    cols += cols >= rows
+    return cols
+
+def sampled_thresholds(weighted, weights, rng, n_pairs=DEFAULT_THRESHOLD_PAIRS, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Threshold concordance (persis) & discordance (rata-rata pasangan acak).
+
+    Returns:
+    - (threshold_c, threshold_d, standard error threshold_d)
+    """
+    n = weighted.shape[0]
+    count = n * (n - 1)
+    if count <= n_pairs:
+        threshold_c, threshold_d = electre_thresholds(weighted, weights, memory_budget, mode='sorted')
+        return threshold_c, threshold_d, 0.0
+
+    # sum(C) = sum_k bobot_k * jumlah pasangan yang memenuhi kriteria k (lihat mode 'sorted')
+    threshold_c = float(np.dot(weights, concordance_pair_counts(weighted))) / count
+
+    rows = rng.integers(0, n, size=n_pairs)
+    cols = random_opponents(rng, rows, n)
+    discordance = np.concatenate([
+        pair_terms(weighted, rows[start:stop], cols[start:stop])[1]
+        for start, stop in _chunks(n_pairs, memory_budget)
+    ])
+    return threshold_c, float(discordance.mean()), float(discordance.std(ddof=1) / np.sqrt(n_pairs))
+
+def wilson_interval(successes, trials, z):
+    """
+    Selang kepercayaan Wilson untuk proporsi successes / trials (tervektorisasi).
+    """
+    trials = np.maximum(trials, 1)
+    p = successes / trials
+    z2 = z * z
+    denom = 1 + z2 / trials
+    center = (p + z2 / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z2 / (4 * trials ** 2)) / denom
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+def unsettled(scores, lower, upper, exact, top_k):
+    """
+    Kandidat yang perlu lawan tambahan: selangnya tumpang tindih dengan batas
+    top-k (anggota top-k vs sisanya), atau dengan tetangganya di dalam top-k.
+    Kandidat yang sudah dihitung persis tidak pernah dipilih.
+    """
+    n = len(scores)
+    order = np.lexsort((np.arange(n), -scores))
+    flagged = np.zeros(n, dtype=bool)
+    k = min(top_k, n)
+    top = order[:k]
+
+    # 1. Batas top-k: anggota yang bisa lebih buruk dari bukan-anggota terbaik
+    if k < n:
+        rest = order[k:]
+        flagged[top[lower[top] <= upper[rest].max()]] = True
+        flagged[rest[upper[rest] >= lower[top].min()]] = True
+
+    # 2. Urutan di dalam top-k: tetangga yang selangnya tumpang tindih
+    overlap = lower[top[:-1]] <= upper[top[1:]]
+    flagged[top[:-1][overlap]] = True
+    flagged[top[1:][overlap]] = True
+
+    return np.flatnonzero(flagged & ~exact)
+
+@traced('electre_approx')
+def approx_electre(data, criteria, top_k=DEFAULT_TOP_K, samples=DEFAULT_SAMPLES, max_pairs=None, time_budget=None,
+                   confidence=DEFAULT_CONFIDENCE, threshold_pairs=DEFAULT_THRESHOLD_PAIRS, seed=0,
+                   memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    ELECTRE aproksimasi dengan sampling lawan & penyempurnaan batas top-k.
+
+    Parameters:
+    - data: DataFrame kandidat dengan kolom 'NAMA' dan kolom kriteria
+    - criteria: list nama kolom kriteria
+    - top_k: jumlah kandidat teratas yang anggota & urutannya dipastikan
+    - samples: jumlah lawan acak awal per kandidat
+    - max_pairs: anggaran jumlah pasangan untuk skor (None = tanpa batas)
+    - time_budget: anggaran waktu penyempurnaan dalam detik (None = tanpa batas)
+    - confidence: tingkat kepercayaan selang per kandidat (0-1)
+    - threshold_pairs: jumlah pasangan acak untuk threshold discordance
+    - seed: seed generator acak
+    - memory_budget: batas memori (byte) untuk satu blok pasangan
+
+    Returns:
+    - ApproxElectre
+    """
+    # 1-2. Matriks keputusan & normalisasi
+    with stage('prepare') as info:
+        dm, alt = prep_dm(data, criteria)
+        norm_matx = norm(dm)
+        info.note(dm=dm)
+
+    # 3-9. Pembobotan, threshold, sampling & ranking
+    return approx_electre_ranking(norm_matx, alt, top_k, samples, max_pairs, time_budget, confidence,
+                                  threshold_pairs, seed, memory_budget)
+
+def approx_electre_ranking(norm_matx, alt, top_k=DEFAULT_TOP_K, samples=DEFAULT_SAMPLES, max_pairs=None,
+                           time_budget=None, confidence=DEFAULT_CONFIDENCE, threshold_pairs=DEFAULT_THRESHOLD_PAIRS,
+                           seed=0, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Langkah ELECTRE aproksimasi setelah normalisasi (norm), dipakai approx_electre
+    dan pipeline yang sudah punya matriks ternormalisasi.
+
+    Parameters:
+    - norm_matx: matriks ternormalisasi (kandidat x kriteria)
+    - alt: nama kandidat (urutan baris norm_matx)
+    - lainnya: lihat approx_electre
+
+    Returns:
+    - ApproxElectre
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence harus di antara 0 dan 1.")
+    if top_k < 1 or samples < 1:
+        raise ValueError("top_k dan samples harus >= 1.")
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # 3. Matriks terbobot (semua bobot = 0.2)
+    weights = WEIGHTS
+    weighted = np.asarray(norm_matx) * weights
+    n = len(alt)
+
+    # 4-6. Threshold (concordance persis, discordance dari pasangan acak)
+    with stage('thresholds', pairs=min(threshold_pairs, n * (n - 1))):
+        threshold_c, threshold_d, threshold_d_se = sampled_thresholds(
+            weighted, weights, rng, threshold_pairs, memory_budget
+        )
+    con_ok = concordance_levels(weights) >= threshold_c
+
+    wins = np.zeros(n, dtype=np.int64)
+    trials = np.zeros(n, dtype=np.int64)
+    exact = np.zeros(n, dtype=bool)
+
+    def sample(idx, counts):
+        rows = np.repeat(idx, counts)
+        dominated = pair_dominance(weighted, con_ok, threshold_d, rows, random_opponents(rng, rows, n),
+                                   memory_budget)
+        wins[:] += np.bincount(rows[dominated], minlength=n)
+        trials[idx] += counts
+        return len(rows)
+
+    def make_exact(idx):
+        # Semua lawan, per blok baris agar pasangan satu blok muat di memory_budget
+        step = max(1, memory_budget // _BYTES_PER_PASANGAN // max(n, 1))
+        for start in range(0, len(idx), step):
+            block = idx[start:start + step]
+            rows = np.repeat(block, n)
+            dominated = pair_dominance(weighted, con_ok, threshold_d, rows, np.tile(np.arange(n), len(block)),
+                                       memory_budget)
+            wins[block] = dominated.reshape(len(block), n).sum(axis=1)
+        trials[idx] = n - 1
+        exact[idx] = True
+        return len(idx) * (n - 1)
+
+    def refine(idx):
+        # Sampel digandakan; jika hampir semua lawan, hitung persis
+        to_exact = trials[idx] * 2 >= n - 1
+        return make_exact(idx[to_exact]) + sample(idx[~to_exact], trials[idx[~to_exact]])
+
+    # 7. Putaran awal: lawan acak untuk setiap kandidat
+    initial = max(1, min(samples, n - 1))
+    if max_pairs is not None:
+        initial = max(1, min(initial, max_pairs // max(n, 1)))
+    with stage('sample', samples=initial):
+        if n <= 1 or initial * 2 >= n - 1:
+            n_pairs = make_exact(np.arange(n))
+        else:
+            n_pairs = sample(np.arange(n), initial)
+
+    # 8. Penyempurnaan kandidat di sekitar batas top-k
+    rounds = 0
+    with stage('refine') as info:
+        while True:
+            estimate = wins / np.maximum(trials, 1)
+            low, high = wilson_interval(wins, trials, z)
+            low[exact] = high[exact] = estimate[exact]
+            pending = unsettled(estimate, low, high, exact, top_k)
+            if len(pending) == 0:
+                break
+            if time_budget is not None and time.perf_counter() - started > time_budget:
+                break
+            cost = int(np.where(trials[pending] * 2 >= n - 1, n - 1, trials[pending]).sum())
+            if max_pairs is not None and n_pairs + cost > max_pairs:
+                break
+            n_pairs += refine(pending)
+            rounds += 1
+        settled = len(pending) == 0
+        info.note(rounds=rounds, pairs=n_pairs, exact=int(exact.sum()), settled=settled)
+
+    # 9. DataFrame hasil: skor = (n - 1) x proporsi lawan yang diungguli
+    with stage('ranking'):
+        scale = max(n - 1, 0)
+        order = np.lexsort((np.arange(n), -estimate))
+        results = pd.DataFrame({
+            'Nama': alt,
+            'Skor ELECTRE (Estimasi)': estimate * scale,
+            'Batas Bawah': low * scale,
+            'Batas Atas': high * scale,
+            'Lawan Diuji': trials
+        }).take(order)
+        results['Ranking'] = range(1, n + 1)
+
+    return ApproxElectre(results, threshold_c, threshold_d, threshold_d_se, settled, n_pairs, rounds)
+
+# ========== FUNGSI WRAPPER UNTUK STREAMLIT ========== #
+
+def run_electre_approx(data, job_filter_row, aggregated_data=None, top_k=DEFAULT_TOP_K,
+                       time_budget=DEFAULT_TIME_BUDGET, seed=0):
+    """
+    Wrapper ELECTRE aproksimasi untuk satu posisi pekerjaan
+    aggregated_data: hasil agg_to_5 yang sudah ada (opsional) agar tidak dihitung ulang
+    """
+    if aggregated_data is None:
+        aggregated_data = agg_to_5(data, job_filter_row)
+    aggregated_data = aggregated_data.rename(columns={'Nama': 'NAMA'})
+    return approx_electre(aggregated_data, CRITERIA, top_k=top_k, time_budget=time_budget, seed=seed)
@@ -0,0 +1,188 @@
+# ========== ELECTRE PARALEL (MULTI-CORE) ========== #
+# Matriks terbobot diletakkan di shared memory, tile baris perbandingan
+# berpasangan dikerjakan oleh process pool.
+#
+# Threshold sama persis dengan jalur serial (electre_thresholds), berapa pun
+# jumlah worker & ukuran tile:
+# - 'sequential': jumlah berurutan tidak bisa dipecah, jadi worker mengirim
+#   bitmask concordance (1 byte per pasangan) & nilai discordance tile-nya, dan
+#   parent melanjutkan _sequential_sum sesuai urutan tile
+# - 'sorted': worker mereduksi tile-nya sendiri menjadi jumlah persis
+#   (exact_sum); parent menjumlahkan Fraction lalu membulatkan sekali
+# Skor selalu direduksi di worker (ke parent hanya skor per baris).
+#
+# Process pool dibuat sekali per jumlah worker dan dipakai ulang (start
+# interpreter worker tidak terjadi di setiap panggilan). Pool tidak pernah
+# ditutup selama proses berjalan (kecuali rusak atau lewat shutdown()), sehingga
+# panggilan lain di thread berbeda tidak mendapati pool-nya tertutup.
+
+import os
+import threading
+from collections import deque
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+from methods.electre import (
+    DEFAULT_MEMORY_BUDGET, THRESHOLD_MODES, iter_tiles,
+    concordance_levels, concordance_mask_tile, concordance_tile, discordance_tile, concordance_pair_counts,
+    electre_scores_tile, exact_sum, _sequential_sum
+)
+
+# State worker: shared memory matriks terbobot yang terakhir di-attach
+_worker = {}
+
+# Process pool per jumlah worker (lihat _get_executor)
+_executors = {}
+_executor_lock = threading.Lock()
+
+def resolve_n_jobs(n_jobs):
+    """
+    Jumlah worker: None atau -1 = semua core.
+    """
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    return max(1, int(n_jobs))
+
+def _get_executor(n_jobs):
+    """
+    Process pool bersama untuk n_jobs worker; pool untuk jumlah worker lain
+    tidak disentuh (bisa sedang dipakai thread lain).
+    """
+    with _executor_lock:
+        if n_jobs not in _executors:
+            _executors[n_jobs] = ProcessPoolExecutor(max_workers=n_jobs, mp_context=get_context('spawn'))
+        return _executors[n_jobs]
+
+def _discard_executor(executor):
+    """
+    Membuang pool yang rusak (BrokenProcessPool); panggilan berikutnya membuat pool baru.
+    """
+    with _executor_lock:
+        for n_jobs, cached in list(_executors.items()):
+            if cached is executor:
+                del _executors[n_jobs]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def shutdown():
+    """
+    Menutup semua process pool (mis. di akhir CLI / test).
+    """
+    with _executor_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+def _weighted(spec):
+    """
+    Matriks terbobot di worker; attach ulang hanya jika shared memory berganti.
+    """
+    name, shape, dtype = spec
+    if _worker.get('name') != name:
+        if 'shm' in _worker:
+            _worker.pop('weighted')
+            _worker.pop('shm').close()
+        _worker['shm'] = shared_memory.SharedMemory(name=name)
+        _worker['weighted'] = np.ndarray(shape, dtype=dtype, buffer=_worker['shm'].buf)
+        _worker['name'] = name
+    return _worker['weighted']
+
+def _tile_values(spec, start, stop):
+    """
+    Mode 'sequential': bitmask concordance & nilai discordance satu tile,
+    dijumlahkan berurutan oleh parent.
+    """
+    weighted = _weighted(spec)
+    return concordance_mask_tile(weighted, start, stop), discordance_tile(weighted, start, stop)
+
+def _tile_discordance_sum(spec, start, stop):
+    """
+    Mode 'sorted': jumlah persis discordance satu tile (Fraction).
+    """
+    return exact_sum(discordance_tile(_weighted(spec), start, stop))
+
+def _in_order(executor, func, spec, tiles, window):
+    """
+    Hasil func(spec, start, stop) per tile sesuai urutan tile, dengan paling
+    banyak window tile yang sedang dikerjakan / menunggu diambil parent.
+    """
+    pending = deque()
+    for start, stop in tiles:
+        pending.append(((start, stop), executor.submit(func, spec, start, stop)))
+        if len(pending) >= window:
+            tile, future = pending.popleft()
+            yield tile, future.result()
+    while pending:
+        tile, future = pending.popleft()
+        yield tile, future.result()
+
+def _tile_scores(spec, start, stop, con_ok, threshold_d):
+    return electre_scores_tile(_weighted(spec), con_ok, threshold_d, start, stop)
+
+def electre_parallel(weighted, weights, memory_budget=DEFAULT_MEMORY_BUDGET, n_jobs=None,
+                     threshold_mode='sequential'):
+    """
+    Threshold & skor ELECTRE dengan process pool.
+    Setiap worker memproses satu tile (lihat iter_tiles) sekaligus, jadi
+    memori sementara kurang lebih n_jobs x memory_budget (mode 'sequential'
+    ditambah nilai paling banyak 2 x n_jobs tile yang menunggu dijumlahkan parent).
+
+    Parameters:
+    - weighted: matriks ternormalisasi & terbobot (n x k)
+    - weights: bobot kriteria
+    - memory_budget: batas memori (byte) satu tile per worker
+    - n_jobs: jumlah worker (None / -1 = semua core)
+    - threshold_mode: salah satu THRESHOLD_MODES
+
+    Returns:
+    - (threshold_c, threshold_d, skor int64 per alternatif)
+    """
+    if threshold_mode not in THRESHOLD_MODES:
+        raise ValueError(f"threshold_mode harus salah satu dari {THRESHOLD_MODES}, bukan {threshold_mode!r}.")
+    n_jobs = resolve_n_jobs(n_jobs)
+    weighted = np.ascontiguousarray(weighted, dtype=float)
+    n = weighted.shape[0]
+    tiles = list(iter_tiles(n, memory_budget))
+    levels = concordance_levels(weights)
+    count = n * (n - 1)
+
+    weighted_shm = shared_memory.SharedMemory(create=True, size=max(1, weighted.nbytes))
+    try:
+        np.ndarray(weighted.shape, dtype=float, buffer=weighted_shm.buf)[:] = weighted
+        spec = (weighted_shm.name, weighted.shape, float)
+        executor = _get_executor(n_jobs)
+
+        # 1. Threshold, sama persis dengan electre_thresholds (urutan tile tetap)
+        if threshold_mode == 'sequential':
+            concordance_sum = 0.0
+            discordance_sum = 0.0
+            for (start, stop), (mask, discordance) in _in_order(executor, _tile_values, spec, tiles, 2 * n_jobs):
+                concordance_sum = _sequential_sum(
+                    concordance_sum, concordance_tile(weighted, levels, start, stop, mask)
+                )
+                discordance_sum = _sequential_sum(discordance_sum, discordance)
+            threshold_c, threshold_d = concordance_sum / count, discordance_sum / count
+        else:
+            concordance_sum = float(np.dot(weights, concordance_pair_counts(weighted)))
+            futures = [executor.submit(_tile_discordance_sum, spec, start, stop) for start, stop in tiles]
+            discordance_sum = sum((future.result() for future in futures), Fraction(0))
+            threshold_c, threshold_d = concordance_sum / count, float(discordance_sum / count)
+
+        # 2. Skor: jumlah alternatif yang didominasi per baris
+        con_ok = levels >= threshold_c
+        futures = [executor.submit(_tile_scores, spec, start, stop, con_ok, threshold_d) for start, stop in tiles]
+        scores = np.zeros(n, dtype=np.int64)
+        for (start, stop), future in zip(tiles, futures):
+            scores[start:stop] = future.result()
+    except BrokenProcessPool:
+        # Worker mati (mis. kehabisan memori): pool dibuat ulang pada panggilan berikutnya
+        _discard_executor(executor)
+        raise
+    finally:
+        weighted_shm.close()
+        weighted_shm.unlink()
+
+    return threshold_c, threshold_d, scores
@@ -0,0 +1,275 @@
+# ========== RANKING INKREMENTAL (PENAMBAHAN KANDIDAT) ========== #
+
+from collections import namedtuple
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import agg_to_5, feature_cache, CRITERIA, WEIGHTS, V
+from methods.vikor import vikor_sr, vikor_q
+from methods.electre import (
+    DEFAULT_MEMORY_BUDGET, norm, tile_rows, sorted_pair_count, discordance_tile, discordance_block,
+    discordance_total, exact_sum, electre_scores
+)
+
+# Hasil satu kali penambahan kandidat:
+# - vikor_changes: DataFrame kandidat lama yang peringkat VIKOR-nya berubah
+# - electre_changes: DataFrame kandidat lama yang peringkat ELECTRE-nya berubah
+# - recomputed: dict ringkasan bagian yang dihitung ulang
+RankUpdate = namedtuple('RankUpdate', ['vikor_changes', 'electre_changes', 'recomputed'])
+
+def _same(a, b):
+    """
+    Perbandingan per elemen yang menganggap NaN == NaN.
+    """
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+def _ranks_from_order(order):
+    ranking = np.empty_like(order)
+    ranking[order] = np.arange(1, len(order) + 1)
+    return ranking
+
+def _rank_changes(names, old_ranking, new_ranking):
+    """
+    DataFrame kandidat lama yang peringkatnya berubah.
+    """
+    moved = np.flatnonzero(old_ranking != new_ranking[:len(old_ranking)])
+    return pd.DataFrame({
+        'Nama': [names[i] for i in moved],
+        'Ranking Lama': old_ranking[moved],
+        'Ranking Baru': new_ranking[moved]
+    })
+
+class IncrementalRanker:
+    """
+    Menyimpan state ranking satu posisi pekerjaan agar penambahan kandidat
+    tidak memicu agregasi dan ranking ulang penuh. Semua state berukuran O(n·k).
+
+    VIKOR: S/R baris lama hanya dihitung ulang jika f_star/f_minus atau
+    agregasi baris lama berubah; urutan hanya di-sort ulang jika Q lama berubah
+    (nilai ekstrem S/R bergeser), selain itu kandidat baru disisipkan.
+
+    ELECTRE (threshold mode 'sorted', lihat methods.electre): urutan tiap kolom
+    disimpan, sehingga jumlah pasangan concordance per kriteria (dan
+    threshold_c) diperbarui dalam O(n·k) tanpa matriks n x n; pembagian dengan
+    norma kolom tidak mengubah urutan. Jumlah discordance (persis, Fraction)
+    hanya ditambah pasangan baru jika norma kolom tetap; jika norma berubah
+    (hampir setiap penambahan) discordance dihitung ulang penuh O(n^2) per
+    tile. Skor selalu dihitung ulang per tile karena threshold bergeser.
+    State ELECTRE baru dibangun pada penambahan pertama. Tabel ELECTRE di
+    halaman utama tetap dari pipeline (mode 'sequential'); ranker ini dipakai
+    untuk melaporkan perubahan peringkat.
+    """
+
+    def __init__(self, data, job_filter_row, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.job_filter_row = job_filter_row
+        self.memory_budget = memory_budget
+        self.data = data.reset_index(drop=True)
+        self.names = self.data['NAMA'].tolist()
+        self.features = feature_cache.get(self.data)
+        self.agg_data = agg_to_5(self.data, job_filter_row, self.features)
+        self.agg = self.agg_data[CRITERIA].to_numpy(dtype=float)
+        self.last_update = None
+        self.electre_ranking = None
+
+        self._init_vikor()
+
+    # ---------- VIKOR ---------- #
+
+    def _init_vikor(self):
+        dm = self.agg[np.newaxis]
+        self._f_star = np.max(dm, axis=1, keepdims=True)
+        self._f_minus = np.min(dm, axis=1, keepdims=True)
+        self._S, self._R = vikor_sr(dm, WEIGHTS, self._f_star, self._f_minus)
+        self._Q = vikor_q(self._S, self._R, V)[0]
+        self._vikor_order = np.argsort(self._Q, kind='stable')
+        self.vikor_ranking = _ranks_from_order(self._vikor_order)
+
+    def _update_vikor(self, agg, changed_rows, recomputed):
+        n_old = len(self._Q)
+        dm = agg[np.newaxis]
+        f_star = np.max(dm, axis=1, keepdims=True)
+        f_minus = np.min(dm, axis=1, keepdims=True)
+
+        extremes_same = np.array_equal(f_star, self._f_star) and np.array_equal(f_minus, self._f_minus)
+        if changed_rows.size == 0 and extremes_same:
+            # Baris lama tidak berubah -> hanya S/R kandidat baru yang dihitung
+            S_new, R_new = vikor_sr(dm[:, n_old:], WEIGHTS, f_star, f_minus)
+            S = np.concatenate([self._S, S_new], axis=1)
+            R = np.concatenate([self._R, R_new], axis=1)
+            recomputed['vikor_sr'] = False
+        else:
+            S, R = vikor_sr(dm, WEIGHTS, f_star, f_minus)
+            recomputed['vikor_sr'] = True
+
+        Q = vikor_q(S, R, V)[0]
+
+        if not recomputed['vikor_sr'] and np.array_equal(Q[:n_old], self._Q):
+            # Q lama tidak berubah -> sisipkan kandidat baru ke urutan yang ada
+            new_idx = n_old + np.argsort(Q[n_old:], kind='stable')
+            pos = np.searchsorted(Q[self._vikor_order], Q[new_idx], side='right')
+            order = np.insert(self._vikor_order, pos, new_idx)
+            recomputed['vikor_order'] = False
+        else:
+            order = np.argsort(Q, kind='stable')
+            recomputed['vikor_order'] = True
+
+        self._f_star, self._f_minus = f_star, f_minus
+        self._S, self._R, self._Q = S, R, Q
+        self._vikor_order = order
+        self.vikor_ranking = _ranks_from_order(order)
+
+    def vikor_results(self):
+        """
+        DataFrame hasil ranking VIKOR (format sama dengan calc_vikor).
+        """
+        results = pd.DataFrame({
+            'Nama': self.names,
+            'Skor VIKOR': self._Q
+        })
+        results = results.take(self._vikor_order)
+        results['Ranking'] = range(1, len(self.names) + 1)
+        return results[['Nama', 'Skor VIKOR', 'Ranking']]
+
+    # ---------- ELECTRE ---------- #
+
+    def _column_orders(self, agg):
+        """
+        Urutan stabil tiap kolom agregasi (tanpa NaN), satu array indeks per kriteria.
+        """
+        orders = []
+        for c in range(agg.shape[1]):
+            col = agg[:, c]
+            valid = np.flatnonzero(~np.isnan(col))
+            orders.append(valid[np.argsort(col[valid], kind='stable')])
+        return orders
+
+    def _pair_counts(self, weighted):
+        """
+        Jumlah pasangan concordance per kriteria dari urutan kolom yang disimpan;
+        sama dengan concordance_pair_counts(weighted) tanpa sort ulang.
+        """
+        counts = []
+        for c, order in enumerate(self._col_orders):
+            col = weighted[order, c]
+            counts.append(sorted_pair_count(col[~np.isnan(col)]))
+        return counts
+
+    def _score_electre(self, recomputed):
+        n = len(self._weighted)
+        count = n * (n - 1)
+        if count == 0:
+            scores = np.zeros(n, dtype=np.int64)
+        else:
+            threshold_c = float(np.dot(WEIGHTS, self._pair_counts(self._weighted))) / count
+            threshold_d = float(self._discordance_sum / count)
+            scores = electre_scores(self._weighted, WEIGHTS, threshold_c, threshold_d, self.memory_budget)
+        self._electre_scores = scores
+        self._electre_order = np.argsort(-scores, kind='stable')
+        self.electre_ranking = _ranks_from_order(self._electre_order)
+        recomputed['electre_scores'] = True
+
+    def _init_electre(self, recomputed=None):
+        recomputed = {} if recomputed is None else recomputed
+        self._weighted = norm(self.agg) * WEIGHTS
+        self._col_norm = np.sqrt(np.sum(np.ascontiguousarray(self.agg.T ** 2), axis=1))
+        self._col_orders = self._column_orders(self.agg)
+        self._discordance_sum = discordance_total(self._weighted, self.memory_budget)
+        recomputed['electre_concordance'] = True
+        recomputed['electre_discordance'] = True
+        self._score_electre(recomputed)
+
+    def _update_electre(self, agg, changed_rows, recomputed):
+        n_old = len(self._weighted)
+        if changed_rows.size > 0:
+            # Agregasi baris lama berubah: urutan kolom & discordance dibangun ulang
+            self.agg = agg
+            self._init_electre(recomputed)
+            return
+
+        # 1. Urutan kolom: kandidat baru disisipkan (O(n) per kriteria)
+        orders = []
+        for c, order in enumerate(self._col_orders):
+            col = agg[:, c]
+            new = n_old + np.flatnonzero(~np.isnan(col[n_old:]))
+            new = new[np.argsort(col[new], kind='stable')]
+            pos = np.searchsorted(col[order], col[new], side='right')
+            orders.append(np.insert(order, pos, new))
+        self._col_orders = orders
+        recomputed['electre_concordance'] = False
+
+        # 2. Matriks terbobot & discordance
+        weighted = norm(agg) * WEIGHTS
+        col_norm = np.sqrt(np.sum(np.ascontiguousarray(agg.T ** 2), axis=1))
+        if np.array_equal(col_norm, self._col_norm):
+            # Norma tetap: baris lama tidak berubah, hanya pasangan baru ditambahkan
+            n = len(weighted)
+            total = self._discordance_sum + exact_sum(discordance_tile(weighted, n_old, n))
+            step = tile_rows(max(n - n_old, 1), self.memory_budget)
+            for start in range(0, n_old, step):
+                stop = min(start + step, n_old)
+                total += exact_sum(discordance_block(weighted, slice(start, stop), slice(n_old, n)))
+            self._discordance_sum = total
+            recomputed['electre_discordance'] = False
+        else:
+            self._discordance_sum = discordance_total(weighted, self.memory_budget)
+            recomputed['electre_discordance'] = True
+        self._weighted, self._col_norm = weighted, col_norm
+
+        # 3. Skor & urutan (threshold berubah -> semua baris dihitung ulang per tile)
+        self._score_electre(recomputed)
+
+    def electre_results(self):
+        """
+        DataFrame hasil ranking ELECTRE (format sama dengan
+        calc_electre(..., threshold_mode='sorted')), atau None sebelum penambahan pertama.
+        """
+        if self.electre_ranking is None:
+            return None
+        results = pd.DataFrame({
+            'Nama': self.names,
+            'Skor ELECTRE': self._electre_scores
+        })
+        results = results.take(self._electre_order)
+        results['Ranking'] = range(1, len(self.names) + 1)
+        return results[['Nama', 'Skor ELECTRE', 'Ranking']]
+
+    # ---------- Penambahan kandidat ---------- #
+
+    def append(self, new_rows):
+        """
+        Menambahkan kandidat baru (DataFrame dengan kolom yang sama seperti data)
+        dan memperbarui ranking secara inkremental.
+
+        Returns:
+        - RankUpdate
+        """
+        n_old = len(self.data)
+        data = pd.concat([self.data, new_rows], ignore_index=True)
+        features = feature_cache.get(data)
+        agg_data = agg_to_5(data, self.job_filter_row, features)
+        agg = agg_data[CRITERIA].to_numpy(dtype=float)
+
+        # Baris lama yang agregasinya berubah (threshold IST / min-max DISC bergeser)
+        changed_rows = np.flatnonzero(~_same(agg[:n_old], self.agg).all(axis=1))
+        recomputed = {'aggregate_rows': int(changed_rows.size)}
+
+        old_vikor = self.vikor_ranking
+        self._update_vikor(agg, changed_rows, recomputed)
+
+        # State ELECTRE dibangun dari data lama pada penambahan pertama
+        if self.electre_ranking is None:
+            self._init_electre()
+        old_electre = self.electre_ranking
+        self._update_electre(agg, changed_rows, recomputed)
+
+        self.data, self.features = data, features
+        self.agg_data, self.agg = agg_data, agg
+        self.names.extend(data['NAMA'].iloc[n_old:].tolist())
+
+        self.last_update = RankUpdate(
+            vikor_changes=_rank_changes(self.names, old_vikor, self.vikor_ranking),
+            electre_changes=_rank_changes(self.names, old_electre, self.electre_ranking),
+            recomputed=recomputed
+        )
+        return self.last_update
@@ -0,0 +1,262 @@
+# ========== GRAF OUTRANKING ELECTRE (BIT-PACKED) ========== #
+# Relasi outranking ELECTRE (a mengungguli b jika concordance >= threshold_c dan
+# discordance <= threshold_d) disimpan sebagai baris bit ter-pack: 1 bit per
+# pasangan, bukan 8 byte (int64). Di atas bentuk ter-pack ini:
+# - out-degree per kandidat = popcount baris = Skor ELECTRE
+# - komponen terhubung kuat (SCC) dengan Kosaraju; tetangga yang belum
+#   dikunjungi dicari dengan operasi AND pada bitset, sehingga setiap simpul
+#   hanya diproses O(1) kali walaupun grafnya padat
+# - kernel ELECTRE I: siklus dipadatkan menjadi satu simpul (kelas indiferen),
+#   lalu kernel graf asiklik = kandidat yang tidak diungguli anggota kernel
+# - ekspor daftar sisi (CSV) atau file .npz ter-pack
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import prep_dm, agg_to_5, CRITERIA, WEIGHTS
+from utils.instrument import stage, traced
+from methods.electre import (
+    DEFAULT_MEMORY_BUDGET, norm, iter_tiles, tile_rows, concordance_levels,
+    electre_thresholds, electre_relation_tile, popcount_rows
+)
+
+# Graf outranking:
+# - bits: uint8 (n x ceil(n / 8)), bit j baris i = kandidat i mengungguli j
+# - names: nama kandidat (urutan baris)
+# - threshold_c, threshold_d: threshold ELECTRE yang dipakai
+OutrankingGraph = namedtuple('OutrankingGraph', ['bits', 'names', 'threshold_c', 'threshold_d'])
+
+# Komponen terhubung kuat:
+# - labels: nomor komponen per kandidat, urut topologis (komponen 0 tidak
+#   diungguli komponen lain)
+# - sizes: jumlah kandidat per komponen
+Components = namedtuple('Components', ['labels', 'sizes'])
+
+def graph_nbytes(n):
+    """
+    Ukuran (byte) relasi ter-pack untuk n kandidat (satu arah).
+    """
+    return n * ((n + 7) // 8)
+
+@traced('electre_graph')
+def electre_graph(data, criteria, memory_budget=DEFAULT_MEMORY_BUDGET, threshold_mode='sequential'):
+    """
+    Membangun graf outranking ELECTRE (langkah & threshold sama dengan calc_electre).
+
+    Parameters:
+    - data: DataFrame kandidat dengan kolom 'NAMA' dan kolom kriteria
+    - criteria: list nama kolom kriteria
+    - memory_budget: batas memori (byte) untuk satu tile perbandingan berpasangan
+    - threshold_mode: lihat THRESHOLD_MODES
+
+    Returns:
+    - OutrankingGraph
+    """
+    # 1-3. Matriks keputusan, normalisasi & pembobotan (semua bobot = 0.2)
+    with stage('prepare') as info:
+        dm, alt = prep_dm(data, criteria)
+        weights = WEIGHTS
+        weighted = norm(dm) * weights
+        n = len(alt)
+        info.note(dm=dm, graph_bytes=graph_nbytes(n))
+
+    # 4-6. Threshold concordance & discordance
+    with stage('thresholds', mode=threshold_mode, tile_rows=tile_rows(n, memory_budget)):
+        threshold_c, threshold_d = electre_thresholds(weighted, weights, memory_budget, mode=threshold_mode)
+
+    # 7-9. Relasi outranking per tile, langsung disimpan ter-pack
+    con_ok = concordance_levels(weights) >= threshold_c
+    bits = np.empty((n, (n + 7) // 8), dtype=np.uint8)
+    for start, stop in iter_tiles(n, memory_budget):
+        with stage('relation_tile', tile_rows=stop - start):
+            bits[start:stop] = electre_relation_tile(weighted, con_ok, threshold_d, start, stop)
+
+    return OutrankingGraph(bits, np.asarray(alt, dtype=object), threshold_c, threshold_d)
+
+def out_degree(graph):
+    """
+    Jumlah kandidat yang diungguli setiap kandidat (= Skor ELECTRE).
+    """
+    return popcount_rows(graph.bits)
+
+def transpose_bits(bits, n, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Relasi terbalik ter-pack (bit i baris j = i mengungguli j), per tile
+    baris kelipatan 8 agar setiap tile mengisi byte utuh.
+    """
+    transposed = np.zeros_like(bits)
+    step = max(8, tile_rows(n, memory_budget) // 8 * 8)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        block = np.unpackbits(bits[start:stop], axis=1, count=n, bitorder='little')
+        transposed[:, start // 8:(stop + 7) // 8] = np.packbits(block.T, axis=1, bitorder='little')
+    return transposed
+
+def in_degree(graph, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Jumlah kandidat yang mengungguli setiap kandidat.
+    """
+    n = len(graph.names)
+    counts = np.zeros(n, dtype=np.int64)
+    for start, stop in iter_tiles(n, memory_budget):
+        counts += np.unpackbits(graph.bits[start:stop], axis=1, count=n, bitorder='little').sum(axis=0, dtype=np.int64)
+    return counts
+
+def _full_bitset(n):
+    bitset = np.packbits(np.ones(n, dtype=bool), bitorder='little')
+    return bitset
+
+def _clear(bitset, i):
+    bitset[i >> 3] &= ~np.uint8(1 << (i & 7))
+
+def _first_common(row, bitset):
+    """
+    Indeks bit 1 pertama dari row AND bitset, atau -1.
+    """
+    nonzero = np.flatnonzero(row & bitset)
+    if len(nonzero) == 0:
+        return -1
+    b = int(nonzero[0])
+    byte = int(row[b] & bitset[b])
+    return b * 8 + (byte & -byte).bit_length() - 1
+
+def _dfs(bits, root, remaining, on_finish):
+    """
+    DFS iteratif dari root atas simpul yang bitnya masih 1 di remaining.
+    on_finish(v) dipanggil saat v selesai (urutan post-order).
+    """
+    _clear(remaining, root)
+    stack = [root]
+    while stack:
+        v = stack[-1]
+        w = _first_common(bits[v], remaining)
+        if w < 0:
+            stack.pop()
+            on_finish(v)
+        else:
+            _clear(remaining, w)
+            stack.append(w)
+
+@traced('outranking_components')
+def strongly_connected_components(graph, transposed=None):
+    """
+    Komponen terhubung kuat graf outranking (Kosaraju di atas bitset).
+
+    Parameters:
+    - graph: OutrankingGraph
+    - transposed: hasil transpose_bits(graph.bits, n) jika sudah ada (opsional)
+
+    Returns:
+    - Components
+    """
+    n = len(graph.names)
+    if transposed is None:
+        with stage('transpose'):
+            transposed = transpose_bits(graph.bits, n)
+
+    # 1. Urutan selesai DFS pada graf asli
+    with stage('forward'):
+        finished = []
+        remaining = _full_bitset(n)
+        for v in range(n):
+            if remaining[v >> 3] >> (v & 7) & 1:
+                _dfs(graph.bits, v, remaining, finished.append)
+
+    # 2. DFS pada graf terbalik dengan urutan selesai terbalik:
+    # komponen ditemukan dalam urutan topologis graf asli
+    with stage('backward'):
+        labels = np.full(n, -1, dtype=np.int64)
+        sizes = []
+        remaining = _full_bitset(n)
+        for v in reversed(finished):
+            if remaining[v >> 3] >> (v & 7) & 1:
+                members = []
+                _dfs(transposed, v, remaining, members.append)
+                labels[members] = len(sizes)
+                sizes.append(len(members))
+
+    return Components(labels, np.array(sizes, dtype=np.int64))
+
+@traced('electre_kernel')
+def electre_kernel(graph, components=None, transposed=None):
+    """
+    Kernel ELECTRE I: himpunan kandidat yang tidak saling mengungguli dan
+    mengungguli semua kandidat di luar kernel. Siklus (SCC > 1 kandidat)
+    diperlakukan sebagai satu kelas indiferen: seluruh anggotanya masuk atau
+    keluar kernel bersama.
+
+    Returns:
+    - array bool per kandidat (True = anggota kernel)
+    """
+    n = len(graph.names)
+    if transposed is None:
+        transposed = transpose_bits(graph.bits, n)
+    if components is None:
+        components = strongly_connected_components(graph, transposed)
+
+    # Komponen diproses dalam urutan topologis: komponen masuk kernel jika
+    # tidak ada anggota kernel yang mengungguli salah satu anggotanya
+    order = np.argsort(components.labels, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(components.sizes)])
+    kernel_bits = np.zeros(graph.bits.shape[1], dtype=np.uint8)
+    in_kernel = np.zeros(n, dtype=bool)
+    for c in range(len(components.sizes)):
+        members = order[bounds[c]:bounds[c + 1]]
+        beaten_by = np.bitwise_or.reduce(transposed[members], axis=0)
+        if not np.any(beaten_by & kernel_bits):
+            in_kernel[members] = True
+            np.bitwise_or.at(kernel_bits, members >> 3, (1 << (members & 7)).astype(np.uint8))
+    return in_kernel
+
+def edge_frame(graph, limit=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Daftar sisi graf (Dari mengungguli Ke) sebagai DataFrame.
+    limit: jumlah sisi maksimum (None = semua)
+    """
+    n = len(graph.names)
+    sources, targets = [], []
+    total = 0
+    for start, stop in iter_tiles(n, memory_budget):
+        block = np.unpackbits(graph.bits[start:stop], axis=1, count=n, bitorder='little')
+        rows, cols = np.nonzero(block)
+        if limit is not None:
+            rows, cols = rows[:limit - total], cols[:limit - total]
+        sources.append(rows + start)
+        targets.append(cols)
+        total += len(rows)
+        if limit is not None and total >= limit:
+            break
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+    return pd.DataFrame({
+        'Dari': graph.names[sources],
+        'Ke': graph.names[targets],
+        'Baris Dari': sources,
+        'Baris Ke': targets
+    })
+
+def save_graph(graph, path):
+    """
+    Menyimpan graf ter-pack ke file .npz (bits, nama & threshold).
+    """
+    np.savez_compressed(
+        path, bits=graph.bits, names=graph.names.astype(str),
+        thresholds=np.array([graph.threshold_c, graph.threshold_d])
+    )
+
+def load_graph(path):
+    with np.load(path) as f:
+        return OutrankingGraph(f['bits'], f['names'].astype(object), *f['thresholds'].tolist())
+
+# ========== FUNGSI WRAPPER UNTUK STREAMLIT ========== #
+
+def run_electre_graph(data, job_filter_row, aggregated_data=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Wrapper graf outranking untuk satu posisi pekerjaan
+    aggregated_data: hasil agg_to_5 yang sudah ada (opsional) agar tidak dihitung ulang
+    """
+    if aggregated_data is None:
+        aggregated_data = agg_to_5(data, job_filter_row)
+    aggregated_data = aggregated_data.rename(columns={'Nama': 'NAMA'})
+    return electre_graph(aggregated_data, CRITERIA, memory_budget)
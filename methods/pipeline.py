@@ -0,0 +1,243 @@
+# ========== PIPELINE MCDM (TAHAP BERSAMA & REGISTRY METODE) ========== #
+# Satu permintaan ranking (data kandidat + satu posisi pekerjaan) dijalankan
+# sebagai graf tahap kecil:
+#
+#   aggregate (agg_to_5) -> matrix (prep_dm) -> ideal (nilai max/min per kriteria)
+#                                            -> vector_norm (normalisasi vektor)
+#
+# Setiap tahap dihitung paling banyak sekali per permintaan dan dipakai bersama
+# oleh semua metode yang membutuhkannya (VIKOR & SAW memakai ideal, ELECTRE &
+# TOPSIS memakai vector_norm). Metode yang saling bebas dijalankan bersamaan di
+# thread pool. Metode baru cukup didaftarkan dengan register_method.
+
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import prep_dm, agg_to_5, CRITERIA, WEIGHTS, V
+from utils.ranking import top_k_indices, top_k_frame
+from utils.instrument import stage, traced
+from methods.vikor import vikor_ideal, vikor_batch, vikor_frame
+from methods.electre import norm, electre_ranking
+from methods.electre_approx import approx_electre_ranking, DEFAULT_TOP_K, DEFAULT_TIME_BUDGET
+
+# Tahap: requires = nama tahap yang dibutuhkan, func(ctx) -> nilai tahap
+Stage = namedtuple('Stage', ['name', 'requires', 'func'])
+
+# Metode: label = nama tampilan, requires = tahap yang dipakai,
+# func(ctx, top_k) -> DataFrame hasil (Nama, Skor <label>, Ranking)
+Method = namedtuple('Method', ['name', 'label', 'requires', 'func'])
+
+STAGES = {}
+METHODS = {}
+
+# Metode bawaan aplikasi (Run All Methods)
+DEFAULT_METHODS = ('vikor', 'electre')
+
+_executor = ThreadPoolExecutor(max_workers=max(2, min(4, os.cpu_count() or 1)),
+                               thread_name_prefix='mcdm-method')
+
+def register_stage(name, requires, func):
+    """
+    Mendaftarkan tahap bersama. Semua tahap di requires harus sudah terdaftar.
+    """
+    unknown = [dep for dep in requires if dep not in STAGES]
+    if unknown:
+        raise ValueError(f"Tahap {name!r} membutuhkan tahap yang belum terdaftar: {unknown}")
+    STAGES[name] = Stage(name, tuple(requires), func)
+
+def register_method(name, label, requires, func):
+    """
+    Mendaftarkan metode ranking yang memakai tahap bersama di requires.
+    """
+    unknown = [dep for dep in requires if dep not in STAGES]
+    if unknown:
+        raise ValueError(f"Metode {name!r} membutuhkan tahap yang belum terdaftar: {unknown}")
+    METHODS[name] = Method(name, label, tuple(requires), func)
+
+class PipelineContext:
+    """
+    Hasil tahap untuk satu permintaan. get() menghitung tahap (beserta
+    dependensinya) sekali saja, aman dipanggil dari beberapa thread.
+    """
+
+    def __init__(self, data, job_filter_row, aggregated_data=None, features=None):
+        self.data = data
+        self.job_filter_row = job_filter_row
+        self.features = features
+        self.computed = []
+        self._values = {}
+        if aggregated_data is not None:
+            self._values['aggregate'] = aggregated_data
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._values:
+                spec = STAGES[name]
+                for dep in spec.requires:
+                    self.get(dep)
+                with stage(name):
+                    self._values[name] = spec.func(self)
+                self.computed.append(name)
+            return self._values[name]
+
+def stage_order(method_names):
+    """
+    Urutan topologis semua tahap yang dibutuhkan method_names.
+    """
+    order = []
+
+    def visit(name):
+        if name in order:
+            return
+        for dep in STAGES[name].requires:
+            visit(dep)
+        order.append(name)
+
+    for method in method_names:
+        for name in METHODS[method].requires:
+            visit(name)
+    return order
+
+@traced('pipeline')
+def run_methods(data, job_filter_row, method_names=DEFAULT_METHODS, aggregated_data=None, features=None,
+                top_k=None, overrides=None):
+    """
+    Menjalankan beberapa metode untuk satu posisi pekerjaan dengan tahap bersama.
+
+    Parameters:
+    - data: DataFrame kandidat
+    - job_filter_row: baris posisi pekerjaan
+    - method_names: nama metode terdaftar (lihat METHODS)
+    - aggregated_data: hasil agg_to_5 yang sudah ada (opsional)
+    - features: CandidateFeatures untuk agg_to_5 (opsional)
+    - top_k: hanya k kandidat terbaik per metode (opsional)
+    - overrides: dict {metode: fungsi tanpa argumen} yang menggantikan func
+      metode, mis. hasil VIKOR IncrementalRanker setelah kandidat ditambahkan
+
+    Returns:
+    - dict {metode: DataFrame hasil ranking}, urut method_names
+    """
+    overrides = overrides or {}
+    unknown = [name for name in method_names if name not in METHODS and name not in overrides]
+    if unknown:
+        raise ValueError(f"Metode tidak dikenal: {unknown}. Pilihan: {sorted(METHODS)}")
+
+    # 1. Tahap bersama dihitung sekali, berurutan di thread pemanggil
+    ctx = PipelineContext(data, job_filter_row, aggregated_data, features)
+    with stage('shared'):
+        for name in stage_order([m for m in method_names if m not in overrides]):
+            ctx.get(name)
+
+    # 2. Metode dijalankan bersamaan (numpy melepas GIL pada operasi besar)
+    def call(name):
+        start = time.perf_counter()
+        if name in overrides:
+            results = overrides[name]()
+        else:
+            results = METHODS[name].func(ctx, top_k)
+        return results, time.perf_counter() - start
+
+    with stage('methods', n_methods=len(method_names)) as info:
+        if len(method_names) > 1:
+            futures = {name: _executor.submit(call, name) for name in method_names}
+            outputs = {name: future.result() for name, future in futures.items()}
+        else:
+            outputs = {name: call(name) for name in method_names}
+        info.note(**{f"{name}_seconds": seconds for name, (_, seconds) in outputs.items()})
+
+    return {name: results for name, (results, _) in outputs.items()}
+
+# ---------- Tahap bawaan ---------- #
+
+def _aggregate(ctx):
+    return agg_to_5(ctx.data, ctx.job_filter_row, ctx.features)
+
+def _matrix(ctx):
+    aggregated_data = ctx.get('aggregate').rename(columns={'Nama': 'NAMA'})
+    return prep_dm(aggregated_data, CRITERIA)
+
+def _ideal(ctx):
+    dm, _ = ctx.get('matrix')
+    return vikor_ideal(np.asarray(dm, dtype=float)[np.newaxis])
+
+def _vector_norm(ctx):
+    dm, _ = ctx.get('matrix')
+    return norm(dm)
+
+register_stage('aggregate', (), _aggregate)
+register_stage('matrix', ('aggregate',), _matrix)
+register_stage('ideal', ('matrix',), _ideal)
+register_stage('vector_norm', ('matrix',), _vector_norm)
+
+# ---------- Metode bawaan ---------- #
+
+def _score_frame(alt, score_col, scores, top_k, descending):
+    """
+    DataFrame hasil dari skor per kandidat (format sama dengan calc_vikor).
+    Urutan skor sama: indeks asli terkecil lebih dulu.
+    """
+    if top_k is not None:
+        order = top_k_indices(scores, top_k, descending)
+        return top_k_frame(alt, score_col, scores[order], order)
+    order = np.argsort(-scores if descending else scores, kind='stable')
+    results = pd.DataFrame({'Nama': alt, score_col: scores}).take(order)
+    results['Ranking'] = range(1, len(alt) + 1)
+    return results
+
+def _vikor(ctx, top_k):
+    # Sama dengan calc_vikor, tetapi nilai ideal diambil dari tahap bersama
+    dm, alt = ctx.get('matrix')
+    hasil = vikor_batch(dm, WEIGHTS, v=V, top_k=top_k, ideal=ctx.get('ideal'))
+    if top_k is not None:
+        order = hasil.order[0]
+        return top_k_frame(alt, 'Skor VIKOR', hasil.Q[0][order], order)
+    return vikor_frame(alt, hasil.Q[0], hasil.order[0])
+
+def _electre(ctx, top_k):
+    # Sama dengan calc_electre, tetapi normalisasi vektor diambil dari tahap bersama
+    _, alt = ctx.get('matrix')
+    return electre_ranking(ctx.get('vector_norm'), alt, top_k=top_k)
+
+def _electre_approx(ctx, top_k):
+    # ELECTRE aproksimasi (sampling lawan); top-k yang dipastikan = top_k atau DEFAULT_TOP_K
+    _, alt = ctx.get('matrix')
+    results = approx_electre_ranking(
+        ctx.get('vector_norm'), alt, top_k=top_k or DEFAULT_TOP_K, time_budget=DEFAULT_TIME_BUDGET
+    ).results
+    return results.head(top_k) if top_k is not None else results
+
+def _topsis(ctx, top_k):
+    # TOPSIS: jarak ke solusi ideal positif & negatif pada matriks ternormalisasi
+    # vektor terbobot; semua kriteria benefit
+    _, alt = ctx.get('matrix')
+    weighted = ctx.get('vector_norm') * WEIGHTS
+    d_plus = np.sqrt(np.sum((weighted - weighted.max(axis=0)) ** 2, axis=1))
+    d_minus = np.sqrt(np.sum((weighted - weighted.min(axis=0)) ** 2, axis=1))
+    total = d_plus + d_minus
+    closeness = np.zeros_like(total)
+    np.divide(d_minus, total, out=closeness, where=total != 0)
+    return _score_frame(alt, 'Skor TOPSIS', closeness, top_k, descending=True)
+
+def _saw(ctx, top_k):
+    # SAW: normalisasi min-max per kriteria (tahap ideal), lalu jumlah terbobot.
+    # Kriteria teragregasi bisa negatif, jadi x / nilai maksimum tidak dipakai;
+    # kriteria dengan max == min bernilai 0
+    dm, alt = ctx.get('matrix')
+    f_star, f_minus = ctx.get('ideal')
+    f_star, f_minus = f_star[0, 0], f_minus[0, 0]
+    f_range = f_star - f_minus
+    normalized = np.zeros(np.shape(dm))
+    np.divide(np.asarray(dm, dtype=float) - f_minus, f_range, out=normalized, where=f_range != 0)
+    return _score_frame(alt, 'Skor SAW', normalized @ WEIGHTS, top_k, descending=True)
+
+register_method('vikor', 'VIKOR', ('matrix', 'ideal'), _vikor)
+register_method('electre', 'ELECTRE', ('matrix', 'vector_norm'), _electre)
+register_method('electre_approx', 'ELECTRE (Aproksimasi)', ('matrix', 'vector_norm'), _electre_approx)
+register_method('topsis', 'TOPSIS', ('matrix', 'vector_norm'), _topsis)
+register_method('saw', 'SAW', ('matrix', 'ideal'), _saw)
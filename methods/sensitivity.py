@@ -0,0 +1,168 @@
+# ========== ANALISIS SENSITIVITAS BOBOT (MONTE-CARLO) ========== #
+# Ribuan vektor bobot diambil acak dari simplex (Dirichlet) beserta nilai v,
+# lalu dievaluasi per blok skenario dengan kernel vikor_batch. Yang disimpan
+# hanya akumulator per kandidat (jumlah & kuadrat peringkat, histogram, dst.),
+# bukan seluruh matriks peringkat sampel x kandidat.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import agg_to_5, CRITERIA, WEIGHTS, V
+from utils.instrument import stage, traced
+from methods.vikor import vikor_batch
+from methods.electre import DEFAULT_MEMORY_BUDGET
+
+# Jumlah kolom histogram peringkat default (peringkat 1..10 + kolom "lainnya")
+DEFAULT_MAX_RANK = 10
+
+# Perkiraan byte per (skenario, kandidat, kriteria) di dalam vikor_batch
+_BYTES_PER_ELEMEN = 32
+
+# Hasil analisis sensitivitas:
+# - summary: DataFrame per kandidat, urut peringkat acuan
+# - rank_counts: histogram peringkat (kandidat x kolom); kolom r = jumlah sampel
+#   dengan peringkat r + 1, kolom terakhir menampung peringkat > max_rank
+# - weights, v: sampel yang dievaluasi (sampel x kriteria), (sampel,)
+# - top_changes: jumlah sampel dengan peringkat 1 berbeda dari acuan
+SensitivityResult = namedtuple('SensitivityResult', ['summary', 'rank_counts', 'weights', 'v', 'top_changes'])
+
+def sample_weights(n_samples, n_criteria, alpha=1.0, v_range=(0.0, 1.0), seed=None):
+    """
+    Sampel bobot seragam pada simplex (Dirichlet dengan alpha sama) & nilai v.
+
+    Parameters:
+    - alpha: konsentrasi Dirichlet; 1 = seragam, > 1 = lebih dekat ke bobot sama rata
+    - v_range: (min, max) v seragam, atau skalar untuk v tetap
+
+    Returns:
+    - (weights (sampel x kriteria), v (sampel,))
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples harus >= 1.")
+    if alpha <= 0:
+        raise ValueError("alpha harus > 0.")
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.full(n_criteria, float(alpha)), size=n_samples)
+
+    if np.ndim(v_range) == 0:
+        v = np.full(n_samples, float(v_range))
+    else:
+        v_low, v_high = v_range
+        if not 0 <= v_low <= v_high <= 1:
+            raise ValueError("v_range harus memenuhi 0 <= min <= max <= 1.")
+        v = rng.uniform(v_low, v_high, size=n_samples)
+    return weights, v
+
+def scenario_block(n_rows, n_criteria, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Jumlah skenario per panggilan vikor_batch agar array sementara
+    tidak melebihi memory_budget byte. Minimal 1 skenario.
+    """
+    per_skenario = max(1, n_rows * n_criteria * _BYTES_PER_ELEMEN)
+    return int(max(1, memory_budget // per_skenario))
+
+@traced('vikor_sensitivity')
+def vikor_sensitivity(data, criteria=CRITERIA, n_samples=10_000, alpha=1.0, v_range=(0.0, 1.0),
+                      seed=None, max_rank=DEFAULT_MAX_RANK, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Analisis sensitivitas VIKOR terhadap bobot kriteria & v.
+
+    Parameters:
+    - data: DataFrame kandidat dengan kolom 'NAMA' dan kolom kriteria
+    - n_samples: jumlah vektor bobot acak
+    - alpha, v_range, seed: lihat sample_weights
+    - max_rank: jumlah kolom histogram peringkat (default DEFAULT_MAX_RANK),
+      ditambah satu kolom untuk peringkat > max_rank. None = semua peringkat,
+      hanya untuk data kecil karena histogram berukuran kandidat x kandidat
+    - memory_budget: batas byte array sementara per blok skenario
+
+    Returns:
+    - SensitivityResult
+    """
+    with stage('prepare'):
+        dm = data[criteria].to_numpy(dtype=float)
+        names = data['NAMA'].to_numpy()
+        n_rows, n_cols = dm.shape
+        if n_rows == 0:
+            raise ValueError("Data kandidat kosong.")
+        bins = n_rows if max_rank is None else max(1, min(int(max_rank), n_rows))
+        weights, v = sample_weights(n_samples, n_cols, alpha, v_range, seed)
+
+    # 1. Ranking acuan (bobot sama rata, v = 0.5)
+    with stage('baseline'):
+        base = vikor_batch(dm, WEIGHTS, v=V)
+        base_order = base.order[0]
+        base_rank = base.ranking[0]
+
+    # 2. Akumulator per kandidat
+    rank_sum = np.zeros(n_rows)
+    rank_sq_sum = np.zeros(n_rows)
+    best = np.full(n_rows, n_rows, dtype=np.int64)
+    worst = np.zeros(n_rows, dtype=np.int64)
+    first = np.zeros(n_rows, dtype=np.int64)
+    changed = np.zeros(n_rows, dtype=np.int64)
+    overtaken = np.zeros(n_rows, dtype=np.int64)
+    rank_counts = np.zeros(n_rows * (bins + 1), dtype=np.int64)
+    hist_base = (np.arange(n_rows) * (bins + 1))[np.newaxis]
+    top_changes = 0
+
+    # 3. Evaluasi per blok skenario dengan kernel VIKOR tervektorisasi
+    step = scenario_block(n_rows, n_cols, memory_budget)
+    for start in range(0, n_samples, step):
+        stop = min(start + step, n_samples)
+        with stage('evaluate_block', scenarios=stop - start):
+            hasil = vikor_batch(dm[np.newaxis], weights[start:stop], v=v[start:stop])
+        ranking = hasil.ranking
+
+        with stage('accumulate'):
+            rank_sum += ranking.sum(axis=0)
+            rank_sq_sum += np.square(ranking, dtype=float).sum(axis=0)
+            np.minimum(best, ranking.min(axis=0), out=best)
+            np.maximum(worst, ranking.max(axis=0), out=worst)
+            first += np.bincount(hasil.order[:, 0], minlength=n_rows)
+            top_changes += int(np.count_nonzero(hasil.order[:, 0] != base_order[0]))
+            changed += np.count_nonzero(ranking != base_rank, axis=0)
+
+            # Rank reversal: kandidat dengan peringkat acuan r kalah dari kandidat r + 1
+            overtaken[base_order[:-1]] += np.count_nonzero(
+                ranking[:, base_order[:-1]] > ranking[:, base_order[1:]], axis=0
+            )
+
+            # Histogram: kolom bins menampung peringkat > max_rank
+            hist_idx = hist_base + np.minimum(ranking - 1, bins)
+            rank_counts += np.bincount(hist_idx.ravel(), minlength=rank_counts.size)
+
+    # 4. Ringkasan per kandidat, urut peringkat acuan
+    with stage('summary'):
+        mean_rank = rank_sum / n_samples
+        std_rank = np.sqrt(np.maximum(rank_sq_sum / n_samples - mean_rank ** 2, 0.0))
+        summary = pd.DataFrame({
+            'Nama': names,
+            'Peringkat Acuan': base_rank,
+            'Rata-rata Peringkat': mean_rank,
+            'Std Peringkat': std_rank,
+            'Peringkat Terbaik': best,
+            'Peringkat Terburuk': worst,
+            'P(Peringkat 1)': first / n_samples,
+            'Peringkat Berubah': changed,
+            'Tersalip': overtaken
+        }).take(base_order)
+
+    rank_counts = rank_counts.reshape(n_rows, bins + 1)
+    if bins == n_rows:
+        rank_counts = rank_counts[:, :bins]
+    return SensitivityResult(summary, rank_counts, weights, v, top_changes)
+
+# ========== FUNGSI WRAPPER UNTUK STREAMLIT ========== #
+
+def run_vikor_sensitivity(data, job_filter_row, aggregated_data=None, **kwargs):
+    """
+    Wrapper analisis sensitivitas VIKOR untuk satu posisi pekerjaan
+    aggregated_data: hasil agg_to_5 yang sudah ada (opsional) agar tidak dihitung ulang
+    kwargs: diteruskan ke vikor_sensitivity (n_samples, alpha, v_range, seed, ...)
+    """
+    if aggregated_data is None:
+        aggregated_data = agg_to_5(data, job_filter_row)
+    aggregated_data = aggregated_data.rename(columns={'Nama': 'NAMA'})
+    return vikor_sensitivity(aggregated_data, CRITERIA, **kwargs)
@@ -1,101 +1,243 @@
 # ========== IMPLEMENTASI VIKOR ========== #
 
+from collections import namedtuple
+
 import numpy as np
 import pandas as pd
-from utils.preprocess import prep_dm, agg_to_5
+from utils.preprocess import prep_dm, agg_to_5, agg_all_jobs, CRITERIA, WEIGHTS, V
+from utils.streaming import write_aggregate, DEFAULT_CHUNKSIZE, DEFAULT_EPS
+from utils.ranking import top_k_indices, merge_top_k, top_k_frame
+from utils.instrument import stage, traced
+
+# Hasil kernel VIKOR untuk banyak skenario (baris = skenario).
+# Dengan top_k, order berisi k indeks terbaik per skenario dan ranking = None.
+VikorResult = namedtuple('VikorResult', ['Q', 'S', 'R', 'order', 'ranking'])
+
+def vikor_sr(dm, weights, f_star, f_minus):
+    """
+    Nilai S (jumlah) dan R (maksimum) matriks terbobot per kandidat.
+    dm berbentuk (skenario x kandidat x kriteria), f_star/f_minus berbentuk
+    (skenario x 1 x kriteria); kriteria dengan f_star == f_minus bernilai 0.
+    """
+    f_range = f_star - f_minus
+    norm_matx = np.zeros_like(dm)
+    np.divide(f_star - dm, f_range, out=norm_matx, where=f_range != 0)
+
+    weighted = norm_matx * weights
+    return np.sum(weighted, axis=2), np.max(weighted, axis=2)
+
+def vikor_bounds(S, R):
+    """
+    Nilai S_star, S_minus, R_star, R_minus per skenario (skenario x 1).
+    """
+    return (
+        np.min(S, axis=1, keepdims=True),
+        np.max(S, axis=1, keepdims=True),
+        np.min(R, axis=1, keepdims=True),
+        np.max(R, axis=1, keepdims=True)
+    )
+
+def vikor_q(S, R, v, bounds=None):
+    """
+    Nilai Q (indeks VIKOR) dari S dan R berbentuk (skenario x kandidat).
+    Bagian S/R bernilai 0 jika S_minus == S_star / R_minus == R_star.
+    bounds: hasil vikor_bounds seluruh kandidat jika S/R hanya satu blok baris.
+    """
+    if bounds is None:
+        bounds = vikor_bounds(S, R)
+    S_star, S_minus, R_star, R_minus = bounds
+
+    s_val = np.zeros_like(S)
+    np.divide(S - S_minus, S_star - S_minus, out=s_val, where=(S_minus - S_star) != 0)
+    r_val = np.zeros_like(R)
+    np.divide(R - R_minus, R_star - R_minus, out=r_val, where=(R_minus - R_star) != 0)
+
+    return v * s_val + (1 - v) * r_val
+
+def vikor_ideal(dm):
+    """
+    Nilai ideal positif (f_star) dan negatif (f_minus) per skenario & kriteria,
+    bentuk (skenario x 1 x kriteria) untuk dm (skenario x kandidat x kriteria).
+    """
+    return np.max(dm, axis=1, keepdims=True), np.min(dm, axis=1, keepdims=True)
+
+def vikor_batch(tensor, weights=None, v=V, top_k=None, ideal=None):
+    """
+    Kernel VIKOR tervektorisasi untuk banyak skenario sekaligus.
+    Satu skenario = satu posisi pekerjaan atau satu vektor bobot.
+    
+    Parameters:
+    - tensor: array (skenario x kandidat x kriteria); array 2-D dianggap satu skenario
+    - weights: bobot kriteria, bentuk (kriteria,) atau (skenario x kriteria).
+      Default: bobot sama rata (0.2 untuk 5 kriteria)
+    - v: parameter strategi, skalar atau array (skenario,)
+    - top_k: jika diisi, hanya k kandidat terbaik per skenario yang diurutkan
+    - ideal: (f_star, f_minus) hasil vikor_ideal yang sudah dihitung (opsional)
+    
+    Returns:
+    - VikorResult berisi Q, S, R (skenario x kandidat), order (indeks kandidat
+      terurut dari Q terkecil) dan ranking (peringkat 1..n per kandidat)
+    """
+    dm = np.asarray(tensor, dtype=float)
+    if dm.ndim == 2:
+        dm = dm[np.newaxis]
+    n_scen, n_rows, n_cols = dm.shape
+
+    if weights is None:
+        weights = np.full(n_cols, 1.0 / n_cols)
+    weights = np.asarray(weights, dtype=float).reshape(-1, 1, n_cols)
+    v = np.asarray(v, dtype=float).reshape(-1, 1)
+
+    # 1. Nilai ideal positif dan negatif per skenario & kriteria
+    with stage('ideal', dm=dm):
+        f_star, f_minus = vikor_ideal(dm) if ideal is None else ideal
+
+    # 2-3. Normalisasi, matriks terbobot, lalu S dan R per kandidat
+    with stage('normalize_weight_SR'):
+        S, R = vikor_sr(dm, weights, f_star, f_minus)
+
+    # 4. Nilai Q (VIKOR index)
+    with stage('Q'):
+        Q = vikor_q(S, R, v)
 
-def calc_vikor(data, criteria):
+    # 5. Ranking per skenario (Q semakin rendah semakin baik)
+    with stage('ranking', top_k=top_k):
+        if top_k is not None:
+            order = np.array([top_k_indices(q, top_k) for q in Q])
+            return VikorResult(Q, S, R, order, None)
+        order = np.argsort(Q, axis=1, kind='stable')
+        ranking = np.empty_like(order)
+        np.put_along_axis(ranking, order, np.arange(1, n_rows + 1)[np.newaxis], axis=1)
+
+    return VikorResult(Q, S, R, order, ranking)
+
+@traced('calc_vikor')
+def calc_vikor(data, criteria, top_k=None):
     """
     Implementasi metode VIKOR
     
     Parameters:
     - data: DataFrame kandidat
     - criteria: list nama kolom kriteria
+    - top_k: jika diisi, hanya k kandidat terbaik yang dikembalikan (seleksi
+      parsial, tanpa mengurutkan & membuat tabel seluruh kandidat)
     
     Returns:
     - DataFrame hasil ranking VIKOR
     """
     
-    # 1. Siapkan matriks keputusan
-    dm, alt = prep_dm(data, criteria)
-    
-    # 2. Tentukan nilai ideal positif dan negatif
-    f_star = np.max(dm, axis=0)
-    f_minus = np.min(dm, axis=0)
-
-    # 3. Normalisasi matriks keputusan
-    n_rows, n_cols = dm.shape
-    norm_matx = np.zeros((n_rows, n_cols))
-    
-    for i in range(n_rows):
-        for j in range(n_cols):
-            if f_star[j] != f_minus[j]:  # Hindari pembagian dengan 0
-                norm_matx[i, j] = (f_star[j] - dm[i, j]) / (f_star[j] - f_minus[j])
-            else:
-                norm_matx[i, j] = 0
-
-    # 4. Matriks terbobot (semua bobot = 0.2)
-    weights = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
-    weighted = norm_matx * weights
-    
-    # 5. Hitung nilai S dan R untuk setiap alternatif
-    S = np.zeros(n_rows)
-    R = np.zeros(n_rows)
-
-    for i in range(n_rows):
-        # S_i = sum dari semua F_ij untuk alternatif i
-        S[i] = np.sum(weighted[i, :])
-        
-        # R_i = max dari semua F_ij untuk alternatif i
-        R[i] = np.max(weighted[i, :])
+    if top_k is not None:
+        hasil = vikor_batch(data[criteria].values, WEIGHTS, v=V, top_k=top_k)
+        order = hasil.order[0]
+        return top_k_frame(data['NAMA'].values, 'Skor VIKOR', hasil.Q[0][order], order)
     
-    # 4. Hitung nilai Q (VIKOR index)
-    S_star = np.min(S)
-    S_minus = np.max(S)
-    R_star = np.min(R)
-    R_minus = np.max(R)
-    
-    v = 0.5  # Parameter strategy (biasanya 0.5)
-    Q = np.zeros(n_rows)
+    # 1. Siapkan matriks keputusan
+    with stage('prepare'):
+        dm, alt = prep_dm(data, criteria)
     
-    for i in range(n_rows):
-        s_val = 0
-        r_val = 0
-        
-        if (S_minus - S_star) != 0:
-            s_val = v * ((S[i] - S_minus) / (S_star - S_minus))
-        
-        if (R_minus - R_star) != 0:
-            r_val = (1 - v) * ((R[i] - R_minus) / (R_star - R_minus))
-        
-        Q[i] = s_val + r_val
+    # 2-4. Normalisasi, pembobotan (semua bobot = 0.2), nilai S, R dan Q
+    hasil = vikor_batch(dm, WEIGHTS, v=V)
     
     # 5. Buat DataFrame hasil
+    with stage('result_table'):
+        return vikor_frame(alt, hasil.Q[0], hasil.order[0])
+
+def vikor_frame(alt, Q, order):
+    """
+    DataFrame hasil ranking VIKOR (Nama, Skor VIKOR, Ranking), urut peringkat.
+    Index = posisi kandidat pada data.
+    """
     results = pd.DataFrame({
         'Nama': alt,
-        'Skor VIKOR': Q 
+        'Skor VIKOR': Q
     })
     
-    # 6. Ranking berdasarkan Q value
-    results = results.sort_values('Skor VIKOR', ascending=True) # Nilai Q semakin rendah semakin baik
+    # 6. Ranking berdasarkan Q value (Nilai Q semakin rendah semakin baik)
+    results = results.take(order)
     results['Ranking'] = range(1, len(alt) + 1)
     
     return results[['Nama', 'Skor VIKOR', 'Ranking']]
 
 # ========== FUNGSI WRAPPER UNTUK STREAMLIT ========== #
 
-def run_vikor(data, job_filter_row):
+@traced('VIKOR')
+def run_vikor(data, job_filter_row, aggregated_data=None, top_k=None):
     """
     Wrapper untuk menjalankan analisis VIKOR
+    aggregated_data: hasil agg_to_5 yang sudah ada (opsional) agar tidak dihitung ulang
+    top_k: hanya k kandidat terbaik (opsional)
     """
     # Agregasi data ke 5 kriteria
-    aggregated_data = agg_to_5(data, job_filter_row)
+    if aggregated_data is None:
+        aggregated_data = agg_to_5(data, job_filter_row)
     aggregated_data = aggregated_data.rename(columns={'Nama': 'NAMA'})
     
-    # Definisi kriteria dan bobot
-    criteria = ['IST', 'PAPI', 'MBTI', 'Kraepelin', 'DISC']
+    # Jalankan VIKOR pada 5 kriteria
+    results = calc_vikor(aggregated_data, CRITERIA, top_k)
     
-    # Jalankan VIKOR
-    results = calc_vikor(aggregated_data, criteria)
+    return results
+
+def run_vikor_all_jobs(data, job_positions_df, top_k=None):
+    """
+    Menjalankan VIKOR untuk semua posisi pekerjaan dalam satu panggilan kernel.
+    top_k: hanya k kandidat terbaik per posisi (opsional)
     
-    return results
\ No newline at end of file
+    Returns:
+    - dict {nama posisi: DataFrame hasil ranking VIKOR}
+    """
+    aggregate = agg_all_jobs(data, job_positions_df)
+    hasil = vikor_batch(aggregate.tensor, WEIGHTS, v=V, top_k=top_k)
+
+    all_results = {}
+    for j, job_name in enumerate(aggregate.job_names):
+        if top_k is not None:
+            order = hasil.order[j]
+            all_results[job_name] = top_k_frame(aggregate.names, 'Skor VIKOR', hasil.Q[j][order], order)
+            continue
+        all_results[job_name] = vikor_frame(aggregate.names, hasil.Q[j], hasil.order[j])
+
+    return all_results
+
+def run_vikor_streaming(csv_path, job_filter_row, out_dir, eps=DEFAULT_EPS,
+                        chunksize=DEFAULT_CHUNKSIZE, top_k=None):
+    """
+    Menjalankan VIKOR untuk file kandidat yang terlalu besar untuk dimuat sekaligus.
+    Matriks 5 kriteria ditulis ke out_dir (lihat write_aggregate), lalu S dan R
+    dihitung per blok baris; hanya Q, S, R dan urutan (n) yang ada di memori.
+    Dengan top_k, Q dihitung per blok dan top-k tiap blok digabung dengan heap.
+    
+    Returns:
+    - (StreamAggregate, VikorResult dengan satu skenario), atau
+      (StreamAggregate, DataFrame k kandidat terbaik) jika top_k diisi
+    """
+    aggregate = write_aggregate(csv_path, job_filter_row, out_dir, eps=eps, chunksize=chunksize)
+    n = aggregate.stats.n_rows
+
+    # 1. Nilai ideal positif dan negatif dari pass agregasi
+    f_star = aggregate.col_max.reshape(1, 1, -1)
+    f_minus = aggregate.col_min.reshape(1, 1, -1)
+
+    # 2-3. S dan R per blok baris
+    S = np.empty((1, n))
+    R = np.empty((1, n))
+    for start in range(0, n, chunksize):
+        stop = min(start + chunksize, n)
+        block = np.asarray(aggregate.matrix[start:stop])[np.newaxis]
+        S[:, start:stop], R[:, start:stop] = vikor_sr(block, WEIGHTS, f_star, f_minus)
+
+    # 4-5. Nilai Q dan ranking
+    if top_k is not None:
+        bounds = vikor_bounds(S, R)
+        blocks = (
+            (start, vikor_q(S[:, start:start + chunksize], R[:, start:start + chunksize], V, bounds)[0])
+            for start in range(0, n, chunksize)
+        )
+        indices, scores = merge_top_k(blocks, top_k)
+        return aggregate, top_k_frame(aggregate.names, 'Skor VIKOR', scores, indices)
+
+    Q = vikor_q(S, R, V)
+    order = np.argsort(Q, axis=1, kind='stable')
+    ranking = np.empty_like(order)
+    np.put_along_axis(ranking, order, np.arange(1, n + 1)[np.newaxis], axis=1)
+
+    return aggregate, VikorResult(Q, S, R, order, ranking)
@@ -0,0 +1,273 @@
+# ========== LAYANAN HTTP RANKING (ASYNCIO, TANPA STREAMLIT) ========== #
+# Contoh:
+#   python service.py --port 8765
+#   curl "http://127.0.0.1:8765/rank?job=Technician&method=electre&top_k=20"
+#
+# Endpoint:
+#   GET  /health  status, versi dataset & statistik coalescing
+#   GET  /jobs    daftar posisi pekerjaan
+#   GET  /rank    ranking satu posisi: job=..., method=vikor|electre, top_k=... (opsional)
+#   POST /reload  muat ulang data kandidat & posisi pekerjaan
+#
+# Data kandidat & agregasi semua posisi disimpan di memori (WarmPool) dan hanya
+# dibangun ulang jika file berubah. Permintaan identik yang datang bersamaan
+# (versi dataset, posisi, metode & top_k sama) digabung menjadi satu perhitungan.
+# ELECTRE dijalankan di executor agar event loop tetap melayani VIKOR.
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+from utils.snapshot import clear_cache
+from utils.loader import CANDIDATES_CSV_PATH, JOB_POSITIONS_CSV_PATH, load_candidate_data, load_job_positions
+from utils.preprocess import feature_cache, agg_all_jobs, agg_frame
+from methods.vikor import run_vikor
+from methods.electre import run_electre
+
+METHODS = ('vikor', 'electre')
+
+# Keadaan data yang sedang dilayani:
+# - version: versi dataset kandidat (lihat dataset_version)
+# - signature: (mtime, ukuran) file kandidat & file posisi pekerjaan
+# - job_index: dict nama posisi -> indeks di aggregate
+# - frames: cache DataFrame agregasi per posisi (agg_frame)
+PoolState = namedtuple('PoolState', ['version', 'data', 'jobs', 'signature', 'aggregate', 'job_index', 'frames'])
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+class WarmPool:
+    """
+    Data kandidat, posisi pekerjaan & agregasi 5 kriteria semua posisi yang
+    tetap di memori selama file sumbernya tidak berubah.
+    """
+
+    def __init__(self, candidates_path=CANDIDATES_CSV_PATH, jobs_path=JOB_POSITIONS_CSV_PATH):
+        self.candidates_path = candidates_path
+        self.jobs_path = jobs_path
+        self.state = None
+        self._lock = threading.Lock()
+
+    def signature(self):
+        return _file_signature(self.candidates_path), _file_signature(self.jobs_path)
+
+    def is_stale(self):
+        """
+        True jika belum dimuat atau file kandidat/posisi berubah (hanya os.stat).
+        """
+        return self.state is None or self.signature() != self.state.signature
+
+    def refresh(self, force=False):
+        """
+        Membangun ulang state jika perlu (dipanggil di executor, bisa berat).
+        """
+        with self._lock:
+            if not force and not self.is_stale():
+                return self.state
+            if force:
+                clear_cache()
+                feature_cache.clear()
+
+            signature = self.signature()
+            data = load_candidate_data(self.candidates_path)
+            jobs = load_job_positions(self.jobs_path).reset_index(drop=True)
+
+            # Versi file kandidat (mtime, ukuran) sebagai kunci lookup fitur
+            features = feature_cache.get(data, source=(self.candidates_path, signature[0]))
+            job_index = {}
+            for j, name in enumerate(jobs['Job Position']):
+                job_index.setdefault(name, j)
+
+            self.state = PoolState(
+                version=features.version,
+                data=data,
+                jobs=jobs,
+                signature=signature,
+                aggregate=agg_all_jobs(data, jobs, features=features),
+                job_index=job_index,
+                frames={}
+            )
+            return self.state
+
+    def aggregated(self, state, job_name):
+        """
+        (baris posisi pekerjaan, DataFrame agregasi 5 kriteria) untuk satu posisi.
+        """
+        if job_name not in state.job_index:
+            raise HTTPError(404, f"Posisi pekerjaan '{job_name}' tidak ditemukan.")
+        j = state.job_index[job_name]
+        if j not in state.frames:
+            state.frames[j] = agg_frame(state.aggregate, j)
+        return state.jobs.iloc[j], state.frames[j]
+
+class RankingService:
+    """
+    Menjalankan ranking dari WarmPool dengan penggabungan permintaan identik.
+    """
+
+    def __init__(self, pool, executor):
+        self.pool = pool
+        self.executor = executor
+        self.computed = 0
+        self.coalesced = 0
+        self._inflight = {}
+        self._refresh_lock = asyncio.Lock()
+
+    async def state(self, force=False):
+        loop = asyncio.get_running_loop()
+        if not force and not self.pool.is_stale():
+            return self.pool.state
+        async with self._refresh_lock:
+            return await loop.run_in_executor(self.executor, partial(self.pool.refresh, force))
+
+    async def rank(self, job_name, method, top_k=None):
+        state = await self.state()
+        key = (state.version, state.signature[1], job_name, method, top_k)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._compute(state, job_name, method, top_k))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: satu klien yang putus tidak membatalkan perhitungan bersama
+        return state, await asyncio.shield(task)
+
+    async def _compute(self, state, job_name, method, top_k):
+        job_filter_row, aggregated_data = self.pool.aggregated(state, job_name)
+        self.computed += 1
+        if method == 'vikor':
+            # VIKOR O(n log n): cukup cepat untuk dijalankan langsung di event loop
+            return run_vikor(state.data, job_filter_row, aggregated_data, top_k=top_k)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(run_electre, state.data, job_filter_row, aggregated_data, top_k)
+        )
+
+# ---------- HTTP ---------- #
+
+def _records(results):
+    score_col = results.columns[1]
+    return [
+        {'Ranking': int(r), 'Nama': str(nama), 'Skor': None if pd.isna(skor) else skor}
+        for r, nama, skor in zip(results['Ranking'], results['Nama'], results[score_col])
+    ]
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+async def handle_request(service, method, target):
+    """
+    Returns:
+    - (status HTTP, payload dict)
+    """
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+
+    if url.path == '/health' and method == 'GET':
+        state = service.pool.state
+        return 200, {
+            'status': 'ok',
+            'version': None if state is None else state.version,
+            'candidates': None if state is None else len(state.data),
+            'computed': service.computed,
+            'coalesced': service.coalesced
+        }
+    if url.path == '/jobs' and method == 'GET':
+        state = await service.state()
+        return 200, {'version': state.version, 'jobs': list(state.job_index)}
+    if url.path == '/reload' and method == 'POST':
+        state = await service.state(force=True)
+        return 200, {'version': state.version, 'candidates': len(state.data)}
+    if url.path == '/rank' and method == 'GET':
+        job_name = _param(query, 'job')
+        rank_method = _param(query, 'method', 'vikor').lower()
+        top_k = _param(query, 'top_k')
+        if not job_name:
+            raise HTTPError(400, "Parameter 'job' wajib diisi.")
+        if rank_method not in METHODS:
+            raise HTTPError(400, f"Parameter 'method' harus salah satu dari {list(METHODS)}.")
+        if top_k is not None:
+            if not top_k.isdigit() or int(top_k) < 1:
+                raise HTTPError(400, "Parameter 'top_k' harus bilangan bulat >= 1.")
+            top_k = int(top_k)
+
+        state, results = await service.rank(job_name, rank_method, top_k)
+        return 200, {
+            'version': state.version,
+            'job': job_name,
+            'method': rank_method,
+            'results': _records(results)
+        }
+    raise HTTPError(404, f"Endpoint {method} {url.path} tidak ditemukan.")
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+async def handle_connection(service, reader, writer):
+    try:
+        request_line = await reader.readline()
+        # Header dibaca sampai baris kosong; body tidak dipakai
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            status, payload = await handle_request(service, method.upper(), target)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(host, port, candidates_path, jobs_path, workers):
+    executor = ThreadPoolExecutor(max_workers=workers)
+    service = RankingService(WarmPool(candidates_path, jobs_path), executor)
+    # Data dihangatkan sebelum menerima koneksi
+    await service.state()
+
+    server = await asyncio.start_server(partial(handle_connection, service), host, port)
+    print(f"Layanan ranking berjalan di http://{host}:{port} (versi {service.pool.state.version[:12]})")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='service.py', description='Layanan HTTP ranking VIKOR & ELECTRE.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--candidates', default=CANDIDATES_CSV_PATH, help='file CSV data kandidat')
+    parser.add_argument('--jobs', default=JOB_POSITIONS_CSV_PATH, help='file CSV posisi pekerjaan')
+    parser.add_argument('--workers', type=int, default=2, help='jumlah thread executor ELECTRE')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.candidates, args.jobs, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
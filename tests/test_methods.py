@@ -0,0 +1,619 @@
+# ========== TEST KESETARAAN VIKOR & ELECTRE DENGAN ALGORITMA AWAL ========== #
+# ref_vikor_scores / ref_electre_scores adalah loop asli calc_vikor & calc_electre
+# (sebelum versi tervektorisasi, tiled, batch, dst.). Implementasi saat ini harus
+# menghasilkan skor yang sama per kandidat, dan urutan yang konsisten dengan skor.
+# Jalur lain (pipeline, inkremental, paralel, graf outranking, aproksimasi)
+# dibandingkan dengan referensi yang sama.
+
+import asyncio
+import io
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.preprocess import agg_to_5, agg_all_jobs, candidate_features, FeatureCache, CRITERIA
+from methods.vikor import calc_vikor, run_vikor_all_jobs, run_vikor_streaming
+from methods import electre_parallel
+from methods.electre import calc_electre, norm, electre_thresholds, DEFAULT_MEMORY_BUDGET, THRESHOLD_MODES
+from methods.pipeline import run_methods
+from methods.incremental import IncrementalRanker
+from methods.electre_approx import approx_electre
+from utils.loader import value_range
+import cli
+from service import WarmPool, RankingService, HTTPError, handle_request
+from utils.bulk_import import read_upload, validate_candidates
+from utils.name_index import NameIndex
+from utils.storage import CsvStorage, SQLiteStorage
+from utils.streaming import QuantileSketch, write_aggregate
+from methods.consensus import kendall_tau, count_greater_before, copeland_scores, _copeland_tiled, kemeny_local_search
+from methods.outranking import (
+    _first_common, electre_graph, out_degree, in_degree, transpose_bits, strongly_connected_components,
+    save_graph, load_graph
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WEIGHTS = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
+
+def ref_vikor_scores(dm):
+    """
+    Nilai Q per kandidat dengan loop calc_vikor awal.
+    """
+    f_star = np.max(dm, axis=0)
+    f_minus = np.min(dm, axis=0)
+    n_rows, n_cols = dm.shape
+    norm_matx = np.zeros((n_rows, n_cols))
+    for i in range(n_rows):
+        for j in range(n_cols):
+            if f_star[j] != f_minus[j]:
+                norm_matx[i, j] = (f_star[j] - dm[i, j]) / (f_star[j] - f_minus[j])
+    weighted = norm_matx * WEIGHTS
+
+    S = np.array([np.sum(weighted[i, :]) for i in range(n_rows)])
+    R = np.array([np.max(weighted[i, :]) for i in range(n_rows)])
+    S_star, S_minus, R_star, R_minus = np.min(S), np.max(S), np.min(R), np.max(R)
+
+    v = 0.5
+    Q = np.zeros(n_rows)
+    for i in range(n_rows):
+        s_val = 0
+        r_val = 0
+        if (S_minus - S_star) != 0:
+            s_val = v * ((S[i] - S_minus) / (S_star - S_minus))
+        if (R_minus - R_star) != 0:
+            r_val = (1 - v) * ((R[i] - R_minus) / (R_star - R_minus))
+        Q[i] = s_val + r_val
+    return Q
+
+def ref_electre_scores(dm):
+    """
+    Skor ELECTRE per kandidat dengan loop calc_electre awal.
+    """
+    normalized = np.zeros_like(dm, dtype=float)
+    for j in range(dm.shape[1]):
+        col = dm[:, j]
+        normalized[:, j] = col / np.sqrt(np.sum(col ** 2))
+    weighted = normalized * WEIGHTS
+    n, k = weighted.shape
+
+    concordance = np.zeros((n, n))
+    discordance = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            concordance[i, j] = np.sum([WEIGHTS[c] for c in range(k) if weighted[i, c] >= weighted[j, c]])
+            max_diff_discord = 0
+            max_diff_all = 0
+            for c in range(k):
+                diff = abs(weighted[j, c] - weighted[i, c])
+                if weighted[j, c] > weighted[i, c] and diff > max_diff_discord:
+                    max_diff_discord = diff
+                if diff > max_diff_all:
+                    max_diff_all = diff
+            if max_diff_all != 0:
+                discordance[i, j] = max_diff_discord / max_diff_all
+
+    concordance_sum = 0
+    discordance_sum = 0
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                concordance_sum += concordance[i, j]
+                discordance_sum += discordance[i, j]
+    count = n * (n - 1)
+    threshold_c = concordance_sum / count
+    threshold_d = discordance_sum / count
+
+    con_dom = (concordance >= threshold_c).astype(int)
+    discon_dom = (discordance <= threshold_d).astype(int)
+    np.fill_diagonal(con_dom, 0)
+    np.fill_diagonal(discon_dom, 0)
+    return np.sum(con_dom & discon_dom, axis=1)
+
+def _random_frame(n, seed):
+    """
+    Data teragregasi acak dengan banyak nilai kembar: nilai bulat kecil
+    (termasuk negatif), baris duplikat & satu kolom konstan.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.integers(-2, 4, size=(n, len(CRITERIA))).astype(float)
+    values[n // 2:n // 2 + 3] = values[0]
+    values[:, seed % len(CRITERIA)] = 1.0
+    frame = pd.DataFrame(values, columns=CRITERIA)
+    frame.insert(0, 'NAMA', [f'K{i}' for i in range(n)])
+    return frame
+
+def _dataset_frames():
+    data = pd.read_csv(ROOT / 'Dataset.csv')
+    jobs = pd.read_csv(ROOT / 'job_positions.csv')
+    return [
+        pytest.param(agg_to_5(data, job).rename(columns={'Nama': 'NAMA'}), id=f"dataset-{job['Job Position']}")
+        for _, job in jobs.iterrows()
+    ]
+
+def _random_frames():
+    return [pytest.param(_random_frame(n, seed), id=f"random-{n}-{seed}") for n, seed in
+            [(2, 0), (7, 1), (40, 2), (90, 3)]]
+
+FRAMES = _dataset_frames() + _random_frames()
+
+def _assert_consistent_ranking(results, score_col, ascending):
+    # Ranking 1..n dan skor monoton sepanjang ranking (urutan di antara skor kembar bebas)
+    assert results['Ranking'].tolist() == list(range(1, len(results) + 1))
+    scores = results[score_col].to_numpy(dtype=float)
+    steps = np.diff(scores) if ascending else -np.diff(scores)
+    assert np.all(steps >= 0)
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_vikor_matches_reference(frame):
+    results = calc_vikor(frame, CRITERIA)
+    expected = ref_vikor_scores(frame[CRITERIA].to_numpy(dtype=float))
+
+    np.testing.assert_allclose(results['Skor VIKOR'].sort_index().to_numpy(), expected, rtol=0, atol=1e-12)
+    assert results['Nama'].sort_index().tolist() == frame['NAMA'].tolist()
+    _assert_consistent_ranking(results, 'Skor VIKOR', ascending=True)
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_electre_matches_reference(frame):
+    results = calc_electre(frame, CRITERIA)
+    expected = ref_electre_scores(frame[CRITERIA].to_numpy(dtype=float))
+
+    np.testing.assert_array_equal(results['Skor ELECTRE'].sort_index().to_numpy(), expected)
+    assert results['Nama'].sort_index().tolist() == frame['NAMA'].tolist()
+    _assert_consistent_ranking(results, 'Skor ELECTRE', ascending=False)
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_electre_small_tiles_match_reference(frame):
+    # Anggaran memori kecil: banyak tile berisi satu / beberapa baris
+    results = calc_electre(frame, CRITERIA, memory_budget=1)
+    expected = ref_electre_scores(frame[CRITERIA].to_numpy(dtype=float))
+    np.testing.assert_array_equal(results['Skor ELECTRE'].sort_index().to_numpy(), expected)
+
+@pytest.mark.parametrize('frame', FRAMES)
+@pytest.mark.parametrize('top_k', [1, 3, 10])
+def test_top_k_equals_head_of_full_ranking(frame, top_k):
+    # Jalur top_k & jalur penuh memakai aturan seri yang sama (indeks terkecil lebih dulu)
+    for calc in (calc_vikor, calc_electre):
+        full = calc(frame, CRITERIA)
+        top = calc(frame, CRITERIA, top_k=top_k)
+        pd.testing.assert_frame_equal(top, full.head(top_k),
+                                      check_dtype=False)
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_pipeline_matches_calc(frame):
+    # Tahap bersama pipeline memberi hasil yang sama dengan calc_vikor / calc_electre
+    agg = frame.rename(columns={'NAMA': 'Nama'})
+    results = run_methods(None, None, ('vikor', 'electre', 'saw'), aggregated_data=agg)
+    pd.testing.assert_frame_equal(results['vikor'], calc_vikor(frame, CRITERIA))
+    pd.testing.assert_frame_equal(results['electre'], calc_electre(frame, CRITERIA))
+
+    # SAW: normalisasi min-max, juga untuk kriteria negatif
+    dm = frame[CRITERIA].to_numpy(dtype=float)
+    f_range = dm.max(axis=0) - dm.min(axis=0)
+    normalized = np.divide(dm - dm.min(axis=0), f_range, out=np.zeros_like(dm), where=f_range != 0)
+    np.testing.assert_allclose(results['saw']['Skor SAW'].sort_index().to_numpy(), normalized @ WEIGHTS)
+    assert results['saw']['Skor SAW'].between(0, 1).all()
+
+def _dataset_jobs():
+    data = pd.read_csv(ROOT / 'Dataset.csv')
+    jobs = pd.read_csv(ROOT / 'job_positions.csv')
+    return data, [pytest.param(job, id=job['Job Position']) for _, job in jobs.iterrows()]
+
+DATASET, JOBS = _dataset_jobs()
+
+@pytest.mark.parametrize('job', JOBS)
+def test_incremental_matches_full_run(job):
+    # Ranker inkremental setelah beberapa penambahan = calc_vikor / calc_electre pada seluruh data
+    ranker = IncrementalRanker(DATASET.iloc[:8], job, memory_budget=500)
+    ranker.append(DATASET.iloc[8:11])
+    ranker.append(DATASET.iloc[11:])
+    # Kandidat kembar dari baris tengah: nilai ekstrem tetap, kandidat hanya disisipkan
+    twin = DATASET.iloc[[5]].assign(NAMA='Kembar')
+    before = ranker.electre_results().set_index('Nama')['Ranking']
+    update = ranker.append(twin)
+    after = ranker.electre_results().set_index('Nama')['Ranking']
+    moved = [name for name in before.index if before[name] != after[name]]
+    assert update.electre_changes['Nama'].tolist() == sorted(moved, key=ranker.names.index)
+
+    full = pd.concat([DATASET, twin], ignore_index=True)
+    agg = agg_to_5(full, job).rename(columns={'Nama': 'NAMA'})
+    pd.testing.assert_frame_equal(ranker.vikor_results(), calc_vikor(agg, CRITERIA), check_dtype=False)
+    pd.testing.assert_frame_equal(ranker.electre_results(), calc_electre(agg, CRITERIA, threshold_mode='sorted'),
+                                  check_dtype=False)
+
+@pytest.fixture(scope='module')
+def process_pool():
+    yield
+    electre_parallel.shutdown()
+
+@pytest.mark.parametrize('threshold_mode', THRESHOLD_MODES)
+@pytest.mark.parametrize('frame', _random_frames()[1:] + _dataset_frames()[:1])
+def test_parallel_electre_matches_reference(process_pool, frame, threshold_mode):
+    # Tile kecil agar ada beberapa tile per worker
+    results = calc_electre(frame, CRITERIA, memory_budget=1, threshold_mode=threshold_mode, n_jobs=2)
+    expected = ref_electre_scores(frame[CRITERIA].to_numpy(dtype=float))
+    np.testing.assert_array_equal(results['Skor ELECTRE'].sort_index().to_numpy(), expected)
+
+    # Threshold sama persis dengan jalur serial, berapa pun ukuran tile masing-masing
+    weighted = norm(frame[CRITERIA].to_numpy(dtype=float)) * WEIGHTS
+    serial = electre_thresholds(weighted, WEIGHTS, mode=threshold_mode)
+    for memory_budget in (1, 3000, DEFAULT_MEMORY_BUDGET):
+        for n_jobs in (1, 2):
+            threshold_c, threshold_d, scores = electre_parallel.electre_parallel(
+                weighted, WEIGHTS, memory_budget, n_jobs, threshold_mode
+            )
+            assert (threshold_c, threshold_d) == serial
+            assert electre_thresholds(weighted, WEIGHTS, memory_budget, mode=threshold_mode) == serial
+            np.testing.assert_array_equal(scores, expected)
+
+def _reachability(relation):
+    # Penutup transitif-refleksif dengan perkalian matriks boolean berulang
+    reach = relation | np.eye(len(relation), dtype=bool)
+    while True:
+        grown = reach | ((reach.astype(np.int64) @ reach.astype(np.int64)) > 0)
+        if np.array_equal(grown, reach):
+            return reach
+        reach = grown
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_outranking_graph_matches_reference(frame, tmp_path):
+    graph = electre_graph(frame, CRITERIA, memory_budget=1)
+    n = len(frame)
+    relation = np.unpackbits(graph.bits, axis=1, count=n, bitorder='little').astype(bool)
+
+    # Derajat keluar = skor ELECTRE, derajat masuk & transpose dari relasi yang sama
+    np.testing.assert_array_equal(out_degree(graph), ref_electre_scores(frame[CRITERIA].to_numpy(dtype=float)))
+    np.testing.assert_array_equal(in_degree(graph, memory_budget=1), relation.sum(axis=0))
+    transposed = np.unpackbits(transpose_bits(graph.bits, n, memory_budget=1), axis=1, count=n, bitorder='little')
+    np.testing.assert_array_equal(transposed.astype(bool), relation.T)
+
+    # Komponen terhubung kuat: satu komponen <=> saling terjangkau
+    reach = _reachability(relation)
+    labels = strongly_connected_components(graph).labels
+    np.testing.assert_array_equal(labels[:, np.newaxis] == labels[np.newaxis, :], reach & reach.T)
+
+    save_graph(graph, tmp_path / 'graph.npz')
+    loaded = load_graph(tmp_path / 'graph.npz')
+    np.testing.assert_array_equal(loaded.bits, graph.bits)
+    assert loaded.names.tolist() == graph.names.tolist()
+    assert (loaded.threshold_c, loaded.threshold_d) == (graph.threshold_c, graph.threshold_d)
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_approx_electre_exact_on_small_data(frame):
+    # Data kecil: semua lawan diuji & threshold dihitung persis
+    approx = approx_electre(frame, CRITERIA)
+    n = len(frame)
+    assert approx.settled and approx.threshold_d_se == 0
+    assert (approx.results['Lawan Diuji'] == max(n - 1, 0)).all()
+    np.testing.assert_allclose(approx.results['Skor ELECTRE (Estimasi)'].sort_index().to_numpy(),
+                               ref_electre_scores(frame[CRITERIA].to_numpy(dtype=float)))
+
+def test_approx_electre_sampled_top_k():
+    # Data lebih besar dengan sampling lawan: top-k yang sudah pasti = top-k persis
+    frame = _random_frame(600, 0)
+    frame[CRITERIA] += np.random.default_rng(0).random((600, len(CRITERIA)))
+    approx = approx_electre(frame, CRITERIA, top_k=5, samples=16, threshold_pairs=10 ** 6)
+    exact = calc_electre(frame, CRITERIA, top_k=5)
+    assert approx.settled
+    assert approx.results['Lawan Diuji'].min() < len(frame) - 1
+    assert approx.results['Nama'].head(5).tolist() == exact['Nama'].tolist()
+
+def test_quantile_sketch_rank_error_within_bound():
+    # Setelah compaction: rank nilai quantile menyimpang <= error dari rank ideal q * (n - 1)
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=20_000).round(2)
+    sketch = QuantileSketch(eps=0.05)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert sketch.error > 0 and sketch.rank_error <= sketch.eps
+    ordered = np.sort(values)
+    for q in [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]:
+        x = sketch.quantile(q)
+        lo = np.searchsorted(ordered, x, side='left')
+        hi = np.searchsorted(ordered, x, side='right') - 1
+        target = q * (len(values) - 1)
+        assert lo - sketch.error <= target <= hi + sketch.error
+
+    # Tanpa compaction quantile eksak (sama dengan pandas)
+    small = QuantileSketch()
+    small.update(values[:500])
+    assert small.rank_error == 0
+    assert small.quantile(0.75) == pd.Series(values[:500]).quantile(0.75)
+
+def _stream_csv(tmp_path, n=91):
+    # Dataset.csv diulang dengan nilai acak kecil agar kandidat tidak kembar
+    data = pd.read_csv(ROOT / 'Dataset.csv')
+    data = data.iloc[np.arange(n) % len(data)].reset_index(drop=True)
+    numeric = data.columns[1:]
+    data[numeric] += np.random.default_rng(n).integers(0, 3, size=(n, len(numeric)))
+    data['NAMA'] = [f'{name} {i}' for i, name in enumerate(data['NAMA'])]
+    path = tmp_path / 'dataset.csv'
+    data.to_csv(path, index=False)
+    return data, path
+
+@pytest.mark.parametrize('chunksize', [5, 16, 40])
+@pytest.mark.parametrize('job', JOBS)
+def test_streaming_matches_full_aggregation(job, chunksize, tmp_path):
+    # n = 91 bukan kelipatan chunksize: chunk terakhir lebih pendek. Kolom DISC
+    # (perkalian matriks-vektor BLAS) di chunk pendek boleh berbeda ~1 ulp.
+    data, path = _stream_csv(tmp_path)
+    agg = agg_to_5(data, job).rename(columns={'Nama': 'NAMA'})
+    full = agg[CRITERIA].to_numpy(dtype=float)
+
+    aggregate = write_aggregate(path, job, tmp_path / 'agg', chunksize=chunksize)
+    assert aggregate.stats.rank_error == 0
+    assert aggregate.names.tolist() == agg['NAMA'].tolist()
+    np.testing.assert_array_equal(aggregate.matrix[:, :4], full[:, :4])
+    np.testing.assert_allclose(aggregate.matrix, full, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(aggregate.col_min, full.min(axis=0), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(aggregate.col_max, full.max(axis=0), rtol=0, atol=1e-12)
+
+    _, hasil = run_vikor_streaming(path, job, tmp_path / 'vikor', chunksize=chunksize)
+    expected = calc_vikor(agg, CRITERIA).set_index('Nama')['Skor VIKOR']
+    expected_q = expected[agg['NAMA']].to_numpy(dtype=float)
+    np.testing.assert_allclose(hasil.Q[0], expected_q, rtol=0, atol=1e-12)
+    # Urutan streaming konsisten dengan skor calc_vikor (kembar dalam toleransi bebas)
+    assert (np.diff(expected_q[hasil.order[0]]) >= -1e-12).all()
+
+    _, top = run_vikor_streaming(path, job, tmp_path / 'top', chunksize=chunksize, top_k=5)
+    np.testing.assert_allclose(top['Skor VIKOR'].to_numpy(dtype=float),
+                               np.sort(expected_q)[:5], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(expected[top['Nama']].to_numpy(dtype=float),
+                               top['Skor VIKOR'].to_numpy(dtype=float), rtol=0, atol=1e-12)
+
+def _assert_features_equal(features, expected):
+    assert features.version == expected.version
+    np.testing.assert_array_equal(features.row_hashes, expected.row_hashes)
+    for field in ['std_dev', 'ist', 'kraepelin', 'papi_pos', 'papi_neg']:
+        pd.testing.assert_series_equal(getattr(features, field), getattr(expected, field), check_exact=True)
+    pd.testing.assert_frame_equal(features.disc_minmax, expected.disc_minmax, check_exact=True)
+
+def test_feature_cache_invalidation():
+    cache = FeatureCache()
+    first = cache.get(DATASET, source=(1.0, 100))
+    assert cache.get(DATASET, source=(1.0, 100)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Isi baris berubah dengan source baru (mtime berbeda, ukuran sama): versi & fitur baru
+    edited = DATASET.copy()
+    edited.loc[3, 'IQ'] += 5
+    features = cache.get(edited, source=(2.0, 100))
+    assert cache.misses == 2 and features.version != first.version
+    _assert_features_equal(features, candidate_features(edited))
+
+    # Tanpa source: objek DataFrame lain dengan isi berubah juga dihitung ulang
+    edited_again = edited.copy()
+    edited_again.loc[0, 'D_D'] += 1
+    features = cache.get(edited_again)
+    assert cache.misses == 3
+    _assert_features_equal(features, candidate_features(edited_again))
+
+    # Source lama dengan jumlah baris berbeda (append) tidak memakai versi lama;
+    # fitur diperbarui dari prefix = fitur dihitung penuh
+    appended = pd.concat([edited, DATASET.iloc[:2].assign(NAMA=['Baru 1', 'Baru 2'])], ignore_index=True)
+    features = cache.get(appended, source=(2.0, 100))
+    assert cache.misses == 4
+    _assert_features_equal(features, candidate_features(appended))
+
+    # Versi lama masih di cache: kembali ke source awal = hit
+    assert cache.get(DATASET, source=(1.0, 100)) is first
+
+def test_agg_all_jobs_matches_agg_to_5():
+    jobs = pd.read_csv(ROOT / 'job_positions.csv')
+    aggregate = agg_all_jobs(DATASET, jobs)
+    assert aggregate.names == DATASET['NAMA'].tolist()
+    assert aggregate.job_names == jobs['Job Position'].tolist()
+    for j, (_, job) in enumerate(jobs.iterrows()):
+        expected = agg_to_5(DATASET, job)[CRITERIA].to_numpy(dtype=float)
+        np.testing.assert_array_equal(aggregate.tensor[j], expected)
+
+def test_sqlite_storage_shared_between_connections(tmp_path):
+    # Dua objek storage = dua koneksi ke file WAL yang sama
+    shutil.copy(ROOT / 'Dataset.csv', tmp_path / 'dataset.csv')
+    shutil.copy(ROOT / 'job_positions.csv', tmp_path / 'job_positions.csv')
+    writer = SQLiteStorage(str(tmp_path / 'mcdm.sqlite3'))
+    reader = SQLiteStorage(str(tmp_path / 'mcdm.sqlite3'))
+    assert writer._conn().execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert reader.is_empty()
+
+    writer.import_csv(tmp_path / 'dataset.csv', tmp_path / 'job_positions.csv')
+    version = reader.data_version()
+    assert version == writer.data_version() > 0
+    before = reader.load_candidates()
+    assert len(before) == len(DATASET)
+
+    new_rows = DATASET.iloc[:2].assign(NAMA=['Baru 1', 'Baru 2'])
+    assert writer.append_candidates(new_rows) == 2
+    assert reader.data_version() == version + 1
+    after = reader.load_candidates()
+    assert after is not before
+    assert after['NAMA'].tolist() == DATASET['NAMA'].tolist() + ['Baru 1', 'Baru 2']
+
+    # Paritas dengan backend CSV setelah penambahan yang sama
+    csv_storage = CsvStorage(str(tmp_path / 'dataset.csv'), str(tmp_path / 'job_positions.csv'))
+    csv_version = csv_storage.data_version()
+    csv_storage.append_candidates(new_rows)
+    assert csv_storage.data_version() != csv_version
+    pd.testing.assert_frame_equal(after, csv_storage.load_candidates())
+    pd.testing.assert_frame_equal(reader.load_job_positions(), csv_storage.load_job_positions())
+
+    # Ekspor kembali ke CSV = isi database
+    writer.export_csv(tmp_path / 'export.csv', tmp_path / 'export_jobs.csv')
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'export.csv'), pd.read_csv(tmp_path / 'dataset.csv'))
+
+def _random_ranks(m, n, seed):
+    # Peringkat kecil acak: banyak seri
+    return np.random.default_rng(seed).integers(1, 5, size=(m, n)).astype(float)
+
+def _majority_margin(ranks):
+    # margin[a, b] = jumlah metode yang lebih menyukai a - yang lebih menyukai b
+    return (np.sum(ranks[:, :, None] < ranks[:, None, :], axis=0)
+            - np.sum(ranks[:, :, None] > ranks[:, None, :], axis=0))
+
+def _kemeny_distance(ranks, order):
+    position = np.empty(len(order), dtype=np.intp)
+    position[order] = np.arange(len(order))
+    before = position[:, None] < position[None, :]
+    # Setiap metode yang lebih menyukai b daripada a, padahal a ditaruh sebelum b
+    return int(np.sum((ranks[:, :, None] > ranks[:, None, :]) & before))
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('n', [1, 2, 7, 30])
+def test_consensus_matches_brute_force(n, seed):
+    x, y, z = _random_ranks(3, n, seed)
+
+    for strict in (True, False):
+        expected = [int(np.sum(x[:i] > x[i] if strict else x[:i] >= x[i])) for i in range(n)]
+        assert count_greater_before(x, strict=strict).tolist() == expected
+
+    # Kendall tau-b dari definisi pasangan
+    if n >= 2:
+        i, j = np.triu_indices(n, 1)
+        dx, dy = np.sign(x[i] - x[j]), np.sign(y[i] - y[j])
+        n0, ties_x, ties_y = len(i), np.sum(dx == 0), np.sum(dy == 0)
+        denom = np.sqrt(float(n0 - ties_x) * float(n0 - ties_y))
+        tau = kendall_tau(x, y)
+        if denom == 0:
+            assert np.isnan(tau)
+        else:
+            assert tau == pytest.approx(np.sum(dx * dy) / denom)
+
+    # Copeland: menang - kalah mayoritas, dua metode & tiga metode (tile 1 baris)
+    for ranks in (np.vstack([x, y]), np.vstack([x, y, z])):
+        margin = _majority_margin(ranks)
+        expected = np.sum(margin > 0, axis=1) - np.sum(margin < 0, axis=1)
+        assert copeland_scores(ranks).tolist() == expected.tolist()
+        assert _copeland_tiled(ranks, memory_budget=1).tolist() == expected.tolist()
+
+    # Kemeny: permutasi, optimum lokal (tidak ada tetangga yang mayoritas ingin ditukar)
+    ranks = np.vstack([x, y, z])
+    start = np.argsort(ranks.mean(axis=0), kind='stable')
+    order, passes, converged = kemeny_local_search(ranks, start)
+    assert converged and sorted(order.tolist()) == list(range(n))
+    margin = _majority_margin(ranks)
+    assert all(margin[order[k], order[k + 1]] >= 0 for k in range(n - 1))
+    assert _kemeny_distance(ranks, order) <= _kemeny_distance(ranks, start)
+
+_P_HIGH = value_range('P_N')[1]
+_SE_LOW, _SE_HIGH = value_range('SE')
+_FIRST = DATASET['NAMA'][0]
+
+# (perubahan sel {(baris data, kolom): nilai}, nama yang sudah ada,
+#  kesalahan [(Baris, Kolom, Kesalahan)], duplikat [(Baris, Alasan)]); Baris 2 = data baris 0
+_IMPORT_CASES = {
+    'valid': ({}, (), [], []),
+    'range': ({(1, 'P_N'): str(_P_HIGH + 1), (2, 'SE'): '-1'}, (),
+              [(3, 'P_N', f"di luar rentang 0-{_P_HIGH}"), (4, 'SE', f"di luar rentang {_SE_LOW}-{_SE_HIGH}")], []),
+    'blank_name': ({(0, 'NAMA'): '   '}, (), [(2, 'NAMA', 'kosong')], []),
+    'blank_score': ({(2, 'WA'): ''}, (), [(4, 'WA', 'kosong')], []),
+    'not_number': ({(1, 'AN'): 'abc', (1, 'D_C'): '2.5'}, (),
+                   [(3, 'AN', 'bukan angka'), (3, 'D_C', 'bukan bilangan bulat')], []),
+    'duplicate_in_file': ({(2, 'NAMA'): f'  {_FIRST} '}, (), [], [(4, 'duplikat di dalam file')]),
+    'duplicate_existing_list': ({}, [f'{_FIRST} '], [], [(2, 'sudah ada di data kandidat')]),
+    'duplicate_existing_index': ({}, NameIndex(DATASET['NAMA']), [],
+                                 [(2, 'sudah ada di data kandidat'), (3, 'sudah ada di data kandidat'),
+                                  (4, 'sudah ada di data kandidat')]),
+}
+
+@pytest.mark.parametrize('case', list(_IMPORT_CASES))
+def test_bulk_import_validation(case):
+    edits, existing, errors, duplicates = _IMPORT_CASES[case]
+    upload = DATASET.iloc[:3].astype(str).assign(Catatan='x')
+    for (row, col), value in edits.items():
+        upload.loc[row, col] = value
+    buffer = io.StringIO(upload.to_csv(index=False))
+
+    report = validate_candidates(read_upload(buffer), existing)
+    assert report.ignored_columns == ['Catatan']
+    assert list(report.errors[['Baris', 'Kolom', 'Kesalahan']].itertuples(index=False, name=None)) == errors
+    assert list(report.duplicates[['Baris', 'Alasan']].itertuples(index=False, name=None)) == duplicates
+
+    # Baris lain lolos dengan nilai & tipe seperti dataset.csv
+    skipped = {row for row, _, _ in errors} | {row for row, _ in duplicates}
+    kept = [i for i in range(3) if i + 2 not in skipped]
+    expected = DATASET.iloc[kept].reset_index(drop=True)
+    pd.testing.assert_frame_equal(report.valid, expected, check_dtype=False)
+    assert (report.valid.dtypes.iloc[1:] == np.int64).all()
+
+def test_service_coalesces_concurrent_requests(tmp_path):
+    shutil.copy(ROOT / 'Dataset.csv', tmp_path / 'dataset.csv')
+    shutil.copy(ROOT / 'job_positions.csv', tmp_path / 'job_positions.csv')
+    job = pd.read_csv(ROOT / 'job_positions.csv')['Job Position'][0]
+
+    async def scenario(service):
+        await service.state()
+        # Permintaan identik yang datang bersamaan dihitung sekali
+        targets = ([f'/rank?job={job}&method=electre'] * 5 + [f'/rank?job={job}'] * 3
+                   + [f'/rank?job={job}&method=VIKOR&top_k=3'])
+        responses = await asyncio.gather(*(handle_request(service, 'GET', target) for target in targets))
+        assert (service.computed, service.coalesced) == (3, 6)
+        assert all(status == 200 for status, _ in responses)
+        assert all(payload == responses[0][1] for _, payload in responses[1:5])
+        assert len(responses[0][1]['results']) == len(DATASET)
+        assert [r['Ranking'] for r in responses[8][1]['results']] == [1, 2, 3]
+
+        status, health = await handle_request(service, 'GET', '/health')
+        assert (health['computed'], health['coalesced'], health['candidates']) == (3, 6, len(DATASET))
+
+        # 404 & 400
+        for method, target, expected in [
+            ('GET', '/rank?job=Tidak%20Ada', 404), ('GET', '/unknown', 404), ('POST', '/rank', 404),
+            ('GET', '/rank', 400), ('GET', f'/rank?job={job}&method=saw', 400),
+            ('GET', f'/rank?job={job}&top_k=0', 400), ('GET', f'/rank?job={job}&top_k=x', 400),
+        ]:
+            with pytest.raises(HTTPError) as error:
+                await handle_request(service, method, target)
+            assert error.value.status == expected
+
+        # /reload memuat data baru; permintaan berikutnya dihitung ulang dengan versi baru
+        old_version = health['version']
+        pd.concat([DATASET, DATASET.iloc[:1].assign(NAMA='Baru')]).to_csv(tmp_path / 'dataset.csv', index=False)
+        status, reloaded = await handle_request(service, 'POST', '/reload')
+        assert status == 200 and reloaded['candidates'] == len(DATASET) + 1
+        assert reloaded['version'] != old_version
+        status, payload = await handle_request(service, 'GET', f'/rank?job={job}')
+        assert payload['version'] == reloaded['version'] and len(payload['results']) == len(DATASET) + 1
+        assert service.computed == 4
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        pool = WarmPool(str(tmp_path / 'dataset.csv'), str(tmp_path / 'job_positions.csv'))
+        asyncio.run(scenario(RankingService(pool, executor)))
+    finally:
+        executor.shutdown()
+
+def test_first_common_returns_lowest_bit():
+    # Byte pertama bernilai kecil, byte berikutnya lebih besar: bit 1 pertama tetap di byte 0
+    row = np.array([0b00000110, 0b11110000, 0b00000001], dtype=np.uint8)
+    assert _first_common(row, np.array([0xFF, 0xFF, 0xFF], dtype=np.uint8)) == 1
+    assert _first_common(row, np.array([0b11111001, 0xFF, 0xFF], dtype=np.uint8)) == 12
+    assert _first_common(row, np.array([0, 0b00100000, 0xFF], dtype=np.uint8)) == 13
+    assert _first_common(row, np.array([0b11111001, 0b00001111, 0b11111110], dtype=np.uint8)) == -1
+
+def test_vikor_all_jobs_matches_calc_vikor():
+    jobs = pd.read_csv(ROOT / 'job_positions.csv')
+    all_results = run_vikor_all_jobs(DATASET, jobs)
+    top = run_vikor_all_jobs(DATASET, jobs, top_k=3)
+    for _, job in jobs.iterrows():
+        expected = calc_vikor(agg_to_5(DATASET, job).rename(columns={'Nama': 'NAMA'}), CRITERIA)
+        pd.testing.assert_frame_equal(all_results[job['Job Position']], expected)
+        assert top[job['Job Position']]['Nama'].tolist() == expected['Nama'].head(3).tolist()
+
+def test_cli_csv_keeps_electre_scores_integer(tmp_path):
+    out = tmp_path / 'hasil.csv'
+    assert cli.main([str(ROOT / 'Dataset.csv'), str(ROOT / 'job_positions.csv'), '-k', '3', '-o', str(out)]) == 0
+    written = pd.read_csv(out, dtype=str)
+    electre = written[written['Metode'] == 'ELECTRE']
+    vikor = written[written['Metode'] == 'VIKOR']
+    assert len(electre) > 0 and electre['Skor'].str.fullmatch(r'-?\d+').all()
+
+    job = pd.read_csv(ROOT / 'job_positions.csv').iloc[0]
+    expected = calc_vikor(agg_to_5(DATASET, job).rename(columns={'Nama': 'NAMA'}), CRITERIA, top_k=3)
+    rows = vikor[vikor['Posisi'] == job['Job Position']]
+    assert rows['Nama'].tolist() == expected['Nama'].tolist()
+    np.testing.assert_array_equal(rows['Skor'].astype(float), expected['Skor VIKOR'].to_numpy(dtype=float))
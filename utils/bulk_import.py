@@ -0,0 +1,133 @@
+# ========== IMPOR MASSAL DATA KANDIDAT (CSV) ========== #
+# File CSV berisi banyak kandidat divalidasi per kolom (tanpa loop per baris):
+# skema, nilai kosong / bukan angka / bukan bilangan bulat, dan rentang nilai
+# yang sama dengan form input. Kandidat yang NAMA-nya sudah ada (atau muncul
+# lebih dari sekali di file) dilewati; sisanya ditambahkan lewat storage
+# (open_storage().append_candidates) dalam satu penulisan.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from utils.loader import CSV_COLUMNS_KANDIDAT, value_range
+from utils.name_index import NameIndex, normalize_name
+
+# Hasil validasi:
+# - valid: DataFrame kandidat yang siap ditambahkan (kolom CSV_COLUMNS_KANDIDAT)
+# - errors: DataFrame kesalahan per sel (Baris, Kolom, Nilai, Kesalahan)
+# - duplicates: DataFrame baris yang dilewati karena NAMA duplikat (Baris, NAMA, Alasan)
+# - ignored_columns: kolom file yang bukan bagian dari dataset
+ImportReport = namedtuple('ImportReport', ['valid', 'errors', 'duplicates', 'ignored_columns'])
+
+ERROR_COLUMNS = ['Baris', 'Kolom', 'Nilai', 'Kesalahan']
+DUPLICATE_COLUMNS = ['Baris', 'NAMA', 'Alasan']
+
+def read_upload(source):
+    """
+    Membaca file CSV unggahan sebagai teks agar nilai asli bisa dilaporkan.
+    Melempar ValueError jika file kosong atau tidak bisa diparse.
+    """
+    try:
+        return pd.read_csv(source, dtype=str, skipinitialspace=True)
+    except pd.errors.EmptyDataError:
+        raise ValueError("File kosong.")
+    except pd.errors.ParserError as e:
+        raise ValueError(f"Format CSV tidak valid: {e}")
+
+def _cell_errors(mask, raw, columns, line, messages):
+    """
+    Kesalahan untuk setiap sel True pada mask (baris x kolom).
+    messages: satu pesan, atau array pesan per kolom.
+    """
+    rows, cols = np.nonzero(mask)
+    return pd.DataFrame({
+        'Baris': line[rows],
+        'Kolom': np.asarray(columns, dtype=object)[cols],
+        'Nilai': raw[rows, cols],
+        'Kesalahan': messages if np.ndim(messages) == 0 else np.asarray(messages, dtype=object)[cols]
+    })
+
+def validate_candidates(df, existing_names=()):
+    """
+    Validasi DataFrame kandidat hasil read_upload.
+
+    Parameters:
+    - df: DataFrame (nilai boleh berupa teks)
+    - existing_names: NAMA kandidat yang sudah ada di dataset (iterable atau NameIndex)
+
+    Returns:
+    - ImportReport
+    Melempar ValueError jika kolom wajib tidak ada di file.
+    """
+    # 1. Skema: semua kolom dataset harus ada, kolom lain diabaikan
+    missing = [col for col in CSV_COLUMNS_KANDIDAT if col not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan di file: {missing}")
+    ignored = [col for col in df.columns if col not in CSV_COLUMNS_KANDIDAT]
+
+    n = len(df)
+    line = np.arange(n) + 2  # nomor baris di file (baris 1 = header)
+    score_cols = CSV_COLUMNS_KANDIDAT[1:]
+
+    # 2. NAMA wajib diisi
+    names = df['NAMA'].astype('string').str.strip()
+    empty_name = names.isna() | names.eq('')
+    empty_name = empty_name.to_numpy(dtype=bool)
+
+    # 3. Skor: kosong, bukan angka, bukan bilangan bulat, di luar rentang
+    raw = df[score_cols].to_numpy(dtype=object)
+    values = df[score_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    bounds = np.array([value_range(col) for col in score_cols], dtype=float)
+    low, high = bounds[:, 0], bounds[:, 1]
+
+    blank = df[score_cols].isna().to_numpy()
+    is_nan = np.isnan(values)
+    not_number = is_nan & ~blank
+    not_integer = ~is_nan & (values != np.floor(values))
+    out_of_range = ~is_nan & ((values < low) | (values > high))
+    range_messages = [f"di luar rentang {int(lo)}-{int(hi)}" for lo, hi in bounds]
+
+    errors = [
+        pd.DataFrame({
+            'Baris': line[empty_name],
+            'Kolom': 'NAMA',
+            'Nilai': df['NAMA'].to_numpy(dtype=object)[empty_name],
+            'Kesalahan': 'kosong'
+        }),
+        _cell_errors(blank, raw, score_cols, line, 'kosong'),
+        _cell_errors(not_number, raw, score_cols, line, 'bukan angka'),
+        _cell_errors(not_integer, raw, score_cols, line, 'bukan bilangan bulat'),
+        _cell_errors(out_of_range, raw, score_cols, line, range_messages)
+    ]
+    errors = pd.concat(errors, ignore_index=True)[ERROR_COLUMNS]
+    col_order = {col: i for i, col in enumerate(CSV_COLUMNS_KANDIDAT)}
+    errors = errors.sort_values(
+        ['Baris', 'Kolom'], key=lambda s: s.map(col_order) if s.name == 'Kolom' else s, kind='stable'
+    ).reset_index(drop=True)
+
+    row_ok = ~(empty_name | blank.any(axis=1) | not_number.any(axis=1)
+               | not_integer.any(axis=1) | out_of_range.any(axis=1))
+
+    # 4. De-duplikasi NAMA: terhadap data yang ada (hash) dan di dalam file
+    if isinstance(existing_names, NameIndex):
+        known = existing_names.existing(names.fillna(''))
+    else:
+        known = names.isin({normalize_name(name) for name in existing_names}).to_numpy(dtype=bool)
+    in_existing = row_ok & known
+    in_file = np.zeros(n, dtype=bool)
+    candidates = row_ok & ~in_existing
+    in_file[candidates] = names[candidates].duplicated(keep='first').to_numpy(dtype=bool)
+
+    duplicates = pd.concat([
+        pd.DataFrame({'Baris': line[in_existing], 'NAMA': names[in_existing].to_numpy(dtype=object),
+                      'Alasan': 'sudah ada di data kandidat'}),
+        pd.DataFrame({'Baris': line[in_file], 'NAMA': names[in_file].to_numpy(dtype=object),
+                      'Alasan': 'duplikat di dalam file'})
+    ], ignore_index=True)[DUPLICATE_COLUMNS].sort_values('Baris', kind='stable').reset_index(drop=True)
+
+    # 5. Baris valid, dengan tipe yang sama seperti dataset.csv
+    keep = candidates & ~in_file
+    valid = pd.DataFrame(values[keep].astype(np.int64), columns=score_cols)
+    valid.insert(0, 'NAMA', names[keep].to_numpy(dtype=object))
+
+    return ImportReport(valid, errors, duplicates, ignored)
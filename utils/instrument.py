@@ -0,0 +1,312 @@
+# ========== INSTRUMENTASI PIPELINE (OPT-IN) ========== #
+# Mencatat waktu, alokasi memori (tracemalloc) dan ukuran array per tahap
+# agregasi / VIKOR / ELECTRE. Nonaktif secara default; jika nonaktif setiap
+# stage() hanya mengembalikan context manager kosong.
+#
+# Aktifkan dengan environment variable MCDM_INSTRUMENT:
+# - "1" / "memory": waktu + alokasi memori
+# - "time": waktu saja (tanpa overhead tracemalloc)
+# atau per thread dengan set_enabled() (dipakai panel diagnostik Streamlit).
+#
+# Setiap tahap & run dikirim sebagai log JSON ke logger "mcdm.instrument".
+#
+# tracemalloc berlaku untuk seluruh proses, bukan per thread: start/stop diatur
+# dengan hitungan run memori yang aktif. Jika dua run memori berjalan bersamaan
+# (mis. dua sesi Streamlit atau dua request layanan), puncak alokasi tidak bisa
+# dipisah per run, sehingga alokasi kedua run tidak dilaporkan (None) dan
+# RunRecord.memory_shared = True. Waktu tetap dicatat.
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('mcdm.instrument')
+
+MODES = ('off', 'time', 'memory')
+
+_ENV_MODES = {'': 'off', '0': 'off', 'off': 'off', 'time': 'time', '1': 'memory', 'memory': 'memory'}
+_global_mode = _ENV_MODES.get(os.environ.get('MCDM_INSTRUMENT', '').strip().lower(), 'off')
+_local = threading.local()
+
+# Run terakhir dari semua thread (untuk log / layanan)
+history = deque(maxlen=50)
+_history_lock = threading.Lock()
+
+# Run yang sedang mengukur memori (semua thread) & apakah tracemalloc dimulai di sini
+_trace_lock = threading.Lock()
+_memory_runs = set()
+_started_tracing = False
+
+def set_enabled(mode):
+    """
+    Mengatur mode untuk thread ini: True / 'memory', 'time', False / 'off',
+    atau None untuk kembali ke MCDM_INSTRUMENT.
+    """
+    if mode is True:
+        mode = 'memory'
+    elif mode is False:
+        mode = 'off'
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Mode instrumentasi harus salah satu dari {MODES}, bukan {mode!r}.")
+    _local.mode = mode
+
+def current_mode():
+    mode = getattr(_local, 'mode', None)
+    return _global_mode if mode is None else mode
+
+def describe(value):
+    """
+    Ringkasan ukuran untuk dicatat: bentuk & byte array/DataFrame, nilai skalar apa adanya.
+    """
+    if isinstance(value, np.ndarray):
+        return {'shape': list(value.shape), 'nbytes': int(value.nbytes)}
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return {'shape': list(value.shape), 'nbytes': int(value.memory_usage(deep=False).sum())}
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return value
+
+class StageStats:
+    """
+    Statistik satu tahap dalam satu run. Tahap yang sama dalam loop (mis. per
+    tile) diakumulasi: waktu dijumlahkan, puncak alokasi diambil maksimum.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_bytes = None
+        self.net_bytes = None
+        self.sizes = {}
+
+    def note(self, **values):
+        self.sizes.update({key: describe(val) for key, val in values.items()})
+
+    def as_dict(self):
+        return {
+            'stage': self.path,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes,
+            'net_bytes': self.net_bytes,
+            'sizes': self.sizes
+        }
+
+class RunRecord:
+    """
+    Satu run yang diinstrumentasi (mis. satu klik tombol) beserta tahapnya.
+    """
+
+    def __init__(self, name, mode):
+        self.name = name
+        self.mode = mode
+        self.started = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        self.seconds = None
+        self.peak_bytes = None
+        self.memory_shared = False
+        self.stages = OrderedDict()
+
+    def stage(self, path):
+        if path not in self.stages:
+            self.stages[path] = StageStats(path)
+        return self.stages[path]
+
+    def as_dict(self):
+        return {
+            'run': self.name,
+            'started': self.started,
+            'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes,
+            'memory_shared': self.memory_shared,
+            'stages': [s.as_dict() for s in self.stages.values()]
+        }
+
+    def to_frame(self):
+        """
+        DataFrame satu baris per tahap (untuk panel diagnostik).
+        """
+        rows = []
+        for s in self.stages.values():
+            rows.append({
+                'Tahap': s.path,
+                'Panggilan': s.calls,
+                'Waktu (ms)': round(s.seconds * 1000, 3),
+                'Puncak Alokasi (MiB)': None if s.peak_bytes is None else round(s.peak_bytes / 2 ** 20, 3),
+                'Alokasi Bersih (MiB)': None if s.net_bytes is None else round(s.net_bytes / 2 ** 20, 3),
+                'Ukuran': json.dumps(s.sizes, default=str) if s.sizes else ''
+            })
+        return pd.DataFrame(rows)
+
+class _NullStage:
+    def note(self, **values):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def _begin_memory(record):
+    """
+    Mendaftarkan run memori; tracemalloc dimulai oleh run pertama.
+    Run yang tumpang tindih dengan run memori lain ditandai memory_shared.
+    """
+    global _started_tracing
+    with _trace_lock:
+        if not _memory_runs and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _memory_runs.add(record)
+        if len(_memory_runs) > 1:
+            for active in _memory_runs:
+                active.memory_shared = True
+
+def _end_memory(record):
+    """
+    Melepas run memori; tracemalloc dihentikan setelah run terakhir selesai
+    (hanya jika dimulai oleh modul ini).
+    """
+    global _started_tracing
+    with _trace_lock:
+        _memory_runs.discard(record)
+        if not _memory_runs and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+def _read_memory(record, reset):
+    """
+    (alokasi sekarang, puncak) dari tracemalloc, atau None jika run berbagi
+    tracemalloc dengan run lain. reset: reset puncak setelah dibaca.
+    """
+    with _trace_lock:
+        if record.memory_shared:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        if reset:
+            tracemalloc.reset_peak()
+        return current, peak
+
+@contextmanager
+def _measure(stats, parent, record):
+    """
+    Mengukur waktu & alokasi satu blok. Puncak tracemalloc direset per blok,
+    jadi puncak blok induk diperbarui sebelum reset dan setelah blok selesai.
+    """
+    memory = _read_memory(record, reset=True) if record.mode == 'memory' else None
+    if memory is not None and parent is not None:
+        parent['peak'] = max(parent['peak'], memory[1])
+    frame = {'start_mem': 0 if memory is None else memory[0], 'peak': 0}
+    start = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        stats.seconds += time.perf_counter() - start
+        stats.calls += 1
+        end_memory = None if memory is None else _read_memory(record, reset=False)
+        if end_memory is not None:
+            current, peak = end_memory
+            frame['peak'] = max(frame['peak'], peak)
+            peak_delta = frame['peak'] - frame['start_mem']
+            stats.peak_bytes = peak_delta if stats.peak_bytes is None else max(stats.peak_bytes, peak_delta)
+            stats.net_bytes = (stats.net_bytes or 0) + current - frame['start_mem']
+            if parent is not None:
+                parent['peak'] = max(parent['peak'], frame['peak'])
+
+@contextmanager
+def run(name, **sizes):
+    """
+    Membuka satu run. Jika sudah ada run aktif di thread ini, berlaku sebagai stage.
+    Menghasilkan RunRecord (atau None jika instrumentasi nonaktif).
+    """
+    mode = current_mode()
+    stack = _stack()
+    if mode == 'off':
+        yield None
+        return
+    if stack:
+        with stage(name, **sizes):
+            yield stack[0]['record']
+        return
+
+    record = RunRecord(name, mode)
+    if mode == 'memory':
+        _begin_memory(record)
+
+    root = StageStats(name)
+    root.note(**sizes)
+    try:
+        with _measure(root, None, record) as frame:
+            frame['record'] = record
+            frame['path'] = ''
+            stack.append(frame)
+            try:
+                yield record
+            finally:
+                stack.pop()
+    finally:
+        if mode == 'memory':
+            _end_memory(record)
+        if record.memory_shared:
+            # Sebagian tahap mungkin terukur sebelum run lain dimulai: tidak bisa dipercaya
+            for s in [root, *record.stages.values()]:
+                s.peak_bytes = s.net_bytes = None
+        record.seconds = root.seconds
+        record.peak_bytes = root.peak_bytes
+        with _history_lock:
+            history.append(record)
+        for s in record.stages.values():
+            logger.info(json.dumps({'event': 'stage', 'run': name, **s.as_dict()}, default=str))
+        logger.info(json.dumps({'event': 'run', 'run': name, 'seconds': record.seconds,
+                                'peak_bytes': record.peak_bytes, 'memory_shared': record.memory_shared,
+                                'sizes': root.sizes}, default=str))
+
+@contextmanager
+def stage(name, **sizes):
+    """
+    Mencatat satu tahap di dalam run aktif. Di luar run (atau jika nonaktif)
+    tidak mencatat apa pun. Menghasilkan objek dengan method note(**ukuran).
+    """
+    stack = _stack()
+    if not stack or current_mode() == 'off':
+        yield _NULL_STAGE
+        return
+
+    parent = stack[-1]
+    path = f"{parent['path']}/{name}" if parent['path'] else name
+    stats = parent['record'].stage(path)
+    stats.note(**sizes)
+    with _measure(stats, parent, parent['record']) as frame:
+        frame['record'] = parent['record']
+        frame['path'] = path
+        stack.append(frame)
+        try:
+            yield stats
+        finally:
+            stack.pop()
+
+def traced(name):
+    """
+    Decorator: menjalankan fungsi di dalam run(name) jika instrumentasi aktif.
+    """
+    def wrap(func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            if current_mode() == 'off':
+                return func(*args, **kwargs)
+            with run(name):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
@@ -0,0 +1,120 @@
+# ========== LOADER DATA (TANPA STREAMLIT) ========== #
+# Dipakai bersama oleh app.py (Streamlit) dan cli.py (batch). Fungsi di sini
+# melempar exception; pesan ke pengguna ditampilkan oleh pemanggil.
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from utils.snapshot import load_candidates
+
+# ---------- Definisi Kolom Global ---------- #
+CSV_COLUMNS_KANDIDAT = [
+    "NAMA", "SE", "WA", "AN", "GE", "ME", "RA", "ZR", "FA", "WU", "IQ",
+    "P_C", "P_F", "P_W", "P_N", "P_G", "P_A", "P_P", "P_I", "P_V", "P_S",
+    "P_X", "P_E", "P_K", "P_L", "P_T", "P_B", "P_O", "P_R", "P_D", "P_Z",
+    "M_E", "M_I", "M_S", "M_N", "M_T", "M_F", "M_J", "M_P",
+    "K_C", "K_T", "K_A1", "K_A2", "K_H",
+    "D_D", "D_I", "D_S", "D_C"
+]
+
+# Rentang nilai yang valid per kolom (sama dengan batas form input kandidat)
+IST_FIELDS = ["SE", "WA", "AN", "GE", "ME", "RA", "ZR", "FA", "WU", "IQ"]
+VALUE_RANGES_BY_PREFIX = {'P_': (0, 9), 'M_': (0, 100), 'K_': (0, 5), 'D_': (0, 9)}
+IST_RANGE = (0, 150)
+
+def value_range(col):
+    """
+    (minimum, maksimum) nilai yang valid untuk satu kolom skor kandidat.
+    """
+    if col in IST_FIELDS:
+        return IST_RANGE
+    for prefix, bounds in VALUE_RANGES_BY_PREFIX.items():
+        if col.startswith(prefix):
+            return bounds
+    raise KeyError(f"Kolom {col} bukan kolom skor kandidat.")
+
+EXPECTED_JOB_COLUMNS = [
+    'Job Position', 'PAPI context', 'M', 'B', 'T', 'I_M',
+    'D', 'I_D', 'S', 'C'
+]
+
+CANDIDATES_CSV_PATH = "dataset.csv"
+JOB_POSITIONS_CSV_PATH = "job_positions.csv"
+
+DEFAULT_JOB_POSITIONS = {
+    'Job Position': ['Pre-Sales', 'IT Developer', 'Sales Manager', 'Admin', 'Marketing'],
+    'PAPI context': ['O', 'R', 'B', 'D', 'Z'],
+    'M': ['E', 'I', 'E', 'I', 'E'],
+    'B': ['N', 'N', 'S', 'S', 'N'],
+    'T': ['T', 'T', 'F', 'T', 'F'],
+    'I_M': ['J', 'P', 'J', 'J', 'P'],
+    'D': [0.3, 0.1, 0.2, 0.4, 0.25],
+    'I_D': [0.4, 0.2, 0.3, 0.1, 0.25],
+    'S': [0.2, 0.2, 0.3, 0.3, 0.25],
+    'C': [0.1, 0.5, 0.2, 0.2, 0.25]
+}
+
+def load_candidate_data(file_path=CANDIDATES_CSV_PATH):
+    """
+    Data kandidat dengan kolom CSV_COLUMNS_KANDIDAT (kolom yang tidak ada diisi NaN),
+    dibaca lewat snapshot kolomnar (lihat utils.snapshot).
+    Melempar FileNotFoundError jika file tidak ada.
+    """
+    try:
+        return load_candidates(file_path, CSV_COLUMNS_KANDIDAT)
+    except PermissionError:
+        # Direktori file tidak bisa ditulisi (snapshot gagal dibuat): baca CSV langsung
+        df = pd.read_csv(file_path)
+        for col in CSV_COLUMNS_KANDIDAT:
+            if col not in df.columns:
+                df[col] = np.nan
+        return df[CSV_COLUMNS_KANDIDAT]
+
+def default_job_positions():
+    return pd.DataFrame(DEFAULT_JOB_POSITIONS, columns=EXPECTED_JOB_COLUMNS)
+
+def load_job_positions(file_path=JOB_POSITIONS_CSV_PATH):
+    """
+    Data posisi pekerjaan.
+    Melempar FileNotFoundError jika file tidak ada, ValueError jika kosong
+    atau kolomnya tidak sesuai EXPECTED_JOB_COLUMNS.
+    """
+    try:
+        df = pd.read_csv(file_path)
+    except pd.errors.EmptyDataError:
+        raise ValueError(f"File {file_path} kosong.")
+    missing = [col for col in EXPECTED_JOB_COLUMNS if col not in df.columns]
+    if df.empty or missing:
+        raise ValueError(f"File {file_path} kosong atau kolom tidak lengkap: {missing}")
+    return df
+
+# Penulisan CSV dari beberapa sesi Streamlit (thread) dalam satu proses diserialkan
+_append_lock = threading.Lock()
+
+def append_csv(rows, csv_path, columns):
+    """
+    Menambahkan baris ke file CSV dalam satu penulisan.
+    Header hanya ditulis jika file belum ada atau kosong (tanpa membaca ulang isi file).
+
+    Returns:
+    - jumlah baris yang ditulis
+    """
+    if rows.empty:
+        return 0
+    with _append_lock:
+        write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+
+        # Pastikan baris baru tidak menempel pada baris terakhir tanpa newline
+        needs_newline = False
+        if not write_header:
+            with open(csv_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b'\n', b'\r')
+
+        with open(csv_path, 'a', encoding='utf-8', newline='') as f:
+            if needs_newline:
+                f.write('\n')
+            rows[columns].to_csv(f, header=write_header, index=False, lineterminator='\n')
+    return len(rows)
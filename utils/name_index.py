@@ -0,0 +1,119 @@
+# ========== INDEX NAMA KANDIDAT ========== #
+# Kandidat hanya dikenali lewat kolom NAMA. Daripada memindai list nama setiap
+# kali, index dibangun sekali per versi data kandidat:
+# - hash (dict nama -> grup baris) untuk pencarian nama persis & cek duplikat
+# - array nama (casefold) terurut untuk pencarian awalan dengan binary search
+# Index disimpan per proses (lihat name_index) dan dibangun ulang hanya jika
+# versi data berubah.
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Karakter unicode terbesar: semua string berawalan p < p + _MAX_CHAR
+_MAX_CHAR = '\U0010ffff'
+
+def normalize_name(name):
+    return str(name).strip()
+
+class NameIndex:
+    """
+    Index nama kandidat atas urutan baris data (posisi 0..n-1).
+    Nama dibandingkan setelah strip(); pencarian awalan tidak peka huruf besar/kecil.
+    """
+
+    def __init__(self, names):
+        names = pd.Series(np.asarray(names, dtype=object)).map(normalize_name)
+        codes, uniques = pd.factorize(names, use_na_sentinel=False)
+
+        # 1. Hash: nama unik -> nomor grup, grup -> posisi baris (urut naik)
+        self.names = pd.Index(uniques, dtype=object)
+        self._groups = dict(zip(self.names, range(len(self.names))))
+        self._rows = np.argsort(codes, kind='stable')
+        self._counts = np.bincount(codes, minlength=len(self.names))
+        self._starts = np.concatenate([[0], np.cumsum(self._counts)])
+        self.n_rows = len(codes)
+
+        # 2. Nama casefold terurut untuk pencarian awalan
+        folded = np.array([name.casefold() for name in self.names], dtype=str)
+        self._sorted_groups = np.argsort(folded, kind='stable')
+        self._sorted_keys = folded[self._sorted_groups]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._groups
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def lookup(self, name):
+        """
+        Posisi baris kandidat dengan nama persis name (array kosong jika tidak ada).
+        """
+        group = self._groups.get(normalize_name(name))
+        if group is None:
+            return np.empty(0, dtype=np.intp)
+        return self._rows[self._starts[group]:self._starts[group + 1]]
+
+    def prefix(self, prefix, limit=None):
+        """
+        Nama unik yang diawali prefix (tidak peka huruf besar/kecil), urut abjad.
+        limit: jumlah maksimum nama yang dikembalikan
+        """
+        key = normalize_name(prefix).casefold()
+        low = np.searchsorted(self._sorted_keys, key, side='left')
+        high = np.searchsorted(self._sorted_keys, key + _MAX_CHAR, side='left')
+        if limit is not None:
+            high = min(high, low + limit)
+        return self.names[self._sorted_groups[low:high]].tolist()
+
+    def duplicates(self):
+        """
+        Nama yang dipakai lebih dari satu baris beserta jumlahnya.
+        """
+        repeated = np.flatnonzero(self._counts > 1)
+        return pd.Series(self._counts[repeated], index=self.names[repeated], name='Jumlah')
+
+    def existing(self, names):
+        """
+        Mask bool: nama mana dari names yang sudah ada di index (tervektorisasi).
+        """
+        names = pd.Series(np.asarray(names, dtype=object)).map(normalize_name)
+        return self.names.get_indexer(names) >= 0
+
+# Index per proses, satu entri per versi data (versi lama dibuang)
+_MAX_INDEXES = 4
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+def name_index(names, version):
+    """
+    NameIndex untuk data kandidat versi version, dibangun sekali per versi.
+
+    Parameters:
+    - names: kolom NAMA data kandidat (urutan baris data)
+    - version: versi data (mis. storage.data_version() atau dataset_version)
+
+    Returns:
+    - NameIndex
+    """
+    with _lock:
+        index = _indexes.get(version)
+        if index is not None and index.n_rows == len(names):
+            _indexes.move_to_end(version)
+            return index
+
+    index = NameIndex(names)
+    with _lock:
+        _indexes[version] = index
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+def clear_cache():
+    with _lock:
+        _indexes.clear()
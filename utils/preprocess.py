@@ -1,5 +1,52 @@
 # ========== FUNGSI AGREGASI 47 KOLOM KE 5 KRITERIA ========== #
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+import numpy as np
 import pandas as pd
+from utils.instrument import stage, traced
+
+# Nama 5 kriteria hasil agregasi (urutan kolom decision matrix)
+CRITERIA = ['IST', 'PAPI', 'MBTI', 'Kraepelin', 'DISC']
+
+# Kolom mentah per alat tes
+IST_COLS = ['SE', 'WA', 'AN', 'GE', 'ME', 'RA', 'ZR', 'FA', 'WU']
+PAPI_COLS = [
+    'P_C', 'P_F', 'P_W', 'P_N', 'P_G', 'P_A', 'P_P', 'P_I', 'P_V', 'P_S',
+    'P_X', 'P_E', 'P_K', 'P_L', 'P_T', 'P_B', 'P_O', 'P_R', 'P_D', 'P_Z'
+]
+PAPI_POS_COLS = ['P_C', 'P_F', 'P_W', 'P_N', 'P_G', 'P_A', 'P_P', 'P_I', 'P_V']
+PAPI_NEG_COLS = ['P_S', 'P_X', 'P_E', 'P_K', 'P_L', 'P_T']
+MBTI_COLS = ['M_E', 'M_I', 'M_S', 'M_N', 'M_T', 'M_F', 'M_J', 'M_P']
+KRAEPELIN_COLS = ['K_C', 'K_T', 'K_A1', 'K_A2', 'K_H']
+KRAEPELIN_WEIGHTS = [0.25, 0.25, 0.125, 0.125, 0.25]
+DISC_COLS = ['D_D', 'D_I', 'D_S', 'D_C']
+
+# Bobot 5 kriteria (semua = 0.2) & parameter strategi v VIKOR. Satu-satunya
+# salinan: dipakai semua metode (VIKOR, ELECTRE, graf, aproksimasi, SAW,
+# TOPSIS, sensitivitas) dan dicatat di kunci result_cache (RESULT_PARAMS)
+WEIGHTS = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
+V = 0.5
+
+# Statistik global kandidat yang memengaruhi fitur: threshold IST
+# (persentil ke-75 std_dev) serta min/max tiap kolom DISC
+CandidateStats = namedtuple('CandidateStats', ['ist_threshold', 'disc_min', 'disc_max'])
+
+# Fitur kandidat yang tidak bergantung pada posisi pekerjaan
+CandidateFeatures = namedtuple('CandidateFeatures', [
+    'version', 'row_hashes', 'std_dev', 'ist', 'kraepelin',
+    'papi_pos', 'papi_neg', 'disc_minmax', 'stats'
+])
+
+# Proyeksi linear semua posisi pekerjaan. matrix berbentuk
+# (fitur PAPI/MBTI x (pekerjaan * 2)), disc_weights berbentuk (4 x pekerjaan),
+# context_cols berisi kolom PAPI context tiap pekerjaan.
+JobProjection = namedtuple('JobProjection', ['job_names', 'features', 'matrix', 'disc_weights', 'context_cols'])
+
+# Hasil agregasi semua pekerjaan: tensor (pekerjaan x kandidat x 5 kriteria)
+AllJobsAggregate = namedtuple('AllJobsAggregate', ['names', 'job_names', 'criteria', 'tensor'])
 
 def prep_dm(data, criteria):
     """
@@ -9,7 +56,259 @@ def prep_dm(data, criteria):
     alternatives = data['NAMA'].tolist()
     return matrix, alternatives
 
-def agg_to_5(data, job_filter_row):
+# ========== CACHE FITUR KANDIDAT (TIDAK BERGANTUNG PEKERJAAN) ========== #
+
+def _row_hashes(data):
+    """
+    Hash per baris (termasuk index) sebagai dasar versi dataset.
+    """
+    return pd.util.hash_pandas_object(data, index=True).to_numpy()
+
+def _version_of(row_hashes):
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+def dataset_version(data, source=None):
+    """
+    Versi dataset kandidat: hash isi seluruh baris & index.
+    Hash diingat feature_cache per source / objek data (lihat FeatureCache.version),
+    sehingga pemanggilan berulang tidak meng-hash ulang seluruh frame.
+    """
+    return feature_cache.version(data, source)
+
+def _signed(values):
+    """
+    Kolom bilangan bulat tak bertanda (snapshot uint8/uint16) diubah ke int64
+    sebelum dikurangkan, agar selisih negatif tidak wrap-around.
+    """
+    if values.dtype.kind == 'u':
+        return values.astype(np.int64)
+    return values
+
+def candidate_features(data, row_hashes=None):
+    """
+    Menghitung fitur kandidat yang tidak bergantung pada posisi pekerjaan.
+    row_hashes: hash per baris yang sudah dihitung (None = hitung di sini).
+    
+    Returns:
+    - CandidateFeatures
+    """
+    if row_hashes is None:
+        row_hashes = _row_hashes(data)
+
+    # IST: standar deviasi 9 sub-kriteria & threshold persentil ke-75
+    std_dev = data[IST_COLS].std(axis=1)
+    ist_threshold = std_dev.quantile(0.75)
+
+    # DISC: min & max per kolom
+    disc = data[DISC_COLS]
+    stats = CandidateStats(ist_threshold, disc.min(), disc.max())
+
+    return features_with_stats(data, stats, std_dev, row_hashes)
+
+def features_with_stats(data, stats, std_dev=None, row_hashes=None):
+    """
+    Fitur kandidat dengan statistik global (threshold IST, min/max DISC) yang
+    sudah diketahui, mis. dari seluruh file pada agregasi streaming.
+    Tanpa row_hashes, version & row_hashes bernilai None.
+    
+    Returns:
+    - CandidateFeatures
+    """
+    if std_dev is None:
+        std_dev = data[IST_COLS].std(axis=1)
+    ist = data['IQ'].where(std_dev < stats.ist_threshold, data['IQ'] * 0.9)
+
+    # Kraepelin & PAPI (atribut positif / negatif)
+    kraepelin = data[KRAEPELIN_COLS].dot(KRAEPELIN_WEIGHTS)
+    papi_pos = _signed(data[PAPI_POS_COLS].sum(axis=1))
+    papi_neg = _signed(data[PAPI_NEG_COLS].sum(axis=1))
+
+    # DISC: normalisasi min-max per kolom
+    disc = data[DISC_COLS]
+    disc_minmax = (disc - stats.disc_min) / (stats.disc_max - stats.disc_min)
+
+    return CandidateFeatures(
+        version=None if row_hashes is None else _version_of(row_hashes),
+        row_hashes=row_hashes,
+        std_dev=std_dev,
+        ist=ist,
+        kraepelin=kraepelin,
+        papi_pos=papi_pos,
+        papi_neg=papi_neg,
+        disc_minmax=disc_minmax,
+        stats=stats
+    )
+
+def extend_features(features, data, row_hashes=None):
+    """
+    Memperbarui fitur untuk data yang merupakan features + baris baru di akhir.
+    Fitur per baris hanya dihitung untuk baris baru; kolom yang bergantung pada
+    statistik global (threshold IST, min/max DISC) dihitung ulang untuk semua
+    baris hanya jika statistik tersebut berubah.
+    row_hashes: hash per baris yang sudah dihitung (None = hitung di sini).
+    """
+    n_old = len(features.row_hashes)
+    if row_hashes is None:
+        row_hashes = _row_hashes(data)
+    new_rows = data.iloc[n_old:]
+
+    # IST: std_dev baris lama tetap, threshold dihitung ulang
+    std_dev = pd.concat([features.std_dev, new_rows[IST_COLS].std(axis=1)])
+    ist_threshold = std_dev.quantile(0.75)
+    if ist_threshold == features.stats.ist_threshold:
+        new_ist = new_rows['IQ'].where(std_dev.iloc[n_old:] < ist_threshold, new_rows['IQ'] * 0.9)
+        ist = pd.concat([features.ist, new_ist])
+    else:
+        ist = data['IQ'].where(std_dev < ist_threshold, data['IQ'] * 0.9)
+
+    kraepelin = pd.concat([features.kraepelin, new_rows[KRAEPELIN_COLS].dot(KRAEPELIN_WEIGHTS)])
+    papi_pos = pd.concat([features.papi_pos, _signed(new_rows[PAPI_POS_COLS].sum(axis=1))])
+    papi_neg = pd.concat([features.papi_neg, _signed(new_rows[PAPI_NEG_COLS].sum(axis=1))])
+
+    # DISC: min/max digabung, normalisasi ulang semua baris hanya jika berubah
+    new_disc = new_rows[DISC_COLS]
+    disc_min = pd.concat([features.stats.disc_min, new_disc.min()], axis=1).min(axis=1)
+    disc_max = pd.concat([features.stats.disc_max, new_disc.max()], axis=1).max(axis=1)
+    if disc_min.equals(features.stats.disc_min) and disc_max.equals(features.stats.disc_max):
+        new_minmax = (new_disc - disc_min) / (disc_max - disc_min)
+        disc_minmax = pd.concat([features.disc_minmax, new_minmax])
+    else:
+        disc = data[DISC_COLS]
+        disc_minmax = (disc - disc_min) / (disc_max - disc_min)
+
+    return CandidateFeatures(
+        version=_version_of(row_hashes),
+        row_hashes=row_hashes,
+        std_dev=std_dev,
+        ist=ist,
+        kraepelin=kraepelin,
+        papi_pos=papi_pos,
+        papi_neg=papi_neg,
+        disc_minmax=disc_minmax,
+        stats=CandidateStats(ist_threshold, disc_min, disc_max)
+    )
+
+class FeatureCache:
+    """
+    Cache fitur kandidat per versi dataset (LRU kecil, aman untuk banyak sesi).
+    Jika data baru adalah data lama + baris tambahan, fitur diperbarui dengan
+    extend_features alih-alih dihitung ulang dari awal.
+
+    Versi isi (hash seluruh frame) hanya dihitung jika belum diketahui. Lookup
+    memakai source jika diberikan (mis. storage.data_version() atau (mtime,
+    ukuran) snapshot), atau objek DataFrame yang sama (weakref); frame
+    dianggap tidak diubah in-place setelah di-hash.
+    """
+
+    def __init__(self, max_entries=4, max_versions=16):
+        self.max_entries = max_entries
+        self.max_versions = max_versions
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _known_version(self, data, source):
+        """
+        Versi yang sudah diketahui untuk source / objek data ini, atau None.
+        Dipanggil dengan self._lock terkunci.
+        """
+        if source is not None:
+            known = self._versions.get(('source', source))
+            if known is not None and known[1] == len(data):
+                self._versions.move_to_end(('source', source))
+                return known[0]
+            return None
+        known = self._versions.get(('frame', id(data)))
+        if known is not None and known[2]() is data:
+            self._versions.move_to_end(('frame', id(data)))
+            return known[0]
+        return None
+
+    def _remember(self, data, source, version):
+        """
+        Mencatat versi untuk source / objek data. Dipanggil dengan self._lock terkunci.
+        """
+        if source is not None:
+            self._versions[('source', source)] = (version, len(data))
+        else:
+            self._versions[('frame', id(data))] = (version, len(data), weakref.ref(data))
+        while len(self._versions) > self.max_versions:
+            self._versions.popitem(last=False)
+
+    def version(self, data, source=None):
+        """
+        Versi isi data (lihat dataset_version); di-hash hanya jika belum diketahui.
+
+        Parameters:
+        - data: DataFrame kandidat
+        - source: kunci sumber data yang berubah setiap data ditulis, mis.
+          storage.data_version() (None = dikenali per objek DataFrame)
+        """
+        with self._lock:
+            version = self._known_version(data, source)
+        if version is None:
+            version = _version_of(_row_hashes(data))
+            with self._lock:
+                self._remember(data, source, version)
+        return version
+
+    def get(self, data, source=None):
+        """
+        Fitur kandidat untuk data (source: lihat version).
+        """
+        with self._lock:
+            version = self._known_version(data, source)
+            if version is not None and version in self._entries:
+                self._entries.move_to_end(version)
+                self.hits += 1
+                return self._entries[version]
+
+        # 1. Miss: hash per baris (versi & pencarian prefix)
+        row_hashes = _row_hashes(data)
+        version = _version_of(row_hashes)
+
+        with self._lock:
+            self._remember(data, source, version)
+            if version in self._entries:
+                self._entries.move_to_end(version)
+                self.hits += 1
+                return self._entries[version]
+            self.misses += 1
+
+            # 2. Cari versi lama yang merupakan prefix dari data ini
+            base = None
+            for cached in reversed(self._entries.values()):
+                n_old = len(cached.row_hashes)
+                if n_old < len(row_hashes) and np.array_equal(cached.row_hashes, row_hashes[:n_old]):
+                    base = cached
+                    break
+
+        # 3. Perbarui dari versi lama, atau hitung dari awal
+        if base is not None:
+            features = extend_features(base, data, row_hashes)
+        else:
+            features = candidate_features(data, row_hashes)
+
+        with self._lock:
+            self._entries[version] = features
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return features
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+# Cache fitur bersama untuk seluruh proses
+feature_cache = FeatureCache()
+
+# ========== AGREGASI PER POSISI PEKERJAAN ========== #
+
+@traced('agg_to_5')
+def agg_to_5(data, job_filter_row, features=None):
     """
     Melakukan agregasi data, dari 47 kolom menjadi 5 kolom.
     Aturan:
@@ -18,30 +317,22 @@ def agg_to_5(data, job_filter_row):
     3. MBTI: Hitung berdasarkan preferensi MBTI yang dipilih.
     4. Kraepelin: Hitung berdasarkan bobot yang telah ditentukan -> fix [0.25, 0.25, 0.125, 0.125, 0.25].
     5. DISC: Normalisasi min-max untuk setiap komponen DISC, lalu hitung berdasarkan bobot yang diberikan.
+    
+    Fitur yang tidak bergantung pada pekerjaan (IST, Kraepelin, jumlah PAPI,
+    normalisasi DISC) diambil dari feature_cache jika features tidak diberikan.
     """
+    if features is None:
+        with stage('features', data=data):
+            features = feature_cache.get(data)
+
     result = pd.DataFrame()
     result["Nama"] = data["NAMA"]
 
     # ===== 1. IST =====
-    ist_cols = ['SE', 'WA', 'AN', 'GE', 'ME', 'RA', 'ZR', 'FA', 'WU']
-    iq_col = 'IQ'
-
-    # Hindari mengubah data asli
-    temp = data.copy()
-
-    # Hitung standar deviasi dari 9 sub-kriteria IST
-    temp['std_dev'] = temp[ist_cols].std(axis=1)
-
-    # Ambil threshold (persentil ke-75)
-    threshold = temp['std_dev'].quantile(0.75)
-
     # Jika std rendah -> pakai nilai IQ, kalau tinggi -> IQ * 0.9 (kena penalti)
-    result['IST'] = temp[iq_col].where(temp['std_dev'] < threshold, temp[iq_col] * 0.9)
+    result['IST'] = features.ist
 
     # ===== 2. PAPI Kostick =====
-    papi_pos = ['P_C', 'P_F', 'P_W', 'P_N', 'P_G', 'P_A', 'P_P', 'P_I', 'P_V']
-    papi_neg = ['P_S', 'P_X', 'P_E', 'P_K', 'P_L', 'P_T']
-
     # Ambil huruf dari kolom 'PAPI context' di job_filter_row
     context_letter = job_filter_row['PAPI context'].strip().upper()
     context_col = f'P_{context_letter}'
@@ -51,39 +342,148 @@ def agg_to_5(data, job_filter_row):
         raise ValueError(f"Kolom kontekstual {context_col} tidak ditemukan di data kandidat.")
 
     # Hitung skor
-    daya_kerja = data[papi_pos].sum(axis=1) + data[context_col]
-    risiko = data[papi_neg].sum(axis=1)
+    daya_kerja = features.papi_pos + _signed(data[context_col])
+    risiko = features.papi_neg
 
     result['PAPI'] = daya_kerja - risiko
 
     # ===== 3. MBTI =====
-    mbti_code = ['M_I', 'M_E', 'M_S', 'M_N', 'M_T', 'M_F', 'M_J', 'M_P']
     mbti_selected = []
 
     for col in ['M', 'B', 'T', 'I_M']:
         mbti_selected.append(f"M_{job_filter_row[col]}")
 
-    result['MBTI'] = data[mbti_selected].sum(axis=1)
+    result['MBTI'] = _signed(data[mbti_selected].sum(axis=1))
 
     # ===== 4. Kraepelin =====
-    kraepelin_cols = ['K_C', 'K_T', 'K_A1', 'K_A2', 'K_H']
-    kraepelin_weights = [0.25, 0.25, 0.125, 0.125, 0.25]
-
-    kraepelin_agg = data[kraepelin_cols].dot(kraepelin_weights)
-    result['Kraepelin'] = kraepelin_agg
+    result['Kraepelin'] = features.kraepelin
 
     # ===== 5. DISC =====
-    disc_cols = ['D_D', 'D_I', 'D_S', 'D_C']
-
-    # Normalisasi min-max per kolom
-    disc_minmax = (data[disc_cols] - data[disc_cols].min()) / (data[disc_cols].max() - data[disc_cols].min())
-
     disc_weights = [
         job_filter_row['D'],
         job_filter_row['I_D'],
         job_filter_row['S'],
         job_filter_row['C']
     ]
-    result['DISC'] = disc_minmax.dot(disc_weights)
+    result['DISC'] = features.disc_minmax.dot(disc_weights)
+    
+    return result
+
+# ========== PROYEKSI LINEAR SEMUA POSISI PEKERJAAN ========== #
+
+def compile_job_projection(job_positions_df):
+    """
+    Mengompilasi semua baris job_positions menjadi satu matriks proyeksi.
+    Untuk setiap pekerjaan, PAPI dan MBTI (lihat agg_to_5) adalah kombinasi
+    linear dari kolom PAPI dan MBTI mentah, sedangkan DISC adalah kombinasi
+    linear dari kolom DISC ter-normalisasi min-max.
+    
+    Returns:
+    - JobProjection
+    """
+    features = PAPI_COLS + MBTI_COLS
+    feat_idx = {col: i for i, col in enumerate(features)}
+    n_jobs = len(job_positions_df)
+
+    # matrix: fitur PAPI/MBTI -> (pekerjaan x [PAPI, MBTI])
+    matrix = np.zeros((len(features), n_jobs, 2))
+    disc_weights = np.zeros((len(DISC_COLS), n_jobs))
+    context_cols = []
+
+    for j, (_, job_filter_row) in enumerate(job_positions_df.iterrows()):
+        # PAPI: atribut positif + PAPI context - atribut negatif
+        context_col = f"P_{job_filter_row['PAPI context'].strip().upper()}"
+        if context_col not in feat_idx:
+            raise ValueError(f"Kolom kontekstual {context_col} tidak ditemukan di data kandidat.")
+        context_cols.append(context_col)
+
+        for col in PAPI_POS_COLS:
+            matrix[feat_idx[col], j, 0] += 1
+        matrix[feat_idx[context_col], j, 0] += 1
+        for col in PAPI_NEG_COLS:
+            matrix[feat_idx[col], j, 0] -= 1
+
+        # MBTI: jumlah 4 preferensi yang dipilih
+        for col in ['M', 'B', 'T', 'I_M']:
+            mbti_col = f"M_{job_filter_row[col]}"
+            if mbti_col not in feat_idx:
+                raise ValueError(f"Kolom MBTI {mbti_col} tidak ditemukan di data kandidat.")
+            matrix[feat_idx[mbti_col], j, 1] += 1
+
+        # DISC: bobot D, I, S, C pada kolom DISC ter-normalisasi
+        disc_weights[:, j] = [
+            job_filter_row['D'],
+            job_filter_row['I_D'],
+            job_filter_row['S'],
+            job_filter_row['C']
+        ]
+
+    return JobProjection(
+        job_names=job_positions_df['Job Position'].tolist(),
+        features=features,
+        matrix=matrix.reshape(len(features), -1),
+        disc_weights=disc_weights,
+        context_cols=context_cols
+    )
+
+def agg_all_jobs(data, job_positions_df, projection=None, features=None):
+    """
+    Agregasi 47 kolom ke 5 kriteria untuk semua posisi pekerjaan sekaligus.
+    IST, Kraepelin dan normalisasi DISC diambil dari cache fitur, PAPI/MBTI semua
+    pekerjaan dihitung dengan satu perkalian matriks.
     
-    return result
\ No newline at end of file
+    Parameters:
+    - data: DataFrame kandidat
+    - job_positions_df: DataFrame posisi pekerjaan
+    - projection: JobProjection hasil compile_job_projection (opsional)
+    - features: CandidateFeatures (opsional, default dari feature_cache)
+    
+    Returns:
+    - AllJobsAggregate, tensor berbentuk (pekerjaan x kandidat x 5 kriteria)
+    """
+    if projection is None:
+        projection = compile_job_projection(job_positions_df)
+    n_jobs = len(projection.job_names)
+
+    # ===== Kriteria yang tidak bergantung pada pekerjaan =====
+    if features is None:
+        features = feature_cache.get(data)
+    ist = features.ist.to_numpy(dtype=float)
+    kraepelin = features.kraepelin.to_numpy(dtype=float)
+    disc_minmax = features.disc_minmax.to_numpy(dtype=float)
+
+    # ===== PAPI & MBTI semua pekerjaan: satu perkalian matriks =====
+    # Penjumlahan PAPI/MBTI di agg_to_5 mengabaikan NaN, jadi NaN diisi 0
+    raw = np.nan_to_num(data[projection.features].to_numpy(dtype=float), nan=0.0)
+    projected = (raw @ projection.matrix).reshape(len(data), n_jobs, 2)
+
+    # NaN pada kolom PAPI context tetap menghasilkan NaN
+    context = data[projection.context_cols].to_numpy(dtype=float)
+    projected[:, :, 0][np.isnan(context)] = np.nan
+
+    tensor = np.empty((n_jobs, len(data), len(CRITERIA)))
+    tensor[:, :, 0] = ist
+    tensor[:, :, 1] = projected[:, :, 0].T
+    tensor[:, :, 2] = projected[:, :, 1].T
+    tensor[:, :, 3] = kraepelin
+
+    # ===== DISC: perkalian matriks-vektor yang sama seperti di agg_to_5 =====
+    # agar pembulatan floating point (dan ranking) identik
+    for j in range(n_jobs):
+        tensor[j, :, 4] = disc_minmax.dot(projection.disc_weights[:, j])
+
+    return AllJobsAggregate(
+        names=data['NAMA'].tolist(),
+        job_names=projection.job_names,
+        criteria=list(CRITERIA),
+        tensor=tensor
+    )
+
+def agg_frame(aggregate, job_index):
+    """
+    DataFrame 5 kriteria untuk satu pekerjaan dari AllJobsAggregate,
+    dengan kolom yang sama seperti keluaran agg_to_5.
+    """
+    result = pd.DataFrame(aggregate.tensor[job_index], columns=aggregate.criteria)
+    result.insert(0, 'Nama', aggregate.names)
+    return result
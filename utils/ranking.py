@@ -0,0 +1,87 @@
+# ========== SELEKSI TOP-K ========== #
+# Seleksi parsial k kandidat terbaik tanpa mengurutkan seluruh skor.
+# Urutan kandidat dengan skor sama selalu deterministik: indeks asli terkecil
+# lebih dulu. NaN dianggap skor terburuk.
+
+import heapq
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+def top_k_indices(scores, k, descending=False):
+    """
+    Indeks k skor terbaik (terkecil, atau terbesar jika descending) dalam O(n + k log k).
+
+    Parameters:
+    - scores: array skor 1-D
+    - k: jumlah kandidat yang diambil
+    - descending: True jika skor lebih besar lebih baik
+
+    Returns:
+    - array indeks terurut dari skor terbaik
+    """
+    key = np.asarray(scores, dtype=float)
+    if descending:
+        key = -key
+    n = len(key)
+    k = max(0, min(k, n))
+
+    if k < n:
+        # Nilai ke-k (partition menempatkan NaN di akhir), lalu ambil semua
+        # yang lebih baik dan yang sama dengan indeks terkecil lebih dulu
+        kth = np.partition(key, k - 1)[k - 1] if k > 0 else -np.inf
+        if np.isnan(kth):
+            better, tie = ~np.isnan(key), np.isnan(key)
+        else:
+            better, tie = key < kth, key == kth
+        better_idx = np.flatnonzero(better)
+        idx = np.concatenate([better_idx, np.flatnonzero(tie)[:k - len(better_idx)]])
+    else:
+        idx = np.arange(n)
+
+    # lexsort: kunci terakhir = kunci utama (NaN di akhir), indeks sebagai pemecah seri
+    return idx[np.lexsort((idx, key[idx]))]
+
+def _heap_key(score, index, descending):
+    # NaN tidak bisa dibandingkan -> diletakkan di akhir lewat flag
+    if np.isnan(score):
+        return (1, 0.0, index)
+    return (0, -score if descending else score, index)
+
+def merge_top_k(chunks, k, descending=False):
+    """
+    Menggabungkan top-k per chunk (mis. per blok baris file streaming) dengan heap.
+
+    Parameters:
+    - chunks: iterable (offset, skor chunk); offset = indeks global baris pertama chunk
+    - k: jumlah kandidat yang diambil
+
+    Returns:
+    - (indeks global, skor) k kandidat terbaik, terurut
+    """
+    best = []
+    for offset, scores in chunks:
+        scores = np.asarray(scores, dtype=float)
+        chunk_best = [
+            (_heap_key(scores[i], offset + int(i), descending), float(scores[i]))
+            for i in top_k_indices(scores, k, descending)
+        ]
+        # Kedua daftar sudah terurut -> cukup merge dan ambil k pertama
+        best = list(islice(heapq.merge(best, chunk_best), k))
+
+    indices = np.array([key[2] for key, _ in best], dtype=np.int64)
+    scores = np.array([score for _, score in best], dtype=float)
+    return indices, scores
+
+def top_k_frame(names, score_col, scores, indices):
+    """
+    DataFrame hasil ranking untuk kandidat terpilih saja (format sama dengan
+    calc_vikor / calc_electre, index = posisi asli kandidat).
+    """
+    results = pd.DataFrame({
+        'Nama': [names[i] for i in indices],
+        score_col: scores
+    }, index=indices)
+    results['Ranking'] = range(1, len(indices) + 1)
+    return results
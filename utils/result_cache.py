@@ -0,0 +1,129 @@
+# ========== CACHE HASIL RANKING (CONTENT-ADDRESSED, LRU) ========== #
+# Kunci cache = hash dari versi dataset kandidat, isi baris posisi pekerjaan,
+# metode & parameternya (bobot, v, top_k, ...). Data atau posisi yang berubah
+# otomatis menghasilkan kunci baru; invalidate() dipanggil oleh halaman input
+# data & posisi pekerjaan setelah menulis file agar entri lama langsung dibuang.
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if isinstance(value, pd.Series):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return str(value)
+
+def result_key(version, job_filter_row, method, params=None):
+    """
+    Kunci cache (hex SHA-1) untuk satu ranking.
+
+    Parameters:
+    - version: versi dataset kandidat (dataset_version / CandidateFeatures.version)
+    - job_filter_row: baris posisi pekerjaan (Series), yang di-hash adalah isinya
+    - method: nama metode, mis. 'vikor' atau 'electre'
+    - params: dict parameter metode (bobot, v, top_k, ...)
+
+    Returns:
+    - string hex
+    """
+    payload = {
+        'version': version,
+        'job': _jsonable(job_filter_row),
+        'method': method,
+        'params': params or {}
+    }
+    text = json.dumps(payload, sort_keys=True, default=_jsonable)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+class ResultCache:
+    """
+    Cache DataFrame hasil ranking untuk seluruh proses (dipakai bersama semua sesi).
+    Dibatasi jumlah entri dan total ukuran (byte); entri yang paling lama tidak
+    dipakai dibuang lebih dulu.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=64 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        DataFrame hasil (salinan dangkal) atau None jika tidak ada.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy(deep=False)
+
+    def put(self, key, frame):
+        size = _frame_bytes(frame)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            # Hasil yang lebih besar dari seluruh batas memori tidak disimpan
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (frame.copy(deep=False), size)
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.nbytes -= dropped
+                self.evictions += 1
+
+    def get_or_compute(self, version, job_filter_row, method, params, compute):
+        """
+        Mengambil hasil dari cache, atau menjalankan compute() lalu menyimpannya.
+        """
+        key = result_key(version, job_filter_row, method, params)
+        results = self.get(key)
+        if results is None:
+            results = compute()
+            self.put(key, results)
+        return results
+
+    def invalidate(self):
+        """
+        Membuang semua entri (dipanggil setelah data kandidat / posisi ditulis).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+# Cache hasil bersama untuk seluruh proses
+result_cache = ResultCache()
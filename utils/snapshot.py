@@ -0,0 +1,178 @@
+# ========== SNAPSHOT KOLOMNAR DATASET KANDIDAT ========== #
+# dataset.csv dikonversi sekali menjadi file .npy biner (kolom NAMA + matriks
+# nilai numerik column-major) yang dibuka dengan memory mapping. Snapshot hanya
+# dibangun ulang jika mtime/ukuran CSV berubah dan isi (hash) CSV berbeda.
+#
+# Semua skor mentah (IST & IQ <= 150, PAPI, MBTI 0-100, Kraepelin, DISC) muat di
+# uint8, sehingga matriks disimpan dengan tipe bilangan bulat terkecil yang cukup
+# (1 byte per nilai, bukan 8) dan DataFrame kandidat hanya view di atasnya.
+
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_FORMAT = 2
+
+# Snapshot yang sudah dibuka:
+# - names: array unicode nama kandidat (memory-mapped)
+# - values: matriks nilai numerik (kandidat x kolom), column-major, memory-mapped,
+#   bertipe uint8/uint16 jika semua nilai bilangan bulat dalam rentangnya
+# - columns: nama kolom numerik (urutan kolom values)
+# - col_index: dict nama kolom -> indeks kolom di values
+# - version: hash isi CSV sumber
+Snapshot = namedtuple('Snapshot', ['names', 'values', 'columns', 'col_index', 'version'])
+
+_lock = threading.Lock()
+_frames = {}
+
+def snapshot_dir(csv_path):
+    return f"{csv_path}.snapshot"
+
+def _file_signature(csv_path):
+    st = os.stat(csv_path)
+    return st.st_mtime_ns, st.st_size
+
+def _file_hash(csv_path):
+    h = hashlib.sha1()
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_meta(path, meta):
+    tmp = os.path.join(path, 'meta.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(path, 'meta.json'))
+
+def compact_dtype(values):
+    """
+    Tipe terkecil untuk matriks bilangan bulat: uint8 / uint16 jika semua nilai
+    non-negatif dan muat, selain itu tipe asalnya (int64, atau float64 jika ada NaN).
+    """
+    if values.dtype.kind not in 'iu' or values.size == 0:
+        return values.dtype
+    low, high = values.min(), values.max()
+    if low >= 0:
+        for dtype in (np.uint8, np.uint16):
+            if high <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+    return values.dtype
+
+def build_snapshot(csv_path, columns, csv_hash=None):
+    """
+    Membaca CSV satu kali dan menulis snapshot biner.
+    Kolom yang tidak ada di CSV diisi NaN (seperti load_data_kandidat).
+    Matriks disimpan dengan compact_dtype jika semua kolom bilangan bulat, selain itu float64.
+    """
+    signature = _file_signature(csv_path)
+    if csv_hash is None:
+        csv_hash = _file_hash(csv_path)
+
+    df = pd.read_csv(csv_path)
+    for col in columns:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    numeric_cols = columns[1:]
+    numeric = df[numeric_cols]
+    all_int = all(pd.api.types.is_integer_dtype(dt) for dt in numeric.dtypes)
+    values = numeric.to_numpy(dtype=np.int64 if all_int else np.float64)
+    values = np.asfortranarray(values.astype(compact_dtype(values), copy=False))
+    names = df[columns[0]].astype(str).to_numpy(dtype=str)
+
+    path = snapshot_dir(csv_path)
+    os.makedirs(path, exist_ok=True)
+    for fname, arr in [('values.npy', values), ('names.npy', names)]:
+        tmp = os.path.join(path, fname + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, arr)
+        os.replace(tmp, os.path.join(path, fname))
+
+    _write_meta(path, {
+        'format': SNAPSHOT_FORMAT,
+        'columns': list(columns),
+        'n_rows': len(df),
+        'csv_mtime_ns': signature[0],
+        'csv_size': signature[1],
+        'csv_hash': csv_hash
+    })
+
+def open_snapshot(csv_path, columns):
+    """
+    Membuka snapshot (memory-mapped), membangun ulang jika sudah kedaluwarsa.
+
+    Returns:
+    - Snapshot
+    """
+    path = snapshot_dir(csv_path)
+    signature = _file_signature(csv_path)
+    meta = _read_meta(path)
+
+    valid = (
+        meta is not None
+        and meta.get('format') == SNAPSHOT_FORMAT
+        and meta.get('columns') == list(columns)
+    )
+    if not valid:
+        build_snapshot(csv_path, columns)
+    elif (meta['csv_mtime_ns'], meta['csv_size']) != signature:
+        # mtime/ukuran berubah: bangun ulang hanya jika isinya memang berbeda
+        csv_hash = _file_hash(csv_path)
+        if csv_hash != meta['csv_hash']:
+            build_snapshot(csv_path, columns, csv_hash)
+        else:
+            meta['csv_mtime_ns'], meta['csv_size'] = signature
+            _write_meta(path, meta)
+    meta = _read_meta(path)
+
+    numeric_cols = list(columns[1:])
+    return Snapshot(
+        names=np.load(os.path.join(path, 'names.npy'), mmap_mode='r'),
+        values=np.load(os.path.join(path, 'values.npy'), mmap_mode='r'),
+        columns=numeric_cols,
+        col_index={col: i for i, col in enumerate(numeric_cols)},
+        version=meta['csv_hash']
+    )
+
+def snapshot_frame(snapshot, columns):
+    """
+    DataFrame kandidat dari snapshot. Kolom numerik adalah view tanpa salinan
+    atas matriks memory-mapped; hanya kolom NAMA yang dikonversi ke objek.
+    """
+    frame = pd.DataFrame(snapshot.values, columns=snapshot.columns, copy=False)
+    frame.insert(0, columns[0], snapshot.names.tolist())
+    return frame
+
+def load_candidates(csv_path, columns):
+    """
+    DataFrame kandidat dari snapshot, di-cache per proses selama mtime/ukuran CSV sama.
+    Setiap pemanggilan hanya melakukan satu os.stat jika CSV tidak berubah.
+    """
+    key = os.path.abspath(csv_path)
+    signature = _file_signature(csv_path)
+
+    with _lock:
+        cached = _frames.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        frame = snapshot_frame(open_snapshot(csv_path, columns), columns)
+        _frames[key] = (signature, frame)
+        return frame
+
+def clear_cache():
+    with _lock:
+        _frames.clear()
@@ -0,0 +1,316 @@
+# ========== PENYIMPANAN DATA KANDIDAT & POSISI PEKERJAAN ========== #
+# Dua backend dengan method yang sama:
+# - CsvStorage (default): dataset.csv & job_positions.csv seperti sebelumnya
+# - SQLiteStorage: satu file SQLite mode WAL; penulisan dalam transaksi
+#   (BEGIN IMMEDIATE) sehingga aman untuk beberapa sesi Streamlit sekaligus,
+#   penambahan baris O(1), dan penghitung data_version yang naik setiap ada
+#   penulisan (dipakai sebagai kunci cache data kandidat).
+#
+# Backend dipilih dengan environment variable MCDM_STORAGE=csv|sqlite dan
+# MCDM_SQLITE_PATH (default mcdm.sqlite3). CSV tetap bisa diimpor/diekspor
+# (jalankan dari root repo):
+#   python -m utils.storage import --db mcdm.sqlite3 dataset.csv job_positions.csv
+#   python -m utils.storage export --db mcdm.sqlite3 dataset.csv job_positions.csv
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.loader import (
+    CSV_COLUMNS_KANDIDAT, EXPECTED_JOB_COLUMNS, CANDIDATES_CSV_PATH, JOB_POSITIONS_CSV_PATH,
+    load_candidate_data, load_job_positions, default_job_positions, append_csv
+)
+from utils.snapshot import clear_cache, compact_dtype
+
+BACKENDS = ('csv', 'sqlite')
+DEFAULT_SQLITE_PATH = 'mcdm.sqlite3'
+
+# Kolom posisi pekerjaan bertipe teks (sisanya bobot DISC, REAL)
+_JOB_TEXT_COLUMNS = ['Job Position', 'PAPI context', 'M', 'B', 'T', 'I_M']
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+class CsvStorage:
+    """
+    Backend file CSV (perilaku asli aplikasi).
+    """
+
+    backend = 'csv'
+
+    def __init__(self, candidates_path=CANDIDATES_CSV_PATH, jobs_path=JOB_POSITIONS_CSV_PATH):
+        self.candidates_path = candidates_path
+        self.jobs_path = jobs_path
+
+    def data_version(self):
+        """
+        Versi data: (mtime, ukuran) kedua file; berubah setiap file ditulis.
+        """
+        signature = []
+        for path in (self.candidates_path, self.jobs_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def load_candidates(self):
+        return load_candidate_data(self.candidates_path)
+
+    def append_candidates(self, rows):
+        return append_csv(rows, self.candidates_path, CSV_COLUMNS_KANDIDAT)
+
+    def load_job_positions(self):
+        return load_job_positions(self.jobs_path)
+
+    def add_job_position(self, row_df):
+        """
+        Menambahkan satu posisi pekerjaan (satu baris di akhir file, tanpa menulis ulang).
+        """
+        return append_csv(row_df, self.jobs_path, EXPECTED_JOB_COLUMNS)
+
+    def clear_cache(self):
+        clear_cache()
+
+class SQLiteStorage:
+    """
+    Backend SQLite (WAL). Satu koneksi per thread; setiap penulisan adalah satu
+    transaksi yang juga menaikkan data_version.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._cached = None  # (data_version, DataFrame kandidat)
+        self._create_schema()
+
+    # ---------- Koneksi & transaksi ---------- #
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+        return conn
+
+    def _write(self, func):
+        """
+        Menjalankan func(conn) dalam satu transaksi tulis dan menaikkan data_version.
+        BEGIN IMMEDIATE mengambil lock tulis di awal, jadi penulis lain menunggu
+        (busy_timeout) alih-alih gagal di tengah transaksi.
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = func(conn)
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return result
+
+    def _create_schema(self):
+        score_cols = ', '.join(f"{_quote(col)} INTEGER" for col in CSV_COLUMNS_KANDIDAT[1:])
+        job_cols = ', '.join(
+            f"{_quote(col)} {'TEXT' if col in _JOB_TEXT_COLUMNS else 'REAL'}"
+            for col in EXPECTED_JOB_COLUMNS[1:]
+        )
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS candidates "
+                         f"(id INTEGER PRIMARY KEY, NAMA TEXT NOT NULL, {score_cols})")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_nama ON candidates (NAMA)")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS job_positions "
+                         f"(id INTEGER PRIMARY KEY, \"Job Position\" TEXT NOT NULL UNIQUE, {job_cols})")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def data_version(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        return row[0]
+
+    def is_empty(self):
+        conn = self._conn()
+        return (conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0] == 0
+                and conn.execute("SELECT COUNT(*) FROM job_positions").fetchone()[0] == 0)
+
+    # ---------- Kandidat ---------- #
+
+    def _insert_candidates(self, conn, rows):
+        columns = ', '.join(_quote(col) for col in CSV_COLUMNS_KANDIDAT)
+        marks = ', '.join('?' * len(CSV_COLUMNS_KANDIDAT))
+        frame = rows[CSV_COLUMNS_KANDIDAT].astype(object).where(rows[CSV_COLUMNS_KANDIDAT].notna(), None)
+        conn.executemany(f"INSERT INTO candidates ({columns}) VALUES ({marks})",
+                         frame.itertuples(index=False, name=None))
+        return len(rows)
+
+    def append_candidates(self, rows):
+        if rows.empty:
+            return 0
+        return self._write(lambda conn: self._insert_candidates(conn, rows))
+
+    def load_candidates(self):
+        """
+        DataFrame kandidat (format sama dengan load_candidate_data: kolom numerik
+        satu matriks column-major bertipe compact_dtype), di-cache per data_version.
+        """
+        version = self.data_version()
+        with self._cache_lock:
+            if self._cached is not None and self._cached[0] == version:
+                return self._cached[1]
+
+            columns = ', '.join(_quote(col) for col in CSV_COLUMNS_KANDIDAT)
+            df = pd.read_sql_query(f"SELECT {columns} FROM candidates ORDER BY id", self._conn())
+            numeric = df[CSV_COLUMNS_KANDIDAT[1:]]
+            all_int = all(pd.api.types.is_integer_dtype(dt) for dt in numeric.dtypes)
+            values = numeric.to_numpy(dtype=np.int64 if all_int else np.float64)
+            values = np.asfortranarray(values.astype(compact_dtype(values), copy=False))
+
+            frame = pd.DataFrame(values, columns=CSV_COLUMNS_KANDIDAT[1:], copy=False)
+            frame.insert(0, 'NAMA', df['NAMA'].astype(str).tolist())
+            self._cached = (version, frame)
+            return frame
+
+    # ---------- Posisi pekerjaan ---------- #
+
+    def _insert_jobs(self, conn, rows):
+        columns = ', '.join(_quote(col) for col in EXPECTED_JOB_COLUMNS)
+        marks = ', '.join('?' * len(EXPECTED_JOB_COLUMNS))
+        frame = rows[EXPECTED_JOB_COLUMNS].astype(object).where(rows[EXPECTED_JOB_COLUMNS].notna(), None)
+        try:
+            conn.executemany(f"INSERT INTO job_positions ({columns}) VALUES ({marks})",
+                             frame.itertuples(index=False, name=None))
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Posisi pekerjaan sudah ada: {e}")
+        return len(rows)
+
+    def load_job_positions(self):
+        """
+        Data posisi pekerjaan. Melempar ValueError jika belum ada posisi
+        (sama seperti load_job_positions untuk file kosong).
+        """
+        columns = ', '.join(_quote(col) for col in EXPECTED_JOB_COLUMNS)
+        df = pd.read_sql_query(f"SELECT {columns} FROM job_positions ORDER BY id", self._conn())
+        if df.empty:
+            raise ValueError(f"Database {self.path} belum berisi posisi pekerjaan.")
+        return df
+
+    def add_job_position(self, row_df):
+        return self._write(lambda conn: self._insert_jobs(conn, row_df))
+
+    # ---------- Impor / ekspor CSV ---------- #
+
+    def import_csv(self, candidates_path=None, jobs_path=None):
+        """
+        Mengganti isi tabel dengan isi file CSV (satu transaksi).
+        File yang tidak diberikan (None) tidak mengubah tabelnya.
+        """
+        candidates = None if candidates_path is None else pd.read_csv(candidates_path)
+        if candidates is not None:
+            missing = [col for col in CSV_COLUMNS_KANDIDAT if col not in candidates.columns]
+            if missing:
+                raise ValueError(f"File {candidates_path} tidak memiliki kolom: {missing}")
+        jobs = None if jobs_path is None else load_job_positions(jobs_path)
+
+        def replace(conn):
+            if candidates is not None:
+                conn.execute("DELETE FROM candidates")
+                self._insert_candidates(conn, candidates)
+            if jobs is not None:
+                conn.execute("DELETE FROM job_positions")
+                self._insert_jobs(conn, jobs)
+
+        self._write(replace)
+
+    def export_csv(self, candidates_path=None, jobs_path=None):
+        """
+        Menulis tabel ke file CSV (ditulis ke file sementara lalu diganti atomik).
+        """
+        exports = []
+        if candidates_path is not None:
+            exports.append((candidates_path, self.load_candidates()))
+        if jobs_path is not None:
+            exports.append((jobs_path, self.load_job_positions()))
+        for path, df in exports:
+            tmp = f"{path}.tmp"
+            df.to_csv(tmp, index=False)
+            os.replace(tmp, path)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cached = None
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+def open_storage(backend=None, sqlite_path=None):
+    """
+    Backend penyimpanan bersama untuk proses ini (default dari MCDM_STORAGE).
+    Database SQLite yang baru dibuat diisi dari dataset.csv & job_positions.csv
+    jika file tersebut ada, atau posisi pekerjaan default.
+    """
+    if backend is None:
+        backend = os.environ.get('MCDM_STORAGE', 'csv').strip().lower() or 'csv'
+    if backend not in BACKENDS:
+        raise ValueError(f"MCDM_STORAGE harus salah satu dari {BACKENDS}, bukan {backend!r}.")
+    if sqlite_path is None:
+        sqlite_path = os.environ.get('MCDM_SQLITE_PATH', DEFAULT_SQLITE_PATH)
+
+    key = (backend, os.path.abspath(sqlite_path) if backend == 'sqlite' else None)
+    with _storages_lock:
+        if key in _storages:
+            return _storages[key]
+        if backend == 'csv':
+            storage = CsvStorage()
+        else:
+            storage = SQLiteStorage(sqlite_path)
+            if storage.is_empty():
+                if os.path.exists(CANDIDATES_CSV_PATH):
+                    storage.import_csv(candidates_path=CANDIDATES_CSV_PATH)
+                try:
+                    storage.import_csv(jobs_path=JOB_POSITIONS_CSV_PATH)
+                except (FileNotFoundError, ValueError):
+                    # File posisi tidak ada / rusak: database diisi default, file tidak disentuh
+                    storage.add_job_position(default_job_positions())
+        _storages[key] = storage
+        return storage
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Impor/ekspor CSV untuk database SQLite MCDM.')
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('candidates', help='file CSV data kandidat')
+    parser.add_argument('jobs', help='file CSV posisi pekerjaan')
+    parser.add_argument('--db', default=DEFAULT_SQLITE_PATH, help='file database SQLite')
+    args = parser.parse_args(argv)
+
+    storage = SQLiteStorage(args.db)
+    try:
+        if args.action == 'import':
+            storage.import_csv(args.candidates, args.jobs)
+        else:
+            storage.export_csv(args.candidates, args.jobs)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"storage.py: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# ========== AGREGASI STREAMING (FILE KANDIDAT LEBIH BESAR DARI RAM) ========== #
+# Dua pass atas dataset.csv per chunk:
+# 1. scan_stats: statistik global (persentil ke-75 std_dev IST dengan quantile
+#    sketch, min/max tiap kolom DISC secara eksak) dan jumlah baris.
+# 2. iter_aggregate / write_aggregate: matriks 5 kriteria per chunk, dikirim ke
+#    pemanggil atau ditulis ke file .npy (memory-mapped) di disk.
+
+import math
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from utils.preprocess import (
+    agg_to_5, features_with_stats, CandidateStats, CRITERIA,
+    IST_COLS, PAPI_COLS, MBTI_COLS, KRAEPELIN_COLS, DISC_COLS
+)
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_EPS = 0.001
+
+# Kolom mentah yang dibutuhkan agregasi
+RAW_COLS = ['NAMA', 'IQ'] + IST_COLS + PAPI_COLS + MBTI_COLS + KRAEPELIN_COLS + DISC_COLS
+
+# Hasil pass pertama:
+# - n_rows: jumlah kandidat
+# - name_len: panjang nama terpanjang (untuk array nama di disk)
+# - stats: CandidateStats (threshold IST dari sketch, min/max DISC eksak)
+# - rank_error: batas galat rank threshold IST (fraksi dari n, 0 = eksak)
+StreamStats = namedtuple('StreamStats', ['n_rows', 'name_len', 'stats', 'rank_error'])
+
+# Hasil pass kedua yang ditulis ke disk:
+# - names: array nama kandidat (memory-mapped)
+# - matrix: matriks (kandidat x 5 kriteria) (memory-mapped)
+# - col_min / col_max: nilai min / max tiap kriteria (NaN jika kolom memuat NaN)
+# - stats: StreamStats dari pass pertama
+StreamAggregate = namedtuple('StreamAggregate', ['names', 'matrix', 'col_min', 'col_max', 'stats'])
+
+class QuantileSketch:
+    """
+    Quantile sketch deterministik (compactor bertingkat) dengan memori
+    O(log(n) / eps). Setiap level menampung item berbobot 2^level; jika level
+    penuh, isinya diurutkan dan separuh item (posisi ganjil/genap bergantian)
+    dinaikkan ke level berikutnya.
+
+    Galat rank quantile paling besar eps * n untuk n <= max_rows. Selama belum
+    ada compaction (n < kapasitas level), quantile sama persis dengan
+    pandas Series.quantile (interpolasi linear).
+    """
+
+    def __init__(self, eps=DEFAULT_EPS, max_rows=2 ** 34):
+        self.eps = eps
+        # Tiap level melakukan <= n / (k * 2^h) compaction dengan galat <= 2^h,
+        # jadi galat total <= n * jumlah_level / k
+        n_levels = math.ceil(math.log2(max_rows))
+        self.capacity = 2 * math.ceil(n_levels / eps / 2)
+        self.n = 0
+        self.error = 0
+        self._levels = [np.empty(0)]
+        self._offsets = [0]
+
+    def update(self, values):
+        """
+        Menambahkan nilai (NaN diabaikan seperti pada pandas).
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            buf = self._levels[h]
+            if len(buf) < self.capacity:
+                h += 1
+                continue
+            buf = np.sort(buf)
+            even = len(buf) - len(buf) % 2
+            promoted = buf[self._offsets[h]:even:2]
+            self._offsets[h] ^= 1
+            self.error += 2 ** h
+            self._levels[h] = buf[even:]
+
+            if h + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+                self._offsets.append(0)
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def rank_error(self):
+        """
+        Batas galat rank sebagai fraksi dari n (0 jika quantile masih eksak).
+        """
+        return self.error / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        if self.error == 0:
+            return np.quantile(self._levels[0], q)
+
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(buf), 2 ** h) for h, buf in enumerate(self._levels)])
+        order = np.argsort(values, kind='stable')
+        cum_weights = np.cumsum(weights[order])
+        idx = np.searchsorted(cum_weights, q * (self.n - 1), side='right')
+        return values[order[min(idx, len(order) - 1)]]
+
+def read_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Membaca kolom RAW_COLS dari CSV per chunk; kolom yang tidak ada diisi NaN.
+    chunksize dibulatkan ke kelipatan 8: batas chunk yang tidak sejajar membuat
+    perkalian matriks-vektor (DISC) berbeda pembulatan dengan agg_to_5 penuh.
+    Pembulatan BLAS juga bergantung pada layout memori, jadi chunk pendek
+    (biasanya chunk terakhir) masih bisa berbeda sekitar 1 ulp pada kolom DISC.
+    """
+    chunksize = -(-chunksize // 8) * 8
+    reader = pd.read_csv(csv_path, usecols=lambda col: col in RAW_COLS, chunksize=chunksize)
+    for chunk in reader:
+        for col in RAW_COLS:
+            if col not in chunk.columns:
+                chunk[col] = np.nan
+        yield chunk
+
+def scan_stats(csv_path, eps=DEFAULT_EPS, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Pass pertama: statistik global kandidat tanpa memuat seluruh file.
+
+    Parameters:
+    - csv_path: path file kandidat
+    - eps: batas galat rank quantile sketch untuk threshold IST
+    - chunksize: jumlah baris per chunk
+
+    Returns:
+    - StreamStats
+    """
+    sketch = QuantileSketch(eps)
+    disc_min = disc_max = None
+    n_rows = 0
+    name_len = 1
+
+    for chunk in read_chunks(csv_path, chunksize):
+        n_rows += len(chunk)
+        name_len = max(name_len, int(chunk['NAMA'].astype(str).str.len().max()))
+
+        # 1. IST: std_dev per baris masuk ke sketch
+        sketch.update(chunk[IST_COLS].std(axis=1).to_numpy())
+
+        # 2. DISC: min/max per kolom digabung antar chunk
+        disc = chunk[DISC_COLS]
+        if disc_min is None:
+            disc_min, disc_max = disc.min(), disc.max()
+        else:
+            disc_min = pd.concat([disc_min, disc.min()], axis=1).min(axis=1)
+            disc_max = pd.concat([disc_max, disc.max()], axis=1).max(axis=1)
+
+    if disc_min is None:
+        disc_min = disc_max = pd.Series(np.nan, index=DISC_COLS)
+
+    return StreamStats(
+        n_rows=n_rows,
+        name_len=name_len,
+        stats=CandidateStats(sketch.quantile(0.75), disc_min, disc_max),
+        rank_error=sketch.rank_error
+    )
+
+def iter_aggregate(csv_path, job_filter_row, stream_stats, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Pass kedua: agregasi 5 kriteria per chunk dengan statistik global dari scan_stats.
+
+    Returns:
+    - generator (nama kandidat, matriks chunk x 5 kriteria)
+    """
+    for chunk in read_chunks(csv_path, chunksize):
+        features = features_with_stats(chunk, stream_stats.stats)
+        agg = agg_to_5(chunk, job_filter_row, features)
+        yield chunk['NAMA'].astype(str).to_numpy(), agg[CRITERIA].to_numpy(dtype=float)
+
+def write_aggregate(csv_path, job_filter_row, out_dir, stream_stats=None,
+                    eps=DEFAULT_EPS, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Menulis matriks 5 kriteria seluruh kandidat ke out_dir/criteria.npy dan
+    nama kandidat ke out_dir/names.npy tanpa memuat seluruh file ke memori.
+
+    Parameters:
+    - csv_path: path file kandidat
+    - job_filter_row: baris posisi pekerjaan (seperti agg_to_5)
+    - out_dir: direktori keluaran
+    - stream_stats: hasil scan_stats (opsional, dihitung jika None)
+
+    Returns:
+    - StreamAggregate
+    """
+    if stream_stats is None:
+        stream_stats = scan_stats(csv_path, eps, chunksize)
+    n, k = stream_stats.n_rows, len(CRITERIA)
+
+    os.makedirs(out_dir, exist_ok=True)
+    names = np.lib.format.open_memmap(
+        os.path.join(out_dir, 'names.npy'), mode='w+', dtype=f'<U{stream_stats.name_len}', shape=(n,)
+    )
+    matrix = np.lib.format.open_memmap(
+        os.path.join(out_dir, 'criteria.npy'), mode='w+', dtype=float, shape=(n, k)
+    )
+
+    col_min = np.full(k, np.inf)
+    col_max = np.full(k, -np.inf)
+    start = 0
+    for chunk_names, chunk_matrix in iter_aggregate(csv_path, job_filter_row, stream_stats, chunksize):
+        stop = start + len(chunk_names)
+        names[start:stop] = chunk_names
+        matrix[start:stop] = chunk_matrix
+        # NaN ikut terbawa seperti np.min / np.max pada matriks penuh
+        col_min = np.minimum(col_min, chunk_matrix.min(axis=0, initial=np.inf))
+        col_max = np.maximum(col_max, chunk_matrix.max(axis=0, initial=-np.inf))
+        start = stop
+
+    names.flush()
+    matrix.flush()
+    return StreamAggregate(names, matrix, col_min, col_max, stream_stats)
@@ -0,0 +1,165 @@
+# ========== TABEL BERHALAMAN (SERVER-SIDE) ========== #
+# Tabel besar (data kandidat, hasil agregasi, hasil ranking) tidak lagi dikirim
+# utuh ke st.dataframe. Yang diserialisasi setiap rerun hanya satu halaman:
+# kolom dipilih dulu (proyeksi), urutan baris dihitung sekali per kolom sort
+# (argsort, di-cache), lalu hanya baris halaman aktif yang diambil (iloc/take).
+# Penyorotan peringkat 1 dihitung untuk seluruh halaman sekaligus (np.where),
+# bukan satu panggilan Python per baris seperti style.apply(axis=1).
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+HIGHLIGHT_STYLE = "background-color: green"
+
+# Pilihan sort default: urutan asli DataFrame
+_NO_SORT = "(urutan asli)"
+
+# Satu halaman tabel:
+# - frame: DataFrame halaman aktif (hanya kolom yang dipilih)
+# - page: nomor halaman (mulai 1), sudah dibatasi ke 1..n_pages
+# - n_pages, n_rows: jumlah halaman & jumlah baris seluruh tabel
+# - start, stop: posisi baris halaman ini pada urutan yang dipakai
+TablePage = namedtuple('TablePage', ['frame', 'page', 'n_pages', 'n_rows', 'start', 'stop'])
+
+# Cache urutan sort: (versi isi tabel, kolom, arah) -> (frame, urutan posisi baris).
+# Versi = kunci result_cache / versi dataset yang diberikan pemanggil, sehingga
+# salinan frame yang sama (mis. dari result_cache.get) tetap memakai entri yang
+# sama. Tanpa versi, entri hanya berlaku untuk objek frame yang sama persis
+# (frame ikut disimpan agar id-nya tidak dipakai ulang objek lain).
+_MAX_ORDERS = 16
+_orders = OrderedDict()
+_orders_lock = threading.Lock()
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+def sort_order(df, column, ascending=True, version=None):
+    """
+    Posisi baris df jika diurutkan berdasarkan column (stabil, NaN di akhir).
+    Di-cache per versi isi tabel, sehingga pindah halaman tidak mengurutkan ulang.
+
+    Parameters:
+    - df: DataFrame sumber
+    - column: kolom pengurutan
+    - ascending: arah pengurutan
+    - version: kunci yang berubah jika isi df berubah (mis. kunci result_cache);
+      None = cache per objek df
+    """
+    key = (('id', id(df)) if version is None else ('version', version), column, ascending)
+    with _orders_lock:
+        cached = _orders.get(key)
+        if cached is not None and (version is not None or cached[0] is df) and len(cached[1]) == len(df):
+            _orders.move_to_end(key)
+            return cached[1]
+
+    values = pd.Series(df[column].to_numpy(), index=np.arange(len(df)))
+    order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+    with _orders_lock:
+        _orders[key] = (df, order)
+        while len(_orders) > _MAX_ORDERS:
+            _orders.popitem(last=False)
+    return order
+
+def page_slice(df, page=1, page_size=DEFAULT_PAGE_SIZE, columns=None, sort_by=None, ascending=True,
+               version=None):
+    """
+    Mengambil satu halaman df tanpa menyalin seluruh tabel.
+
+    Parameters:
+    - df: DataFrame sumber
+    - page: nomor halaman (mulai 1); di luar rentang dibatasi ke halaman pertama/terakhir
+    - page_size: jumlah baris per halaman
+    - columns: kolom yang ditampilkan (None = semua)
+    - sort_by: kolom pengurutan (None = urutan asli)
+    - ascending: arah pengurutan
+    - version: versi isi df untuk cache urutan (lihat sort_order)
+
+    Returns:
+    - TablePage
+    """
+    if page_size < 1:
+        raise ValueError("page_size harus >= 1.")
+    n_rows = len(df)
+    n_pages = page_count(n_rows, page_size)
+    page = min(max(1, int(page)), n_pages)
+    start = (page - 1) * page_size
+    stop = min(start + page_size, n_rows)
+
+    # 1. Proyeksi kolom, lalu 2. baris halaman aktif saja
+    projected = df if columns is None else df[list(columns)]
+    if sort_by is None:
+        frame = projected.iloc[start:stop]
+    else:
+        frame = projected.take(sort_order(df, sort_by, ascending, version)[start:stop])
+    return TablePage(frame, page, n_pages, n_rows, start, stop)
+
+def highlight_rank(frame, column='Ranking', value=1, style=HIGHLIGHT_STYLE):
+    """
+    Styler yang menyorot seluruh baris dengan frame[column] == value.
+    CSS dibuat untuk semua sel sekaligus (satu panggilan untuk seluruh frame).
+    """
+    def _styles(data):
+        match = (data[column] == value).to_numpy(dtype=bool)
+        css = np.where(match[:, np.newaxis], style, '')
+        return pd.DataFrame(np.broadcast_to(css, data.shape), index=data.index, columns=data.columns)
+
+    return frame.style.apply(_styles, axis=None)
+
+def render_table(df, key, highlight=None, page_size=DEFAULT_PAGE_SIZE, hide_index=False, version=None):
+    """
+    Menampilkan df sebagai tabel berhalaman di Streamlit.
+    Tabel yang muat dalam satu halaman ditampilkan langsung tanpa kontrol.
+
+    Parameters:
+    - df: DataFrame yang ditampilkan
+    - key: prefix key widget (unik per tabel)
+    - highlight: nama kolom peringkat; baris bernilai 1 disorot (None = tanpa sorot)
+    - page_size: ukuran halaman awal
+    - hide_index: sembunyikan index DataFrame
+    - version: versi isi df (mis. kunci result_cache) agar urutan sort tetap
+      di-cache walau df berupa salinan baru di setiap rerun
+    """
+    if len(df) <= min(PAGE_SIZES):
+        st.dataframe(highlight_rank(df, highlight) if highlight else df,
+                     use_container_width=True, hide_index=hide_index)
+        return
+
+    all_columns = [str(col) for col in df.columns]
+    ctl_cols, ctl_sort, ctl_order, ctl_size = st.columns([3, 2, 1, 1])
+    with ctl_cols:
+        shown = st.multiselect("Kolom (kosong = semua):", all_columns, key=f"{key}_columns")
+    with ctl_sort:
+        sort_by = st.selectbox("Urutkan:", [_NO_SORT] + all_columns, key=f"{key}_sort")
+    with ctl_order:
+        descending = st.toggle("Menurun", key=f"{key}_desc")
+    with ctl_size:
+        size = st.selectbox("Baris/halaman:", PAGE_SIZES,
+                            index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+                            key=f"{key}_size")
+
+    columns = [col for col in df.columns if str(col) in shown] if shown else None
+    # Kolom peringkat tetap ikut diambil agar sorotan bisa dihitung
+    if highlight and columns is not None and highlight not in columns:
+        columns.append(highlight)
+    n_pages = page_count(len(df), size)
+    # Halaman yang tersimpan bisa melebihi jumlah halaman setelah ukuran halaman diganti
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = st.number_input("Halaman:", min_value=1, max_value=n_pages,
+                           step=1, key=f"{key}_page")
+
+    table = page_slice(
+        df, page, size, columns,
+        sort_by=None if sort_by == _NO_SORT else df.columns[all_columns.index(sort_by)],
+        ascending=not descending, version=version
+    )
+    st.dataframe(highlight_rank(table.frame, highlight) if highlight else table.frame,
+                 use_container_width=True, hide_index=hide_index)
+    st.caption(f"Baris {table.start + 1}-{table.stop} dari {table.n_rows} · halaman {table.page}/{table.n_pages}")
@@ -2,16 +2,218 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import re
-from utils.preprocess import prep_dm, agg_to_5
-from methods.vikor import run_vikor
-from methods.electre import run_electre
+import io
+from contextlib import nullcontext
+from utils.preprocess import prep_dm, dataset_version
+from methods.incremental import IncrementalRanker
+from methods.sensitivity import run_vikor_sensitivity
+from methods.drilldown import method_key, candidate_ranks
+from methods.pipeline import METHODS, DEFAULT_METHODS, run_methods
+from methods.consensus import consensus_ranking
+from methods.outranking import (
+    run_electre_graph, strongly_connected_components, electre_kernel, transpose_bits,
+    out_degree, in_degree, edge_frame, save_graph
+)
+from utils import instrument
+from utils.result_cache import result_cache, result_key
+from utils.table_view import render_table
+from utils.name_index import name_index
+from utils.storage import open_storage
+
+# Jumlah run diagnostik terakhir yang disimpan di session_state
+MAX_DIAGNOSTIC_RUNS = 10
+
+def _keep_diagnostics(record):
+    # record = None jika instrumentasi nonaktif
+    if record is not None:
+        runs = st.session_state.setdefault("diagnostics_runs", [])
+        runs.append(record)
+        del runs[:-MAX_DIAGNOSTIC_RUNS]
+
+# Judul tabel hasil per metode
+_RESULT_TITLES = {'vikor': "🔍 Hasil VIKOR", 'electre': "📊 Hasil ELECTRE"}
+
+def _result_keys(methods, ranker, data, job_filter_row):
+    """
+    Kunci result_cache per metode untuk versi dataset & posisi pekerjaan saat ini.
+    """
+    version = ranker.features.version if ranker is not None else dataset_version(data)
+    return {method: method_key(version, job_filter_row, method) for method in methods}
+
+def _ranking_results(keys, ranker, data, job_filter_row, agg_data):
+    """
+    Hasil ranking beberapa metode (keys: hasil _result_keys) dari result_cache.
+    Metode yang belum ada dijalankan bersamaan lewat pipeline (tahap bersama
+    dihitung sekali).
+
+    Returns:
+    - dict {metode: DataFrame hasil ranking}
+    """
+    results = {method: result_cache.get(key) for method, key in keys.items()}
+
+    missing = [method for method, res in results.items() if res is None]
+    if missing:
+        # Setelah kandidat ditambahkan, VIKOR diambil dari state ranker inkremental
+        # (sudah diperbarui); selain itu semua metode memakai tahap bersama pipeline
+        overrides = {}
+        if ranker is not None and ranker.last_update is not None:
+            overrides = {'vikor': ranker.vikor_results}
+        computed = run_methods(
+            data, job_filter_row, missing, aggregated_data=agg_data,
+            overrides={method: func for method, func in overrides.items() if method in missing}
+        )
+        for method in missing:
+            result_cache.put(keys[method], computed[method])
+            results[method] = computed[method]
+    return results
+
+def render_consensus(methods, results, keys):
+    """
+    Konsensus peringkat (Borda, Copeland, Kemeny) & Kendall tau antar metode.
+    Dihitung ulang hanya jika kunci hasil metode berubah (disimpan di session_state).
+    """
+    with st.expander("🤝 Konsensus Peringkat"):
+        memo_key = tuple(keys[method] for method in methods)
+        memo = st.session_state.get("home_consensus")
+        if memo is None or memo[0] != memo_key:
+            labelled = {METHODS[method].label: results[method] for method in methods}
+            memo = (memo_key, consensus_ranking(labelled))
+            st.session_state["home_consensus"] = memo
+        consensus = memo[1]
+
+        st.write("Kesepakatan antar metode (Kendall tau-b, 1 = urutan sama persis):")
+        st.dataframe(consensus.agreement.round(3), use_container_width=True)
+        if not consensus.kemeny_converged:
+            st.caption(f"Local search Kemeny berhenti setelah {consensus.kemeny_passes} putaran.")
+        render_table(consensus.table, "home_table_consensus", highlight="Peringkat Konsensus", version=memo_key)
+
+# Batas jumlah sisi untuk unduhan CSV daftar sisi graf outranking
+_MAX_EDGE_EXPORT = 1_000_000
+
+def render_outranking_graph(key, data, job_filter_row, agg_data):
+    """
+    Graf outranking ELECTRE (relasi ter-pack): komponen terhubung kuat, kernel
+    ELECTRE I & ekspor graf. Dihitung saat tombol ditekan, disimpan di
+    session_state selama kunci hasil ELECTRE sama.
+    """
+    with st.expander("🕸️ Graf Outranking ELECTRE"):
+        memo = st.session_state.get("home_graph")
+        if memo is not None and memo[0] != key:
+            memo = None
+        if st.button("Analisis Graf", key="home_graph_run"):
+            graph = run_electre_graph(data, job_filter_row, agg_data)
+            transposed = transpose_bits(graph.bits, len(graph.names))
+            components = strongly_connected_components(graph, transposed)
+            kernel = electre_kernel(graph, components, transposed)
+            memo = (key, graph, components, kernel)
+            st.session_state["home_graph"] = memo
+        if memo is None:
+            st.caption("Tekan **Analisis Graf** untuk membangun graf outranking ELECTRE.")
+            return
+        _, graph, components, kernel = memo
+
+        wins = out_degree(graph)
+        n_edges = int(wins.sum())
+        st.write(
+            f"{len(graph.names)} kandidat, {n_edges} sisi outranking "
+            f"({graph.bits.nbytes / 2**20:.1f} MB ter-pack), "
+            f"{len(components.sizes)} komponen terhubung kuat (terbesar {int(components.sizes.max())} kandidat)."
+        )
+        members = np.flatnonzero(kernel)
+        st.write(f"Kernel ELECTRE I: {len(members)} kandidat")
+        kernel_df = pd.DataFrame({
+            'Nama': graph.names[members],
+            'Mengungguli': wins[members],
+            'Diungguli': in_degree(graph)[members],
+            'Komponen': components.labels[members]
+        }).sort_values('Mengungguli', ascending=False, kind='stable')
+        render_table(kernel_df, "home_table_kernel", hide_index=True, version=key)
+
+        # Isi unduhan dibuat saat tombol diklik (callable), bukan setiap rerun
+        def graph_bytes():
+            buffer = io.BytesIO()
+            save_graph(graph, buffer)
+            return buffer.getvalue()
+
+        st.download_button("Unduh Graf (.npz)", graph_bytes, "outranking.npz", key="home_graph_npz")
+        if n_edges <= _MAX_EDGE_EXPORT:
+            st.download_button(
+                "Unduh Daftar Sisi (CSV)", lambda: edge_frame(graph).to_csv(index=False).encode('utf-8'),
+                "outranking_edges.csv", mime="text/csv", key="home_graph_csv"
+            )
+        else:
+            st.caption(f"Daftar sisi terlalu besar untuk CSV (> {_MAX_EDGE_EXPORT} sisi); gunakan file .npz.")
+
+def _render_results(methods, results, keys):
+    """
+    Tabel hasil: VIKOR & ELECTRE berdampingan jika keduanya dijalankan,
+    metode tambahan di bawahnya. Kunci result_cache dipakai sebagai versi tabel
+    (cache urutan sort tetap berlaku walau hasil berupa salinan baru).
+    """
+    side_by_side = [method for method in DEFAULT_METHODS if method in methods]
+    columns = st.columns(len(side_by_side)) if len(side_by_side) > 1 else [st.container()] * len(side_by_side)
+    for method, column in zip(side_by_side, columns):
+        with column:
+            st.subheader(_RESULT_TITLES[method])
+            render_table(results[method], f"home_table_{method}", highlight="Ranking", version=keys[method])
+    for method in methods:
+        if method not in DEFAULT_METHODS:
+            st.subheader(f"📈 Hasil {METHODS[method].label}")
+            render_table(results[method], f"home_table_{method}", highlight="Ranking", version=keys[method])
+
+def render_candidate_search(data_kandidat, job_positions_df):
+    """
+    Pencarian kandidat berdasarkan (awalan) nama & peringkatnya di setiap posisi.
+    Peringkat VIKOR dihitung untuk posisi yang belum ada di cache; peringkat
+    ELECTRE hanya ditampilkan untuk posisi yang sudah pernah dijalankan.
+    """
+    with st.expander("🔎 Cari Kandidat"):
+        query = st.text_input("Nama atau awal nama kandidat:", key="home_search_name")
+        if not query.strip():
+            return
+        index = name_index(data_kandidat['NAMA'], open_storage().data_version())
+        matches = index.prefix(query, limit=50)
+        if not matches:
+            st.info("Tidak ada kandidat dengan nama tersebut.")
+            return
+        picked = st.selectbox(f"Kandidat ({len(matches)} ditemukan):", matches, key="home_search_pick")
+        positions = index.lookup(picked)
+        if len(positions) > 1:
+            st.warning(f"Ada {len(positions)} kandidat dengan nama '{picked}'.")
+        if job_positions_df is None or job_positions_df.empty:
+            st.info("Belum ada data posisi pekerjaan.")
+            return
+        ranks = candidate_ranks(positions, data_kandidat, job_positions_df)
+        st.dataframe(ranks, use_container_width=True, hide_index=True)
+
+def render_diagnostics():
+    """
+    Panel diagnostik: waktu, alokasi memori & ukuran array per tahap
+    untuk run terakhir (terbaru di atas).
+    """
+    with st.expander("🩺 Diagnostik"):
+        stats = result_cache.stats()
+        st.caption(
+            f"Cache hasil: {stats['hits']} hit, {stats['misses']} miss, "
+            f"{stats['entries']} entri ({stats['bytes'] / 2 ** 20:.2f} MiB), {stats['evictions']} dibuang"
+        )
+        runs = st.session_state.get("diagnostics_runs", [])
+        if not runs:
+            st.info("Belum ada run yang direkam. Tekan Generate atau Run untuk merekam.")
+            return
+        for record in reversed(runs):
+            peak = "-" if record.peak_bytes is None else f"{record.peak_bytes / 2 ** 20:.2f} MiB"
+            if record.memory_shared:
+                peak = "- (run lain mengukur memori bersamaan)"
+            st.markdown(f"**{record.name}** · {record.started} · {record.seconds * 1000:.1f} ms · puncak {peak}")
+            st.dataframe(record.to_frame(), use_container_width=True, hide_index=True)
 
 # Fungsi untuk merender halaman utama
 def render_page(data_kandidat, job_positions_df_from_state):
 
     # Original candidate data
     st.subheader("📋 Data Kandidat Lengkap")
-    st.dataframe(data_kandidat, use_container_width=True)
+    render_table(data_kandidat, "home_table_kandidat", version=open_storage().data_version())
 
     # Job Positions Table
     st.subheader("📋 Daftar Posisi Pekerjaan")
@@ -21,6 +223,9 @@ def render_page(data_kandidat, job_positions_df_from_state):
     else:
         st.info("Belum ada data posisi pekerjaan.")
 
+    if data_kandidat is not None and not data_kandidat.empty:
+        render_candidate_search(data_kandidat, job_positions_df_from_state)
+
     st.markdown("---")
 
     # Candidate Selection Section
@@ -62,6 +267,11 @@ def render_page(data_kandidat, job_positions_df_from_state):
 
         st.session_state["selected_job"] = job_filter_row
 
+    with col_home_2:
+        # Instrumentasi opt-in (lihat utils/instrument.py)
+        diagnostics_on = st.checkbox("🩺 Rekam diagnostik", key="home_diagnostics")
+    instrument.set_enabled(True if diagnostics_on else None)
+
     generate_final = st.button("🚀 Generate Final Data", use_container_width=True)
 
     if generate_final:
@@ -76,18 +286,29 @@ def render_page(data_kandidat, job_positions_df_from_state):
             st.session_state["data_kandidat_raw"] = data_kandidat.copy()
             st.session_state["job_filter_row"] = job_filter_row
 
-            # Panggil fungsi agg_to_5 untuk membuat agregasi 5 kriteria dan simpan di session_state
-            agg_data = agg_to_5(
-                data_kandidat.copy(),
-                job_filter_row
-            )
-            st.session_state["agg_data"] = agg_data
+            # Ranker inkremental menjalankan agg_to_5 (5 kriteria) dan menyimpan state VIKOR,
+            # sehingga kandidat yang ditambahkan nanti tidak memicu ranking VIKOR ulang penuh
+            with instrument.run("Generate Final Data", n=len(data_kandidat)) as record:
+                ranker = IncrementalRanker(data_kandidat, job_filter_row)
+            _keep_diagnostics(record)
+            st.session_state["incremental_ranker"] = ranker
+            st.session_state["agg_data"] = ranker.agg_data
+            # Hasil metode untuk posisi sebelumnya tidak ditampilkan lagi
+            st.session_state.pop("home_methods", None)
+            st.session_state.pop("home_sensitivity", None)
+            st.session_state.pop("home_graph", None)
             st.success(f"Menganalisis kandidat untuk posisi: {selected_job}")
 
     # Tampilkan data hasil agregasi jika sudah ada
     if "agg_data" in st.session_state:
         st.subheader("📊 Data Hasil Agregasi (5 Kriteria)")
-        st.dataframe(st.session_state["agg_data"], use_container_width=True)
+        agg_ranker = st.session_state.get("incremental_ranker")
+        render_table(
+            st.session_state["agg_data"], "home_table_agg",
+            version=None if agg_ranker is None else result_key(
+                agg_ranker.features.version, st.session_state["job_filter_row"], 'agg'
+            )
+        )
 
         st.markdown("---")
 
@@ -100,31 +321,75 @@ def render_page(data_kandidat, job_positions_df_from_state):
             btn_run_vikor = st.button("🔍 Run VIKOR Only", use_container_width=True)
         with col3:
             btn_run_electre = st.button("📊 Run ELECTRE Only", use_container_width=True)
+        # Metode lain dari registry pipeline ikut dijalankan oleh Run All Methods
+        extra_methods = st.multiselect(
+            "Metode tambahan untuk Run All:", [name for name in METHODS if name not in DEFAULT_METHODS],
+            format_func=lambda name: METHODS[name].label, key="home_extra_methods"
+        )
 
         data_for_methods = st.session_state["data_kandidat_raw"]
         job_row_for_methods = st.session_state["job_filter_row"]
+        agg_for_methods = st.session_state["agg_data"]
+        ranker = st.session_state.get("incremental_ranker")
+
+        # Perubahan peringkat akibat kandidat yang terakhir ditambahkan
+        if ranker is not None and ranker.last_update is not None:
+            with st.expander("🔄 Perubahan Peringkat Terakhir"):
+                st.write("VIKOR")
+                st.dataframe(ranker.last_update.vikor_changes, use_container_width=True)
+                st.write("ELECTRE")
+                st.caption("Threshold mode 'sorted'; tabel hasil ELECTRE dihitung ulang penuh lewat pipeline.")
+                st.dataframe(ranker.last_update.electre_changes, use_container_width=True)
+
+        # Stabilitas ranking VIKOR terhadap bobot kriteria & v (Monte-Carlo)
+        with st.expander("🎲 Sensitivitas Bobot VIKOR"):
+            n_samples = st.number_input(
+                "Jumlah sampel bobot:", min_value=100, max_value=100_000, value=10_000, step=1_000,
+                key="home_sensitivity_samples"
+            )
+            if st.button("Jalankan Analisis Sensitivitas", key="home_sensitivity_run"):
+                with instrument.run("Sensitivitas VIKOR", n=len(agg_for_methods), samples=int(n_samples)) as record:
+                    sensitivity = run_vikor_sensitivity(
+                        data_for_methods, job_row_for_methods, agg_for_methods,
+                        n_samples=int(n_samples), seed=0
+                    )
+                _keep_diagnostics(record)
+                st.session_state["home_sensitivity"] = sensitivity
+            sensitivity = st.session_state.get("home_sensitivity")
+            if sensitivity is not None:
+                st.write(
+                    f"Peringkat 1 berubah pada {sensitivity.top_changes} dari {len(sensitivity.v)} sampel "
+                    f"(bobot acak pada simplex, v acak 0-1)."
+                )
+                render_table(sensitivity.summary, "home_table_sensitivity", hide_index=True)
 
         # Jika tombol dijalankan, panggil fungsi yang sesuai
-        if btn_run_all:
-            col1_mcdm, col2_mcdm = st.columns(2)
-            with col1_mcdm:
-                st.subheader("🔍 Hasil VIKOR")
-                df_vikor = run_vikor(data_for_methods, job_row_for_methods)
-                st.dataframe(df_vikor.style.apply(lambda r: ["background-color: green"] * len(r) if r["Ranking"] == 1 else [""] * len(r), axis=1), use_container_width=True)
-            with col2_mcdm:
-                st.subheader("📊 Hasil ELECTRE")
-                df_electre = run_electre(data_for_methods, job_row_for_methods)
-                st.dataframe(df_electre.style.apply(lambda r: ["background-color: green"] * len(r) if r["Ranking"] == 1 else [""] * len(r), axis=1), use_container_width=True)
-        elif btn_run_vikor:
-            st.subheader("🔍 Hasil VIKOR")
-            df_vikor = run_vikor(data_for_methods, job_row_for_methods)
-            st.dataframe(df_vikor.style.apply(lambda r: ["background-color: green"] * len(r) if r["Ranking"] == 1 else [""] * len(r), axis=1), use_container_width=True)
-        elif btn_run_electre:
-            st.subheader("📊 Hasil ELECTRE")
-            df_electre = run_electre(data_for_methods, job_row_for_methods)
-            st.dataframe(df_electre.style.apply(lambda r: ["background-color: green"] * len(r) if r["Ranking"] == 1 else [""] * len(r), axis=1), use_container_width=True)
+        # Metode yang terakhir dijalankan disimpan agar hasil tetap tampil saat
+        # tabel dipaging/diurutkan (rerun berikutnya mengambil hasil dari result_cache)
+        clicked = btn_run_all or btn_run_vikor or btn_run_electre
+        if clicked:
+            st.session_state["home_methods"] = (
+                list(DEFAULT_METHODS) + extra_methods if btn_run_all else ["vikor"] if btn_run_vikor else ["electre"]
+            )
+        shown_methods = st.session_state.get("home_methods")
+
+        # Run diagnostik hanya dibuka jika salah satu tombol ditekan
+        run_label = "Run All Methods" if btn_run_all else "Run VIKOR" if btn_run_vikor else "Run ELECTRE"
+        with instrument.run(run_label, n=len(agg_for_methods)) if clicked else nullcontext() as record:
+            if shown_methods:
+                keys = _result_keys(shown_methods, ranker, data_for_methods, job_row_for_methods)
+                results = _ranking_results(keys, ranker, data_for_methods, job_row_for_methods, agg_for_methods)
+                _render_results(shown_methods, results, keys)
+                if len(shown_methods) > 1:
+                    render_consensus(shown_methods, results, keys)
+                if "electre" in shown_methods:
+                    render_outranking_graph(keys["electre"], data_for_methods, job_row_for_methods, agg_for_methods)
+        _keep_diagnostics(record)
         
     elif generate_final:
         pass
     else:
-        st.info("Tekan tombol **Generate Final Data** untuk melihat Data Hasil Agregasi.")
\ No newline at end of file
+        st.info("Tekan tombol **Generate Final Data** untuk melihat Data Hasil Agregasi.")
+
+    if diagnostics_on:
+        render_diagnostics()
\ No newline at end of file
@@ -1,7 +1,43 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import os
+from utils.result_cache import result_cache
+from utils.storage import open_storage
+from utils.bulk_import import read_upload, validate_candidates
+from utils.name_index import name_index
+
+def _after_candidates_added(new_rows, load_data_callback_for_clear):
+    """
+    Setelah dataset.csv ditulis: perbarui ranking inkremental (jika ada),
+    kosongkan cache data & hasil ranking sekali, lalu rerun.
+
+    Returns:
+    - pesan tambahan tentang perubahan peringkat (string, bisa kosong)
+    """
+    message = ""
+    # Perbarui ranking secara inkremental jika analisis sudah pernah dijalankan
+    ranker = st.session_state.get("incremental_ranker")
+    if ranker is not None:
+        update = ranker.append(new_rows)
+        st.session_state["data_kandidat_raw"] = ranker.data
+        st.session_state["agg_data"] = ranker.agg_data
+        message = (
+            f" {len(update.vikor_changes)} kandidat berubah peringkat VIKOR,"
+            f" {len(update.electre_changes)} berubah peringkat ELECTRE"
+            " (skor ELECTRE dihitung ulang untuk semua kandidat)."
+        )
+
+    if hasattr(load_data_callback_for_clear, 'clear'): 
+        load_data_callback_for_clear.clear() 
+    # Hasil ranking dataset lama tidak akan dipakai lagi
+    result_cache.invalidate()
+    return message
+
+def _candidate_names(load_data_callback):
+    """
+    NameIndex data kandidat saat ini (dibangun sekali per versi data).
+    """
+    return name_index(load_data_callback()['NAMA'], open_storage().data_version())
 
 # Fungsi untuk merender halaman input data kandidat
 def render_page(app_csv_columns, load_data_callback_for_clear):
@@ -75,8 +111,10 @@ def render_page(app_csv_columns, load_data_callback_for_clear):
 
         # Validasi input sebelum menyimpan
         if submitted_kandidat:
-            if not nama:
+            if not nama.strip():
                 st.error("Nama Calon tidak boleh kosong.")
+            elif nama in _candidate_names(load_data_callback_for_clear):
+                st.error(f"Kandidat dengan nama '{nama.strip()}' sudah ada.")
             else:
                 new_row_data = [nama]
                 for col_name in app_csv_columns[1:]:
@@ -85,22 +123,48 @@ def render_page(app_csv_columns, load_data_callback_for_clear):
                 new_row_df = pd.DataFrame([new_row_data], columns=app_csv_columns)
 
                 try:
-                    file_exists = os.path.exists("dataset.csv")
-                    is_empty = False
-                    if file_exists:
-                        try:
-                            df_check = pd.read_csv("dataset.csv")
-                            if df_check.empty:
-                                is_empty = True
-                        except pd.errors.EmptyDataError:
-                            is_empty = True
-                    
-                    write_header = not file_exists or is_empty
-                    new_row_df.to_csv("dataset.csv", mode='a', header=write_header, index=False)
-                    st.session_state.candidate_success_message = f"Data untuk {nama} berhasil ditambahkan ke Dataset.csv!"
-                    
-                    if hasattr(load_data_callback_for_clear, 'clear'): 
-                        load_data_callback_for_clear.clear() 
+                    open_storage().append_candidates(new_row_df)
+                    st.session_state.candidate_success_message = (
+                        f"Data untuk {nama} berhasil ditambahkan ke Dataset.csv!"
+                        + _after_candidates_added(new_row_df, load_data_callback_for_clear)
+                    )
                     st.rerun()
                 except Exception as e:
-                    st.error(f"Gagal menyimpan data ke CSV: {e}")
\ No newline at end of file
+                    st.error(f"Gagal menyimpan data ke CSV: {e}")
+
+    # Impor massal dari file CSV
+    st.markdown("---")
+    st.subheader("📤 Unggah CSV Kandidat")
+    st.caption("Kolom file harus sama dengan dataset.csv. Nilai diperiksa dengan rentang yang sama seperti form di atas.")
+    uploaded = st.file_uploader("Pilih file CSV", type=["csv"], key="bulk_upload_kandidat")
+    if uploaded is not None:
+        try:
+            report = validate_candidates(read_upload(uploaded), _candidate_names(load_data_callback_for_clear))
+        except ValueError as e:
+            st.error(f"File tidak dapat diimpor: {e}")
+            return
+
+        n_error_rows = report.errors['Baris'].nunique()
+        st.write(
+            f"{len(report.valid)} kandidat valid, {n_error_rows} baris dengan kesalahan, "
+            f"{len(report.duplicates)} baris duplikat dilewati."
+        )
+        if report.ignored_columns:
+            st.info(f"Kolom berikut diabaikan: {report.ignored_columns}")
+        if not report.errors.empty:
+            st.error("Kesalahan per baris (baris 1 = header):")
+            st.dataframe(report.errors, use_container_width=True, hide_index=True)
+        if not report.duplicates.empty:
+            with st.expander("Baris duplikat yang dilewati"):
+                st.dataframe(report.duplicates, use_container_width=True, hide_index=True)
+
+        if not report.valid.empty and st.button(f"➕ Tambahkan {len(report.valid)} Kandidat", key="bulk_upload_submit"):
+            try:
+                open_storage().append_candidates(report.valid)
+                st.session_state.candidate_success_message = (
+                    f"{len(report.valid)} kandidat berhasil ditambahkan ke Dataset.csv!"
+                    + _after_candidates_added(report.valid, load_data_callback_for_clear)
+                )
+                st.rerun()
+            except Exception as e:
+                st.error(f"Gagal menyimpan data ke CSV: {e}")
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import re
+from utils.result_cache import result_cache
+from utils.storage import open_storage
 
 EXPECTED_JOB_COLUMNS_JP = [
     'Job Position', 'PAPI context', 'M', 'B', 'T', 'I_M', 
@@ -134,16 +136,17 @@ def render_page(app_job_positions_csv_path):
                         current_df[col] = np.nan if col in ['D', 'I_D', 'S', 'C'] else None
                 current_df = current_df[EXPECTED_JOB_COLUMNS_JP]
 
-                if job_position_input_nama in current_df['Job Position'].tolist():
+                if current_df['Job Position'].eq(job_position_input_nama).any():
                     st.warning(f"Posisi '{job_position_input_nama}' sudah ada. Data tidak ditambahkan.")
                 else:
-                    st.session_state.job_positions_df = pd.concat(
-                        [current_df, new_job_entry_df], ignore_index=True
-                    )
                     try:
-                        st.session_state.job_positions_df[EXPECTED_JOB_COLUMNS_JP].to_csv(
-                            app_job_positions_csv_path, index=False
-                        )
-                        st.success(f"✅ Posisi '{job_position_input_nama}' berhasil ditambahkan!")
+                        # Hanya baris baru yang ditulis (CSV: append, SQLite: INSERT)
+                        open_storage().add_job_position(new_job_entry_df)
                     except Exception as e:
-                        st.error(f"Gagal menyimpan: {e}")
\ No newline at end of file
+                        st.error(f"Gagal menyimpan: {e}")
+                    else:
+                        st.session_state.job_positions_df = pd.concat(
+                            [current_df, new_job_entry_df], ignore_index=True
+                        )
+                        result_cache.invalidate()
+                        st.success(f"✅ Posisi '{job_position_input_nama}' berhasil ditambahkan!")
\ No newline at end of file